@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Parser benchmarks against an offline page corpus - no Chrome, no network.
+
+The corpus (benchmarks/corpus/<league>.json.gz) holds a league page plus roster
+and stats pages for a few teams of every league in LEAGUES_TO_SCRAPE, with the
+player counts the parsers should find.
+
+The shipped corpus is SYNTHETIC: `generate` renders pages with fixtures.render_*
+from the players in a dated snapshot, and the expected counts are those
+snapshot player lists - not parser output. The generated markup only carries
+the structure the parsers read, so pages are far smaller than real
+EliteProspects pages and timings understate real parse cost; `record` captures
+real pages from the live site (Chrome + network) and should replace it when
+that is possible. Each run checks the counts, then
+times the parsers and the save step (best of ROUNDS rounds) and compares them
+with a baseline.
+
+Absolute timings only compare on one machine: the baseline is local
+(benchmarks/baseline.json is not committed) - save it with --save-baseline on
+the machine that runs --check, before the change being measured. Without a
+matching baseline --check only checks the parse counts. Even on one machine,
+background load moves results by 20-30%, so REGRESSION_PERCENT flags gross
+regressions only; re-run to confirm one.
+
+Usage:
+  python benchmark_parsers.py [--check] [--save-baseline] [--threshold 40]   # run (default)
+  python benchmark_parsers.py generate [--snapshot FILE]     # corpus from a dated snapshot
+  python benchmark_parsers.py record [--leagues NAHL,EHL]    # corpus from the live site (Chrome)
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import contextlib
+import tracemalloc
+from datetime import datetime
+
+import fixtures
+import github_scraper
+
+scraper_module = github_scraper.scraper_module
+EliteProspectsScraper = scraper_module.EliteProspectsScraper
+
+SEASON = github_scraper.SEASON
+BASELINE_FILE = os.path.join('benchmarks', 'baseline.json')
+DEFAULT_SNAPSHOT = os.path.join(github_scraper.DATA_DIR, '2025-12-16.json')
+TEAMS_PER_LEAGUE = 4
+ROUNDS = 15
+ROUND_SECONDS = 0.1      # Minimum length of one timing round
+REGRESSION_PERCENT = 40  # --check fails when a benchmark is this much slower (run-to-run noise is 20-30%)
+
+
+class Unpaced(scraper_module.AdaptiveRateController):
+    """Rate controller that never waits - pacing is for the live site"""
+
+    def wait(self):
+        pass
+
+
+def corpus_path(league_name):
+    return os.path.join(fixtures.CORPUS_DIR, f"{github_scraper.league_slug(league_name)}.json.gz")
+
+
+def league_url(league):
+    return f"{league['url']}/{SEASON}"
+
+
+def snapshot_players(team):
+    """Players a snapshot team should parse back to
+
+    Older parsers left strays in some snapshots (e.g. a '"A"' captaincy row linking to
+    /team-captaincy/); those link somewhere other than a player profile and are
+    rendered into the pages but not expected back. Players without a link count.
+    """
+    return sum(1 for player in team.get('players') or [] if '/player/' in (player.get('profile_url') or '/player/'))
+
+
+def generate(snapshot_file, teams_per_league):
+    """Build a synthetic corpus from a dated snapshot: every league, its first teams' roster and stats pages
+
+    Expected counts come from the snapshot's player lists (snapshot_players), so the
+    check does not depend on the parsers being measured.
+    """
+    snapshot = github_scraper.load_json(snapshot_file, None)
+    if not snapshot:
+        print(f"❌ No snapshot data in {snapshot_file}")
+        sys.exit(1)
+    for league in github_scraper.LEAGUES_TO_SCRAPE:
+        teams = snapshot.get(league['name'])
+        if not teams:
+            print(f"⚠️ {league['name']}: not in {snapshot_file}")
+            continue
+        url = league_url(league)
+        pages = {url: fixtures.render_league_page(league['name'], SEASON, teams,
+                                                   layout=2 if league['name'] in ('EHL', 'EHLP') else 3)}
+        corpus_teams = []
+        for team in teams[:teams_per_league]:
+            pages[team['url']] = fixtures.render_roster_page(team, SEASON)
+            pages[f"{team['url']}?tab=stats"] = fixtures.render_stats_page(team, SEASON)
+            corpus_teams.append({'id': team['id'], 'name': team['name'], 'url': team['url'], 'league': league['name'],
+                                 'roster': snapshot_players(team), 'stats': snapshot_players(team)})
+        save_corpus(league, url, corpus_teams, pages, len(teams), f"synthetic, generated from {snapshot_file}")
+
+
+def record(leagues, teams_per_league):
+    """Capture the corpus from the live site; expected counts are what the parsers find today"""
+    scraper = EliteProspectsScraper(headless=True, delay=github_scraper.DELAY)
+    try:
+        for league in leagues:
+            url = league_url(league)
+            teams = scraper.get_league_teams(url, SEASON)
+            if not teams:
+                print(f"⚠️ {league['name']}: no teams - not recorded")
+                continue
+            pages = {url: scraper.driver.page_source}
+            corpus_teams = []
+            for team in teams[:teams_per_league]:
+                team['season'] = SEASON
+                roster = scraper.scrape_team_roster(team['url'], team)
+                pages[team['url']] = scraper.driver.page_source
+                stats = scraper.scrape_team_stats(team['url'], team)
+                pages[f"{team['url']}?tab=stats"] = scraper.driver.page_source
+                corpus_teams.append({'id': team['id'], 'name': team['name'], 'url': team['url'], 'league': league['name'],
+                                     'roster': len(roster), 'stats': len(stats)})
+            save_corpus(league, url, corpus_teams, pages, len(teams), f"recorded {datetime.now().strftime('%Y-%m-%d')}")
+    finally:
+        scraper.close()
+
+
+def save_corpus(league, url, teams, pages, league_teams, source):
+    path = corpus_path(league['name'])
+    fixtures.save_corpus(path, {'league': league['name'], 'league_url': url, 'season': SEASON, 'source': source,
+                                'league_teams': league_teams, 'teams': teams, 'pages': pages})
+    print(f"✅ {league['name']}: {len(pages)} pages -> {path}")
+
+
+def offline_scraper(corpora):
+    pages = {}
+    for corpus in corpora:
+        pages.update(corpus['pages'])
+    return EliteProspectsScraper(driver=fixtures.FixtureDriver(pages), rate_controller=Unpaced(),
+                                 timing_store=scraper_module.TimingStore(None), base_url=fixtures.BASE_URL)
+
+
+def verify(scraper, corpora):
+    """Parse every corpus page once; returns (mismatch messages, parsed teams) for the timed benchmarks"""
+    problems = []
+    parsed = []
+    for corpus in corpora:
+        teams = scraper.get_league_teams(corpus['league_url'], corpus['season'])
+        if len(teams) != corpus['league_teams']:
+            problems.append(f"{corpus['league']} league page: {len(teams)} teams, expected {corpus['league_teams']}")
+        for team in corpus['teams']:
+            team_info = dict(team, season=corpus['season'])
+            roster = scraper.scrape_team_roster(team['url'], team_info)
+            stats = scraper.scrape_team_stats(team['url'], team_info)
+            for kind, found in (('roster', roster), ('stats', stats)):
+                if len(found) != team[kind]:
+                    problems.append(f"{team['name']} {kind}: {len(found)} players, expected {team[kind]}")
+            parsed.append((team_info, roster, stats))
+    return problems, parsed
+
+
+def stats_cell_texts(corpora):
+    """Every table cell text on the stats pages - the strings is_valid_player_name screens"""
+    texts = []
+    for corpus in corpora:
+        for url, page in corpus['pages'].items():
+            if url.endswith('?tab=stats'):
+                document = fixtures.lxml_html.document_fromstring(page)
+                texts.extend(' '.join(cell.text_content().split()) for cell in document.iter('td'))
+    return texts
+
+
+def build_benchmarks(scraper, corpora, parsed, workdir):
+    """name -> (function running one batch, operations per batch)"""
+    league_pages = [(corpus['league_url'], corpus['season']) for corpus in corpora]
+    texts = stats_cell_texts(corpora)
+    scraped_data = {}
+    for team_info, roster, stats in parsed:
+        players = scraper.combine_roster_and_stats(roster, stats, team_info)
+        team = scraper_module.TeamRecord(team_info['id'], team_info['name'], team_info['league'], team_info['season'],
+                                         team_info['url'], players)
+        scraped_data.setdefault(team_info['league'], []).append(team)
+    scraped_data = {league: scraper_module.teams_to_dicts(teams) for league, teams in scraped_data.items()}
+
+    def league_parse():
+        for url, season in league_pages:
+            scraper.get_league_teams(url, season)
+
+    def roster_parse():
+        for team_info, _, _ in parsed:
+            scraper.scrape_team_roster(team_info['url'], team_info)
+
+    def stats_parse():
+        for team_info, _, _ in parsed:
+            scraper.scrape_team_stats(team_info['url'], team_info)
+
+    def validate_names():
+        for text in texts:
+            scraper.is_valid_player_name(text)
+
+    def combine():
+        for team_info, roster, stats in parsed:
+            scraper.combine_roster_and_stats(roster, stats, team_info)
+
+    def save():
+        with contextlib.chdir(workdir):
+            github_scraper.save_data(scraped_data, 'benchmark')
+
+    return {
+        'get_league_teams': (league_parse, len(league_pages)),
+        'scrape_team_roster': (roster_parse, len(parsed)),
+        'scrape_team_stats': (stats_parse, len(parsed)),
+        'is_valid_player_name': (validate_names, len(texts)),
+        'combine_roster_and_stats': (combine, len(parsed)),
+        'save_data': (save, 1),
+    }
+
+
+def measure(function, operations):
+    """Best operations/second over ROUNDS rounds (the least disturbed one), and peak traced memory of one batch"""
+    batches = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(batches):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= ROUND_SECONDS:
+            break
+        batches *= 2
+    rates = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(batches):
+            function()
+        rates.append(batches * operations / (time.perf_counter() - start))
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'ops_per_sec': round(max(rates), 1), 'peak_kib': round(peak / 1024, 1)}
+
+
+def machine_info():
+    """Where timings were taken - baselines only compare on the same machine and Python"""
+    return {'node': platform.node(), 'machine': platform.machine(), 'python': platform.python_version()}
+
+
+def run(check=False, save_baseline=False, threshold=REGRESSION_PERCENT):
+    corpora = fixtures.load_corpus()
+    if not corpora:
+        print(f"❌ No corpus in {fixtures.CORPUS_DIR} - run: python benchmark_parsers.py generate")
+        sys.exit(1)
+    synthetic = sum(1 for corpus in corpora if corpus['source'].startswith(('synthetic', 'generated')))
+    print(f"📚 Corpus: {sum(len(corpus['pages']) for corpus in corpora)} pages from {len(corpora)} leagues"
+          + (f" ({synthetic} synthetic - timings understate real pages)" if synthetic else ''))
+
+    scraper = offline_scraper(corpora)
+    workdir = tempfile.mkdtemp(prefix='benchmark-')
+    results = {}
+    try:
+        with open(os.devnull, 'w') as quiet, contextlib.redirect_stdout(quiet):
+            problems, parsed = verify(scraper, corpora)
+            benchmarks = build_benchmarks(scraper, corpora, parsed, workdir)
+        for problem in problems:
+            print(f"⚠️ {problem}")
+        for name, (function, operations) in benchmarks.items():
+            with open(os.devnull, 'w') as quiet, contextlib.redirect_stdout(quiet):
+                results[name] = measure(function, operations)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    stored = github_scraper.load_json(BASELINE_FILE, {})
+    baseline = stored.get('results', {})
+    if baseline and {key: stored.get(key) for key in machine_info()} != machine_info():
+        print(f"\n⚠️ {BASELINE_FILE} was saved on {stored.get('node', 'another machine')} - timings not compared")
+        baseline = {}
+    elif not baseline:
+        print("\nℹ️ No baseline - run with --save-baseline on this machine to compare timings")
+    regressions = []
+    print(f"\n{'benchmark':<26} {'ops/sec':>12} {'µs/op':>10} {'peak KiB':>10} {'vs baseline':>12}")
+    for name, result in results.items():
+        change = ''
+        if name in baseline and baseline[name]['ops_per_sec']:
+            percent = (result['ops_per_sec'] / baseline[name]['ops_per_sec'] - 1) * 100
+            change = f"{percent:+.1f}%"
+            if percent < -threshold:
+                change += ' ⚠️'
+                regressions.append(name)
+        print(f"{name:<26} {result['ops_per_sec']:>12,.1f} {1e6 / result['ops_per_sec']:>10,.1f} "
+              f"{result['peak_kib']:>10,.1f} {change:>12}")
+
+    if save_baseline:
+        os.makedirs(os.path.dirname(BASELINE_FILE), exist_ok=True)
+        with open(BASELINE_FILE, 'w') as f:
+            json.dump({'created': datetime.now().isoformat(timespec='seconds'), **machine_info(),
+                       'rounds': ROUNDS, 'results': results}, f, indent=2)
+        print(f"\n✅ Saved baseline: {BASELINE_FILE}")
+
+    if check and (problems or regressions):
+        print(f"\n❌ {len(problems)} parse mismatch(es), {len(regressions)} regression(s) over {threshold:g}%")
+        sys.exit(1)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the page parsers against the offline corpus')
+    parser.add_argument('command', nargs='?', choices=['run', 'generate', 'record'], default='run')
+    parser.add_argument('--check', action='store_true',
+                        help='Exit non-zero on parse mismatches or timing regressions over --threshold')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_PERCENT,
+                        help='Percent slower than the baseline that counts as a regression (default: %(default)s)')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help=f'Store this run as {BASELINE_FILE} (local to this machine, not committed)')
+    parser.add_argument('--snapshot', default=DEFAULT_SNAPSHOT, help='Dated snapshot to generate pages from')
+    parser.add_argument('--leagues', help='Comma-separated league names or slugs to record (default: all)')
+    parser.add_argument('--teams', type=int, default=TEAMS_PER_LEAGUE, help='Teams per league in the corpus')
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    if args.command == 'generate':
+        generate(args.snapshot, args.teams)
+    elif args.command == 'record':
+        record(github_scraper.select_leagues(None, args.leagues), args.teams)
+    else:
+        run(args.check, args.save_baseline, args.threshold)
+
+
+if __name__ == '__main__':
+    main()
@@ -10,12 +10,30 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, WebDriverException
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import logging
 import os
 import sys
 import threading
+import atexit
+import bisect
+import contextlib
+import functools
+import gzip
+import hashlib
+import itertools
+import mmap
+import queue
+import random
+import tempfile
+import unicodedata
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
 
 # COMPLETE LOGGING SUPPRESSION
 import warnings
@@ -34,13 +52,1014 @@ werkzeug_logger.setLevel(logging.ERROR)
 from urllib3.exceptions import InsecureRequestWarning
 warnings.filterwarnings("ignore", category=InsecureRequestWarning)
 
+# Optional: brotli for API responses (gzip is always available)
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Optional: orjson parses snapshots several times faster than the json module
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    json_loads = json.loads
+
+# Per-player history index (appended at save time by github_scraper.py). Bucket files are
+# append-only logs, one [id, date, gp, g, a, p, pim, name, team, league] line per player and snapshot
+HISTORY_FIELDS = ['date', 'gp', 'g', 'a', 'p', 'pim']
+HISTORY_BUCKETS = 256
+HISTORY_LAYOUT = 'ndjson'
+
+
+def extract_player_id(profile_url):
+    """Extract the numeric EliteProspects player ID from a profile URL - SIMPLE STRING METHOD"""
+    if not profile_url or '/player/' not in profile_url:
+        return ""
+    id_start = profile_url.find('/player/') + 8  # Length of '/player/'
+    id_end = profile_url.find('/', id_start)
+    if id_end == -1:
+        id_end = len(profile_url)
+    player_id = profile_url[id_start:id_end]
+    return player_id if player_id.isdigit() else ""
+
+
+def player_history_path(history_dir, player_id, buckets=HISTORY_BUCKETS):
+    """Path of the history bucket log holding a player's time series"""
+    return os.path.join(history_dir, f"{int(player_id) % buckets:03d}.ndjson")
+
+
+def read_player_history(path, player_id=None):
+    """{player id: {'name', 'team', 'league', 'series'}} from one history bucket log
+
+    A date logged twice (same-day re-run) keeps the fuller line; name, team and
+    league come from the kept line of the newest date. player_id skips every other
+    player's lines without parsing them.
+    """
+    prefix = f'["{player_id}",'.encode('utf-8') if player_id else None
+    lines = {}
+    with open(path, 'rb') as f:
+        for line in f:
+            if prefix is not None and not line.startswith(prefix):
+                continue
+            try:
+                row = json_loads(line)
+            except ValueError:
+                continue  # Torn line from an interrupted append
+            dates = lines.setdefault(row[0], {})
+            kept = dates.get(row[1])
+            if kept is None or row[2] >= kept[2]:
+                dates[row[1]] = row
+    players = {}
+    for pid, dates in lines.items():
+        newest = dates[max(dates)]
+        players[pid] = {'name': newest[7], 'team': newest[8], 'league': newest[9],
+                        'series': [dates[date][1:7] for date in sorted(dates)]}
+    return players
+
+
+# Player schema - raw display strings are kept, typed fields are parsed once at ingestion
+def parse_height_inches(height_text):
+    """Height like 6'2" (or 188 cm) to inches, 0 when missing - SIMPLE STRING METHOD"""
+    if not height_text:
+        return 0
+    text = str(height_text).strip().lower()
+    try:
+        if 'cm' in text:
+            return round(int(''.join(c for c in text if c.isdigit())) / 2.54)
+        if "'" in text:
+            feet_part, inch_part = text.split("'", 1)
+            feet = int(''.join(c for c in feet_part if c.isdigit()) or 0)
+            inches = int(''.join(c for c in inch_part if c.isdigit()) or 0)
+            return feet * 12 + inches
+    except ValueError:
+        pass
+    return 0
+
+
+def parse_weight_lbs(weight_text):
+    """Weight like 174 (or 174 lbs / 79 kg) to pounds, 0 when missing"""
+    if not weight_text:
+        return 0
+    text = str(weight_text).strip().lower()
+    numbers = ''.join(c for c in text.split()[0] if c.isdigit()) if text.split() else ''
+    if not numbers:
+        return 0
+    weight = int(numbers)
+    return round(weight * 2.20462) if 'kg' in text else weight
+
+
+def parse_jersey_number(jersey_text):
+    """Jersey like #4 to an int, None when missing (0 is a real number)"""
+    if not jersey_text:
+        return None
+    numbers = ''.join(c for c in str(jersey_text) if c.isdigit())
+    return int(numbers) if numbers else None
+
+
+def split_hometown(hometown):
+    """Split 'City, ST, Country' into (city, state, country)"""
+    if not hometown or hometown.strip() in ['-', '']:
+        return '', '', ''
+    parts = [part.strip() for part in hometown.split(',') if part.strip()]
+    if len(parts) >= 3:
+        return ', '.join(parts[:-2]), parts[-2], parts[-1]
+    if len(parts) == 2:
+        # "CO, USA" has no city; "Helsinki, FIN" has no state
+        if parts[0].isupper() and len(parts[0]) <= 3 and parts[1] in ['USA', 'CAN']:
+            return '', parts[0], parts[1]
+        return parts[0], '', parts[1]
+    if parts[0].isupper() and len(parts[0]) == 3:
+        return '', '', parts[0]
+    return parts[0], '', ''
+
+
+def _valid_int(value, low, high, default=0):
+    """Coerce to int and keep it only inside [low, high]"""
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return default
+    return value if low <= value <= high else default
+
+
+@dataclass(slots=True)
+class PlayerRecord:
+    """Validated player row with normalised height, weight, jersey and hometown"""
+    name: str
+    jersey: str = ''
+    position: str = ''
+    shoots: str = ''
+    age: int = 0
+    birth_year: int = 0
+    height: str = ''
+    weight: str = ''
+    hometown: str = ''
+    profile_url: str = ''
+    league: str = 'UNKNOWN'
+    season: str = '2025-2026'
+    games: int = 0
+    goals: int = 0
+    assists: int = 0
+    points: int = 0
+    pim: int = 0
+    ppg: float = 0.0
+    height_in: int = 0
+    weight_lbs: int = 0
+    jersey_number: Optional[int] = None
+    hometown_city: str = ''
+    hometown_state: str = ''
+    hometown_country: str = ''
+
+    def __post_init__(self):
+        if not self.name or len(''.join(self.name.split())) <= 1:
+            raise ValueError(f"Invalid player name: {self.name!r}")
+        # Repeated low-cardinality strings share one object across all records
+        self.league = sys.intern(self.league or 'UNKNOWN')
+        self.season = sys.intern(self.season or '2025-2026')
+        self.position = sys.intern(self.position or '')
+        self.jersey = sys.intern(self.jersey or '')
+        self.height = sys.intern(self.height or '')
+        self.weight = sys.intern(self.weight or '')
+        self.hometown = sys.intern(self.hometown or '')
+        self.shoots = 'L' if self.shoots == 'L' else 'R' if self.shoots == 'R' else ''
+        self.age = _valid_int(self.age, 0, 60)
+        self.birth_year = _valid_int(self.birth_year, 1900, 2100)
+        for stat in ['games', 'goals', 'assists', 'points', 'pim']:
+            setattr(self, stat, _valid_int(getattr(self, stat), 0, 10000))
+        self.ppg = round(self.points / self.games, 2) if self.games > 0 else 0.0
+        
+        # Typed fields are derived from the raw strings unless supplied
+        self.height_in = _valid_int(self.height_in or parse_height_inches(self.height), 48, 96)
+        self.weight_lbs = _valid_int(self.weight_lbs or parse_weight_lbs(self.weight), 80, 350)
+        if self.jersey_number is None:
+            self.jersey_number = parse_jersey_number(self.jersey)
+        self.jersey_number = _valid_int(self.jersey_number, 0, 99, None)
+        if not (self.hometown_city or self.hometown_state or self.hometown_country):
+            self.hometown_city, self.hometown_state, self.hometown_country = split_hometown(self.hometown)
+        self.hometown_city = sys.intern(self.hometown_city)
+        self.hometown_state = sys.intern(self.hometown_state)
+        self.hometown_country = sys.intern(self.hometown_country)
+
+    @classmethod
+    def from_dict(cls, data, **overrides):
+        """Build a record from a scraped/serialised player dict (keyword overrides win)"""
+        fields = {
+            'name': data.get('name', ''),
+            'jersey': data.get('jersey') or data.get('number') or '',
+            'position': data.get('position', ''),
+            'shoots': data.get('shoots', ''),
+            'age': data.get('age', 0),
+            'birth_year': data.get('birthYear', 0),
+            'height': data.get('height', ''),
+            'weight': data.get('weight', ''),
+            'hometown': data.get('hometown', ''),
+            'profile_url': data.get('profile_url', ''),
+            'league': data.get('league', 'UNKNOWN'),
+            'season': data.get('season', '2025-2026'),
+            'games': data.get('games', 0),
+            'goals': data.get('goals', 0),
+            'assists': data.get('assists', 0),
+            'points': data.get('points', 0),
+            'pim': data.get('pim', 0),
+            'height_in': data.get('height_in', 0),
+            'weight_lbs': data.get('weight_lbs', 0),
+            'jersey_number': data.get('jersey_number'),
+            'hometown_city': data.get('hometown_city', ''),
+            'hometown_state': data.get('hometown_state', ''),
+            'hometown_country': data.get('hometown_country', '')
+        }
+        fields.update(overrides)
+        return cls(**fields)
+
+    def to_dict(self):
+        """Serialise to the player dict shape the dashboard and data files use"""
+        return {
+            'name': self.name,
+            'jersey': self.jersey,
+            'number': self.jersey,  # Keep 'number' for backwards compatibility
+            'position': self.position,
+            'shoots': self.shoots,
+            'age': self.age,
+            'birthYear': self.birth_year,
+            'height': self.height,
+            'weight': self.weight,
+            'hometown': self.hometown,
+            'profile_url': self.profile_url,
+            'league': self.league,
+            'season': self.season,
+            'games': self.games,
+            'goals': self.goals,
+            'assists': self.assists,
+            'points': self.points,
+            'pim': self.pim,
+            'ppg': self.ppg,
+            'height_in': self.height_in,
+            'weight_lbs': self.weight_lbs,
+            'jersey_number': self.jersey_number,
+            'hometown_city': self.hometown_city,
+            'hometown_state': self.hometown_state,
+            'hometown_country': self.hometown_country
+        }
+
+
+class TeamRecord:
+    """Compact in-process team: players stay PlayerRecords until serialised"""
+    __slots__ = ('id', 'name', 'league', 'season', 'url', 'players')
+
+    def __init__(self, id='', name='', league='UNKNOWN', season='2025-2026', url='', players=None):
+        self.id = str(id)
+        self.name = name
+        self.league = sys.intern(league or 'UNKNOWN')
+        self.season = sys.intern(season or '2025-2026')
+        self.url = url
+        self.players = players if players is not None else []
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a team (and its player records) from a serialised team dict"""
+        players = []
+        for player in data.get('players') or []:
+            try:
+                players.append(player if isinstance(player, PlayerRecord) else PlayerRecord.from_dict(player))
+            except ValueError:
+                continue
+        return cls(data.get('id', ''), data.get('name', ''), data.get('league', 'UNKNOWN'),
+                   data.get('season', '2025-2026'), data.get('url', ''), players)
+
+    def to_dict(self):
+        """Serialise to the team dict shape the dashboard and data files use"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'league': self.league,
+            'season': self.season,
+            'url': self.url,
+            'players': [player.to_dict() for player in self.players]
+        }
+
+
+def teams_to_dicts(teams):
+    """Serialisation edge: convert a list of TeamRecords (or dicts) to plain dicts"""
+    return [team.to_dict() if isinstance(team, TeamRecord) else team for team in teams]
+
+
+class LiveTeamsView:
+    """Zero-copy, read-only view of the first N items of an append-only list"""
+    __slots__ = ('_teams', '_length')
+
+    def __init__(self, teams):
+        self._teams = teams
+        self._length = len(teams)
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        for i in range(self._length):
+            yield self._teams[i]
+
+
+class PageBlockedError(WebDriverException):
+    """The site answered with a throttling or access-denied page instead of content"""
+
+
+class Tracer:
+    """Nested spans written as Chrome trace events (open the file in chrome://tracing or Perfetto)
+
+    Events stream to disk as they finish, in the JSON array format, so memory stays
+    flat on long runs. Disabled unless started with a path: span() then hands back
+    one shared no-op context and add() returns at once.
+    """
+
+    NULL_SPAN = contextlib.nullcontext()
+
+    def __init__(self, path=None):
+        self.enabled = False
+        self.path = None
+        self.file = None
+        self.events = 0
+        self.threads = set()
+        self.lock = threading.Lock()
+        if path:
+            self.start(path)
+
+    def start(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.file = open(path, 'w')
+        self.file.write('[\n')
+        self.enabled = True
+        atexit.register(self.close)
+        print(f"🧵 Tracing to {path}")
+
+    def add(self, name, category, start, duration, args=None):
+        """Record a finished span (start and duration in seconds)"""
+        if not self.enabled:
+            return
+        thread_id = threading.get_ident()
+        event = {'name': name, 'cat': category, 'ph': 'X', 'ts': int(start * 1e6), 'dur': int(duration * 1e6),
+                 'pid': os.getpid(), 'tid': thread_id}
+        if args:
+            event['args'] = args
+        with self.lock:
+            if self.file is None:
+                return
+            if thread_id not in self.threads:
+                self.threads.add(thread_id)
+                self._write({'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': thread_id,
+                             'args': {'name': threading.current_thread().name}})
+            self._write(event)
+
+    def _write(self, event):
+        self.file.write((',\n' if self.events else '') + json.dumps(event, default=str))
+        self.events += 1
+
+    def span(self, name, category='scraper', **args):
+        if not self.enabled:
+            return self.NULL_SPAN
+        return TraceSpan(self, name, category, args)
+
+    def close(self):
+        with self.lock:
+            if self.file is None:
+                return
+            self.file.write('\n]\n')
+            self.file.close()
+            self.file = None
+            self.enabled = False
+        print(f"🧵 Trace: {self.events} events in {self.path}")
+
+
+class TraceSpan:
+    __slots__ = ('tracer', 'name', 'category', 'args', 'start')
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.time()
+        return self
+
+    def __exit__(self, error_type, error, traceback):
+        if error_type is not None:
+            self.args['error'] = error_type.__name__
+        self.tracer.add(self.name, self.category, self.start, time.time() - self.start, self.args)
+        return False
+
+
+tracer = Tracer(os.environ.get('SCRAPE_TRACE'))  # Process-wide; github_scraper.py --trace starts it too
+
+
+class EventLog:
+    """Structured, leveled scrape events - a ring buffer for the API plus an optional NDJSON file
+
+    emit() only counts, filters and queues; a background thread serialises and
+    writes the file, so per-player events cost about as much as a dict append.
+    High-volume events are sampled (1 in N kept, 'sampled': N on each kept line)
+    but always counted, and warnings and errors are echoed to stdout as one line.
+    """
+
+    LEVELS = {'debug': 10, 'info': 20, 'warning': 30, 'error': 40}
+    ICONS = {'debug': '·', 'info': 'ℹ️', 'warning': '⚠️', 'error': '❌'}
+    SAMPLE_EVERY = {'roster_player': 10, 'stats_player': 10, 'player_skipped': 5}
+    CAPACITY = 5000
+
+    def __init__(self, path=None, level='info', console_level='warning', sample=None):
+        self.threshold = self.LEVELS[level]
+        self.console_threshold = self.LEVELS[console_level]
+        self.sample = dict(self.SAMPLE_EVERY if sample is None else sample)
+        self.counts = {}  # (level, event) -> emitted, including filtered and sampled-out
+        self.recent_events = deque(maxlen=self.CAPACITY)
+        self.lock = threading.Lock()
+        self.path = None
+        self.queue = None
+        self.writer = None
+        if path:
+            self.start(path)
+
+    def set_level(self, level):
+        self.threshold = self.LEVELS[level]
+
+    def start(self, path):
+        """Also write every kept event to an NDJSON file (one JSON object per line)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.queue = queue.SimpleQueue()
+        self.writer = threading.Thread(target=self._write_events, args=(path, self.queue),
+                                       name='event-log-writer', daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+
+    def emit(self, level, event, message=None, **fields):
+        key = (level, event)
+        with self.lock:
+            count = self.counts[key] = self.counts.get(key, 0) + 1
+        rank = self.LEVELS[level]
+        if rank < self.threshold:
+            return
+        every = self.sample.get(event, 1)
+        if every > 1:
+            if (count - 1) % every:
+                return
+            fields['sampled'] = every
+        record = {'ts': round(time.time(), 3), 'level': level, 'event': event,
+                  'thread': threading.current_thread().name}
+        if message:
+            record['msg'] = message
+        record.update(fields)
+        self.recent_events.append(record)
+        pending = self.queue
+        if pending is not None:
+            pending.put(record)
+        if rank >= self.console_threshold:
+            print(self.format(record))
+
+    def debug(self, event, message=None, **fields):
+        self.emit('debug', event, message, **fields)
+
+    def info(self, event, message=None, **fields):
+        self.emit('info', event, message, **fields)
+
+    def warning(self, event, message=None, **fields):
+        self.emit('warning', event, message, **fields)
+
+    def error(self, event, message=None, **fields):
+        self.emit('error', event, message, **fields)
+
+    def format(self, record):
+        if 'msg' in record:
+            return f"{self.ICONS[record['level']]} {record['msg']}"
+        details = ' '.join(f"{key}={value}" for key, value in record.items() if key not in ('ts', 'level', 'event', 'thread'))
+        return f"{self.ICONS[record['level']]} {record['event']} {details}".rstrip()
+
+    def recent(self, limit=100, level=None, event=None):
+        """Newest kept events first, optionally at or above a level and for one event name"""
+        rank = self.LEVELS[level] if level else 0
+        matches = []
+        for record in reversed(list(self.recent_events)):
+            if self.LEVELS[record['level']] >= rank and (event is None or record['event'] == event):
+                matches.append(record)
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    def summary_lines(self):
+        """Event totals, warnings and errors first"""
+        with self.lock:
+            counts = sorted(self.counts.items(), key=lambda item: (-self.LEVELS[item[0][0]], -item[1]))
+        return [f"   {self.ICONS[level]} {event:<28} {count:>7,}" for (level, event), count in counts]
+
+    @staticmethod
+    def _write_events(path, events):
+        with open(path, 'a', encoding='utf-8') as f:
+            while True:
+                record = events.get()
+                if record is None:
+                    break
+                f.write(json.dumps(record, default=str) + '\n')
+                if events.empty():
+                    f.flush()
+
+    def close(self):
+        """Drain the queue and close the file"""
+        writer = self.writer
+        if writer is None:
+            return
+        self.writer = None
+        self.queue.put(None)
+        writer.join(timeout=30)
+        self.queue = None
+
+
+events = EventLog(os.environ.get('SCRAPE_EVENTS'), level=os.environ.get('SCRAPE_LOG_LEVEL', 'info'))
+
+
+def error_summary(error):
+    """First line of an exception message (WebDriver errors carry whole stack traces)"""
+    return (str(error).strip().splitlines() or [type(error).__name__])[0]
+
+
+SECONDS_BUCKETS = [0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+METRIC_DEFINITIONS = {
+    # name: (type, help, histogram buckets)
+    'scraper_webdriver_commands_total': ('counter', 'WebDriver round trips by command', None),
+    'scraper_webdriver_command_seconds': ('histogram', 'WebDriver round-trip latency by command', SECONDS_BUCKETS),
+    'scraper_implicit_wait_stalls_total': ('counter', 'Element lookups that found nothing after waiting out the implicit wait', None),
+    'scraper_implicit_wait_stall_seconds_total': ('counter', 'Seconds spent in implicit-wait stalls', None),
+    'scraper_page_loads_total': ('counter', 'Page loads by outcome', None),
+    'scraper_page_bytes_total': ('counter', 'Bytes transferred for page documents', None),
+    'scraper_page_bytes': ('histogram', 'Page document size in bytes', [10e3, 50e3, 100e3, 250e3, 500e3, 1e6, 2.5e6, 5e6]),
+    'scraper_retries_total': ('counter', 'Retries by failure class', None),
+    'scraper_circuit_opens_total': ('counter', 'Times a host circuit breaker opened', None),
+    'scraper_step_seconds': ('histogram', 'Duration of scrape and save steps', SECONDS_BUCKETS + [120, 300, 600]),
+    'scraper_team_round_trips': ('histogram', 'WebDriver round trips per team', [10, 25, 50, 100, 250, 500, 1000, 2500, 5000]),
+    'scraper_teams_total': ('counter', 'Teams scraped by outcome', None),
+}
+
+
+class Metrics:
+    """In-process counters and histograms, rendered as Prometheus text or dumped as JSON"""
+
+    def __init__(self, definitions=METRIC_DEFINITIONS):
+        self.definitions = definitions
+        self.counters = {}    # (name, labels) -> value
+        self.histograms = {}  # (name, labels) -> [bucket counts..., +Inf count, sum]
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        buckets = self.definitions[name][2]
+        key = self._key(name, labels)
+        with self.lock:
+            series = self.histograms.get(key)
+            if series is None:
+                series = self.histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+            series[bisect.bisect_left(buckets, value)] += 1
+            series[-1] += value
+
+    def timed(self, step):
+        """Decorator: observe a function's duration as scraper_step_seconds{step=...}"""
+        def decorate(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                start = time.time()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    elapsed = time.time() - start
+                    self.observe('scraper_step_seconds', elapsed, step=step)
+                    tracer.add(step, 'step', start, elapsed)
+            return wrapper
+        return decorate
+
+    def total(self, name):
+        with self.lock:
+            return sum(value for (metric, _), value in self.counters.items() if metric == name)
+
+    @staticmethod
+    def _labels(labels, extra=None):
+        pairs = list(labels) + ([extra] if extra else [])
+        if not pairs:
+            return ''
+        escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+        return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+    def render_prometheus(self, gauges=None):
+        """Prometheus text exposition format (version 0.0.4)"""
+        with self.lock:
+            counters = dict(self.counters)
+            histograms = {key: list(series) for key, series in self.histograms.items()}
+        lines = []
+        for name, (kind, help_text, buckets) in self.definitions.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == 'counter':
+                for (metric, labels), value in sorted(counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}{self._labels(labels)} {value}")
+                continue
+            for (metric, labels), series in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(buckets + ['+Inf'], series[:-1]):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{self._labels(labels, ('le', bound))} {cumulative}")
+                lines.append(f"{name}_sum{self._labels(labels)} {series[-1]}")
+                lines.append(f"{name}_count{self._labels(labels)} {cumulative}")
+        for name, (help_text, value) in (gauges or {}).items():
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"])
+        return '\n'.join(lines) + '\n'
+
+    def to_dict(self):
+        """JSON-friendly snapshot: counters and histograms keyed by 'name{labels}'"""
+        with self.lock:
+            counters = {f"{name}{self._labels(labels)}": value for (name, labels), value in sorted(self.counters.items())}
+            histograms = {}
+            for (name, labels), series in sorted(self.histograms.items()):
+                buckets = self.definitions[name][2]
+                histograms[f"{name}{self._labels(labels)}"] = {
+                    'count': sum(series[:-1]),
+                    'sum': round(series[-1], 4),
+                    'buckets': {str(bound): count for bound, count in zip(buckets + ['+Inf'], series[:-1])}
+                }
+        return {'counters': counters, 'histograms': histograms}
+
+    def dump(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'time': datetime.now().isoformat(timespec='seconds'), **self.to_dict()}, f, indent=2)
+        print(f"📈 Metrics: {path}")
+
+
+metrics = Metrics()  # Process-wide registry (scrapers, save steps and the API share it)
+
+
+def instrument_driver(driver, scraper):
+    """Count and time every WebDriver round trip (element calls included - they all go through execute)"""
+    execute = driver.execute
+    implicit_wait = 10  # setup_driver's implicitly_wait
+
+    def instrumented_execute(command, params=None):
+        start = time.time()
+        try:
+            return_value = execute(command, params)
+        finally:
+            elapsed = time.time() - start
+            scraper.round_trips += 1
+            metrics.inc('scraper_webdriver_commands_total', command=command)
+            metrics.observe('scraper_webdriver_command_seconds', elapsed, command=command)
+            if tracer.enabled:
+                tracer.add(command, 'webdriver', start, elapsed,
+                           {'url': params.get('url')} if command == 'get' and params else None)
+        if command in ('findElements', 'findChildElements') and not (return_value or {}).get('value') \
+                and elapsed >= implicit_wait * 0.9:
+            metrics.inc('scraper_implicit_wait_stalls_total', command=command)
+            metrics.inc('scraper_implicit_wait_stall_seconds_total', elapsed)
+        return return_value
+
+    driver.execute = instrumented_execute
+    return driver
+
+
+class PageNotFoundError(WebDriverException):
+    """The page doesn't exist (404 or not-found redirect) - retrying can't help"""
+
+
+class RetryPolicy:
+    """Retries by failure class: transient and throttled failures back off exponentially with full jitter
+
+    Permanent failures (missing pages, parser bugs) are raised at once instead of
+    burning minutes on attempts that can't succeed.
+    """
+
+    def __init__(self, attempts=4, base_delay=2.0, max_delay=60.0, throttle_factor=4.0):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.throttle_factor = throttle_factor  # Throttled pages back off this much longer
+
+    @staticmethod
+    def classify(error):
+        """'transient', 'throttled' or 'permanent'"""
+        if isinstance(error, PageNotFoundError):
+            return 'permanent'
+        if isinstance(error, PageBlockedError):
+            return 'throttled'
+        if isinstance(error, (TimeoutException, WebDriverException, requests.RequestException, OSError)):
+            return 'transient'
+        return 'permanent'
+
+    def backoff(self, attempt, kind):
+        """Full jitter: uniform in [0, min(max_delay, base * 2^attempt)]"""
+        ceiling = self.base_delay * (2 ** (attempt - 1)) * (self.throttle_factor if kind == 'throttled' else 1)
+        return random.uniform(0, min(self.max_delay, ceiling))
+
+    def run(self, action, description, should_stop=None, on_backoff=None):
+        """Call action() until it succeeds, a permanent failure occurs or attempts run out"""
+        for attempt in range(1, self.attempts + 1):
+            try:
+                return action()
+            except Exception as e:
+                kind = self.classify(e)
+                if kind == 'permanent' or attempt == self.attempts or (should_stop and should_stop()):
+                    if attempt > 1 or kind != 'permanent':
+                        reason = error_summary(e)
+                        events.error('retry_gave_up', f"{description}: giving up after {attempt} attempt(s) ({kind}: {reason})",
+                                     target=description, attempts=attempt, kind=kind, error=reason)
+                    raise
+                wait = self.backoff(attempt, kind)
+                metrics.inc('scraper_retries_total', kind=kind)
+                events.warning('retry', f"{description}: {kind} failure ({e.__class__.__name__}), retry {attempt + 1}/{self.attempts} in {wait:.1f}s",
+                               target=description, attempt=attempt + 1, kind=kind, error=e.__class__.__name__, wait=round(wait, 2))
+                with tracer.span('backoff', 'wait', kind=kind, attempt=attempt):
+                    time.sleep(wait)
+                if on_backoff:
+                    on_backoff(wait)
+
+
+class CircuitBreaker:
+    """Per-host breaker: after repeated transient failures every scraper pauses until a probe succeeds
+
+    closed -> open after failure_threshold consecutive transient failures; after the
+    cooldown one probe request is let through (half-open). Success closes the breaker,
+    failure reopens it with a doubled cooldown.
+    """
+
+    def __init__(self, host, failure_threshold=5, cooldown=60.0, max_cooldown=600.0):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = 'closed'
+        self.failures = 0
+        self.open_until = 0.0
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def before_request(self, should_stop=None):
+        """Wait while the breaker is open (or another scraper's probe is in flight)"""
+        announced = False
+        while True:
+            with self.lock:
+                now = time.time()
+                if self.state == 'closed':
+                    return
+                if self.state == 'open' and now >= self.open_until:
+                    self.state = 'half-open'
+                if self.state == 'half-open' and not self.probing:
+                    self.probing = True
+                    print(f"🔌 {self.host}: circuit half-open - probing")
+                    return
+                wait = max(self.open_until - now, 1.0)
+            if should_stop and should_stop():
+                return
+            if not announced:
+                print(f"⛔ {self.host}: circuit open - pausing {wait:.0f}s")
+                announced = True
+            time.sleep(min(wait, 5.0))
+
+    def record(self, success):
+        with self.lock:
+            self.probing = False
+            if success:
+                if self.state != 'closed':
+                    print(f"✅ {self.host}: circuit closed")
+                self.state = 'closed'
+                self.failures = 0
+                self.cooldown = self.base_cooldown
+                return
+            self.failures += 1
+            if self.state == 'half-open':
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            elif self.failures < self.failure_threshold:
+                return
+            self.state = 'open'
+            self.open_until = time.time() + self.cooldown
+            metrics.inc('scraper_circuit_opens_total', host=self.host)
+            print(f"⛔ {self.host}: circuit opened after {self.failures} failures - cooling down {self.cooldown:.0f}s")
+
+
+circuit_breakers = {}  # host -> CircuitBreaker, shared by every scraper in the process
+circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(host):
+    with circuit_breakers_lock:
+        if host not in circuit_breakers:
+            circuit_breakers[host] = CircuitBreaker(host)
+        return circuit_breakers[host]
+
+
+class AdaptiveRateController:
+    """AIMD request pacing: speed up additively while pages come back fast, halve the rate on trouble
+
+    Every page load waits for its slot (so concurrent scrapers sharing one controller
+    share one budget), then reports its latency and outcome: 'ok', 'timeout', 'error'
+    or 'throttled'. A page much slower than the best latency seen counts as congestion.
+    The pace never gets faster than min_interval (default: the initial interval, so a
+    caller's delay is a floor the controller only backs off from).
+    """
+
+    MIN_INTERVAL = 0.5      # Fastest pace any caller may ask for: 2 requests per second
+    MAX_INTERVAL = 60.0     # Slowest pace after repeated trouble
+    INCREASE = 0.02         # Requests/second added after each healthy page
+    DECREASE = 0.5          # Rate multiplier on timeouts, errors and block pages
+    SLOW_DECREASE = 0.8     # Rate multiplier when latency rises well above the baseline
+    SLOW_FACTOR = 2.0       # "Well above" = this many times the baseline latency...
+    SLOW_MARGIN = 2.0       # ...and at least this many seconds slower
+
+    def __init__(self, initial_interval=3.0, min_interval=None):
+        self.min_interval = self.clamp(initial_interval if min_interval is None else min_interval)
+        self.rate = 1.0 / max(self.clamp(initial_interval), self.min_interval)
+        self.next_slot = 0.0
+        self.latency = None   # EWMA of page latency
+        self.baseline = None  # Lowest latency EWMA seen - the site's healthy speed
+        self.lock = threading.Lock()
+        self.counts = {'ok': 0, 'slow': 0, 'timeout': 0, 'error': 0, 'throttled': 0}
+
+    @property
+    def interval(self):
+        return 1.0 / self.rate
+
+    @classmethod
+    def clamp(cls, interval):
+        return min(max(interval, cls.MIN_INTERVAL), cls.MAX_INTERVAL)
+
+    def set_min_interval(self, interval):
+        """Change the floor (e.g. when a more polite job joins a shared controller)"""
+        with self.lock:
+            self.min_interval = self.clamp(interval)
+            self.rate = min(self.rate, 1.0 / self.min_interval)
+
+    def wait(self):
+        """Block until this request's slot (slots are reserved under the lock, slept outside it)"""
+        with self.lock:
+            now = time.time()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def record(self, latency, outcome='ok'):
+        """Feed back one page load and adjust the rate"""
+        with self.lock:
+            if outcome == 'ok':
+                self.latency = latency if self.latency is None else 0.7 * self.latency + 0.3 * latency
+                self.baseline = self.latency if self.baseline is None else min(self.baseline, self.latency)
+                if latency > max(self.baseline * self.SLOW_FACTOR, self.baseline + self.SLOW_MARGIN):
+                    outcome = 'slow'
+                    self.rate *= self.SLOW_DECREASE
+                else:
+                    self.rate += self.INCREASE
+            else:
+                self.rate *= self.DECREASE
+            self.rate = min(max(self.rate, 1.0 / self.MAX_INTERVAL), 1.0 / self.min_interval)
+            self.counts[outcome] += 1
+            if outcome != 'ok':
+                # Back off now rather than after the already-reserved slot
+                self.next_slot = max(self.next_slot, time.time() + self.interval)
+
+    def summary(self):
+        with self.lock:
+            requests_made = sum(self.counts.values())
+            latency = f"{self.latency:.2f}s" if self.latency is not None else 'n/a'
+            return (f"{self.rate * 60:.1f} req/min (every {self.interval:.2f}s), "
+                    f"{requests_made} pages, latency {latency}, "
+                    f"slow {self.counts['slow']}, timeouts {self.counts['timeout']}, "
+                    f"errors {self.counts['error']}, throttled {self.counts['throttled']}")
+
+
+class TimingStore:
+    """Per-team, per-phase scrape timings kept across runs as EWMAs in a small JSON file
+
+    Feeds ETAs, time budgets and shard balancing. Teams never timed are estimated
+    from their league's median, then the overall median.
+    """
+
+    PHASES = ['wait', 'navigation', 'roster_parse', 'stats_parse', 'combine']
+    ALPHA = 0.5  # Weight of the newest run
+    DEFAULT_TEAM_SECONDS = 60
+
+    def __init__(self, path=None):
+        self.path = path
+        self.teams = {}  # team id -> {'league', 'name', 'runs', 'total', 'phases': {phase: seconds}}
+        self.lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.teams = json.load(f).get('teams', {})
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Could not read timings from {path}: {e}")
+
+    def record(self, team_id, league, name, phases):
+        """Fold one team's phase timings into its history"""
+        if not team_id:
+            return
+        with self.lock:
+            entry = self.teams.setdefault(team_id, {'runs': 0, 'phases': {}})
+            entry.update(league=league, name=name)
+            for phase, seconds in phases.items():
+                previous = entry['phases'].get(phase)
+                entry['phases'][phase] = round(seconds if previous is None else
+                                               self.ALPHA * seconds + (1 - self.ALPHA) * previous, 2)
+            entry['total'] = round(sum(entry['phases'].values()), 2)
+            entry['runs'] += 1
+
+    def merge(self, teams):
+        """Adopt entries recorded elsewhere (e.g. by parallel shards)"""
+        with self.lock:
+            self.teams.update(teams)
+
+    def _median(self, league=None):
+        totals = [entry['total'] for entry in self.teams.values()
+                  if entry.get('total') and (league is None or entry.get('league') == league)]
+        if not totals:
+            return None
+        totals.sort()
+        middle = len(totals) // 2
+        return totals[middle] if len(totals) % 2 else (totals[middle - 1] + totals[middle]) / 2
+
+    def estimate(self, team_id, league=None):
+        """Expected seconds to scrape a team"""
+        with self.lock:
+            entry = self.teams.get(team_id)
+            if entry and entry.get('total'):
+                return entry['total']
+            return (league and self._median(league)) or self._median() or self.DEFAULT_TEAM_SECONDS
+
+    def league_estimate(self, league):
+        """Expected seconds for a whole league (None if it was never timed)"""
+        with self.lock:
+            totals = [entry['total'] for entry in self.teams.values() if entry.get('league') == league and entry.get('total')]
+            return sum(totals) if totals else None
+
+    def save(self):
+        if not self.path:
+            return
+        with self.lock:
+            # Serialised under the lock - scheduler workers keep recording into self.teams
+            payload = json.dumps({'updated': datetime.now().isoformat(timespec='seconds'), 'phases': self.PHASES,
+                                  'teams': self.teams}, indent=1)
+        directory = os.path.dirname(self.path) or '.'
+        try:
+            os.makedirs(directory, exist_ok=True)
+            # A temp file per save, so concurrent saves never interleave in one .tmp
+            with tempfile.NamedTemporaryFile('w', dir=directory, prefix='.timings-', suffix='.tmp', delete=False) as f:
+                f.write(payload)
+            os.replace(f.name, self.path)
+        except OSError as e:
+            print(f"⚠️ Could not save timings: {e}")
+
+    @classmethod
+    def summary_lines(cls, totals):
+        """'Where time went' table for a run's phase totals"""
+        overall = sum(totals.values()) or 1
+        return [f"      {phase:<13}{totals.get(phase, 0):>9.1f}s {100 * totals.get(phase, 0) / overall:>5.1f}%"
+                for phase in cls.PHASES]
+
+
+TIMINGS_FILE = os.path.join('data', 'timings.json')  # Not a snapshot - is_snapshot_file keeps it out of the index
+# Fastest pace the API, scheduler and GitHub runs adapt up to unless a request sets min_delay
+MIN_DELAY = 1.0
+# Where pages are fetched from - point it at mock_eliteprospects.py for load tests
+EP_BASE_URL = os.environ.get('EP_BASE_URL', 'https://www.eliteprospects.com').rstrip('/')
+
+
 class EliteProspectsScraper:
-    def __init__(self, headless=True, delay=3, max_teams=None, batch_size=5):
-        self.delay = delay
+    BLOCKED_TITLES = ['429', 'too many requests', 'access denied', 'forbidden', 'just a moment',
+                      'attention required', '503', 'service unavailable', 'rate limit']
+
+    def __init__(self, headless=True, delay=3, max_teams=None, batch_size=5, rate_controller=None, timing_store=None,
+                 driver=None, base_url=None, min_delay=None):
+        self.delay = delay  # Starting interval between page loads; the rate controller adapts from there
         self.max_teams = max_teams
         self.batch_size = batch_size
-        self.setup_driver(headless)
-        self.base_url = "https://www.eliteprospects.com"
+        # Never faster than min_delay - by default the requested delay itself
+        self.rate = rate_controller or AdaptiveRateController(delay, min_delay)
+        self.retry = RetryPolicy()
+        self.timings = timing_store or TimingStore(TIMINGS_FILE)
+        self.phase_times = {}  # Current team's seconds per phase
+        self.round_trips = 0   # WebDriver commands issued (see instrument_driver)
+        if driver is None:
+            self.setup_driver(headless)
+        else:
+            self.driver = driver  # Any WebDriver-like object, e.g. fixtures.FixtureDriver for offline runs
+        self.base_url = (base_url or EP_BASE_URL).rstrip('/')
         self.progress_callback = None
         self.should_stop = False
         self.scraped_count = 0
@@ -56,8 +1075,8 @@ class EliteProspectsScraper:
         self.should_stop = True
         logger.info("Stop signal received")
 
-    def report_progress(self, message, current=None, total=None, team_data=None):
-        """Enhanced progress reporting with FIXED real-time data flow"""
+    def report_progress(self, message, current=None, total=None, team_data=None, new_team=None):
+        """Enhanced progress reporting - completed teams are sent once, as deltas"""
         if current is not None and total is not None:
             progress_pct = (current / total) * 100 if total > 0 else 0
             # Only print major milestones to reduce noise
@@ -68,20 +1087,23 @@ class EliteProspectsScraper:
             if any(keyword in message.lower() for keyword in ['error', 'complete', 'starting', 'found', 'scraping']):
                 print(f"🔄 {message}")
 
-        # FIXED: Always send to callback for dashboard with live teams data
+        # FIXED: Always send to callback for dashboard
         if self.progress_callback:
             progress_data = {
                 'message': message,
                 'current': current or 0,
                 'total': total or 0,
                 'percentage': (current / total) * 100 if (current and total and total > 0) else 0,
-                'completed': current == total if (current and total) else False,
-                'live_teams': self.live_teams.copy()  # CRITICAL: Send current live teams
+                'completed': current == total if (current and total) else False
             }
             
             # Add current team being processed
             if team_data:
                 progress_data['current_team'] = team_data
+            
+            # A just-completed team travels once; the progress log sequences it for clients
+            if new_team is not None:
+                progress_data['new_team'] = new_team
                 
             self.progress_callback(progress_data)
 
@@ -143,6 +1165,7 @@ class EliteProspectsScraper:
             
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
             self.driver.implicitly_wait(10)
+            instrument_driver(self.driver, self)
             
             # Only print on successful initialization
             print("✅ Chrome driver ready")
@@ -151,96 +1174,120 @@ class EliteProspectsScraper:
             print(f"❌ Chrome driver failed: {e}")
             raise
 
+    def load_page(self, url, timeout=30):
+        """Rate-limited page load shared by every fetch path - latency and failures feed the rate controller
+
+        Raises PageNotFoundError for missing pages and PageBlockedError for throttle pages
+        so RetryPolicy can tell them apart from transient driver failures.
+        """
+        breaker = get_circuit_breaker(urlparse(url).netloc)
+        wait_start = time.time()
+        breaker.before_request(lambda: self.should_stop)
+        self.rate.wait()
+        start = time.time()
+        self.add_phase('wait', start - wait_start)
+        tracer.add('wait', 'wait', wait_start, start - wait_start)
+        answered = False
+        try:
+            self.driver.set_page_load_timeout(timeout)
+            self.driver.get(url)
+            answered = True
+        except TimeoutException:
+            self.add_phase('navigation', time.time() - start)
+            metrics.inc('scraper_page_loads_total', outcome='timeout')
+            self.rate.record(time.time() - start, 'timeout')
+            raise
+        except WebDriverException:
+            self.add_phase('navigation', time.time() - start)
+            metrics.inc('scraper_page_loads_total', outcome='error')
+            self.rate.record(time.time() - start, 'error')
+            raise
+        finally:
+            # Any exception is a failure (urllib3 errors when chromedriver dies too), so a
+            # half-open probe always frees its slot; throttle pages and 404s are answers
+            breaker.record(answered)
+        
+        latency = time.time() - start
+        self.add_phase('navigation', latency)
+        self.record_page_bytes()
+        title = (self.driver.title or '').lower()
+        if any(marker in title for marker in self.BLOCKED_TITLES):
+            metrics.inc('scraper_page_loads_total', outcome='throttled')
+            self.rate.record(latency, 'throttled')
+            raise PageBlockedError(f"Throttled or blocked: {self.driver.title}")
+        metrics.inc('scraper_page_loads_total', outcome='ok')
+        self.rate.record(latency, 'ok')
+        title_words = title.replace('|', ' ').replace('-', ' ').split()
+        current_path = urlparse(self.driver.current_url).path.lower().rstrip('/')
+        if '404' in title_words or 'not found' in title or current_path.endswith('/404') or 'not-found' in current_path:
+            raise PageNotFoundError(f"Page not found: {url}")
+        return latency
+
+    def site_url(self, url):
+        """The same page on this scraper's base URL (league URLs arrive as eliteprospects.com links)"""
+        parts = urlparse(url)
+        return self.base_url + parts.path + (f"?{parts.query}" if parts.query else '')
+
+    def load_page_with_retry(self, url, description, timeout=30):
+        """load_page under the retry policy (stops retrying when the scrape is stopped)"""
+        return self.retry.run(lambda: self.load_page(url, timeout), description, lambda: self.should_stop,
+                              lambda seconds: self.add_phase('wait', seconds))
+
+    def record_page_bytes(self):
+        """Size of the loaded document from the Navigation Timing API (one small round trip)"""
+        try:
+            size = self.driver.execute_script(
+                "const nav = performance.getEntriesByType('navigation')[0];"
+                "return nav ? (nav.decodedBodySize || nav.transferSize || 0) : 0;"
+            )
+        except WebDriverException:
+            return
+        if size:
+            metrics.inc('scraper_page_bytes_total', size)
+            metrics.observe('scraper_page_bytes', size)
+
+    def add_phase(self, phase, seconds):
+        self.phase_times[phase] = self.phase_times.get(phase, 0.0) + seconds
+
+    def timed_parse(self, phase, action):
+        """Run a scrape step, booking its time minus the page loads inside it to phase"""
+        before = sum(self.phase_times.values())
+        start = time.time()
+        with tracer.span(phase, 'phase'):
+            result = action()
+        self.add_phase(phase, time.time() - start - (sum(self.phase_times.values()) - before))
+        return result
+
     def get_league_teams(self, league_url, season="2025-2026"):
         """Get all teams from a league page"""
         try:
             # Ensure league URL includes season
+            league_url = self.site_url(league_url)
             if not league_url.endswith(f"/{season}"):
                 league_url = f"{league_url}/{season}"
 
-            print(f"🔍 Fetching teams from: {league_url}")
-            print(f"   League: {self.extract_league_name(league_url)}")
-            print(f"   Season: {season}")
-            
-            # Special diagnostic for EHL/EHLP
             league_name = self.extract_league_name(league_url)
-            if league_name in ['EHL', 'EHLP']:
-                print(f"\n{'='*60}")
-                print(f"⚠️  DIAGNOSTIC MODE: {league_name}")
-                print(f"{'='*60}")
-                print(f"This league may have different page structure")
-                print(f"Will attempt multiple XPath patterns...")
-                print(f"{'='*60}\n")
-            
-            logger.debug(f"Scraping teams from league: {league_url}")
-            
-            # Try loading page up to 3 times
-            max_retries = 3
-            page_loaded = False
+            print(f"🔍 Fetching {league_name} teams: {league_url}")
+            events.info('league_fetch', league=league_name, season=season, url=league_url)
             
-            for attempt in range(1, max_retries + 1):
-                try:
-                    # Set page load timeout to 30 seconds
-                    self.driver.set_page_load_timeout(30)
-                    
-                    if attempt > 1:
-                        print(f"\n🔄 Retry attempt {attempt}/{max_retries}")
-                        time.sleep(3)  # Brief pause before retry
-                    
-                    print(f"🌐 Loading URL: {league_url}")
-                    self.driver.get(league_url)
-                    
-                    # Get current URL to check for redirects
-                    current_url = self.driver.current_url
-                    if current_url != league_url:
-                        print(f"⚠️  REDIRECT DETECTED:")
-                        print(f"   Requested: {league_url}")
-                        print(f"   Actual:    {current_url}")
-                        
-                        # Check if redirected to a 404 or error page
-                        if '404' in current_url or 'not-found' in current_url.lower():
-                            print(f"❌ Page not found (404)")
-                            print(f"⚠️  This league/season combination might not exist on EliteProspects")
-                            return []
-                    
-                    print(f"✅ Page loaded successfully")
-                    
-                    # Check page title
-                    try:
-                        page_title = self.driver.title
-                        print(f"📄 Page title: {page_title}")
-                        if '404' in page_title or 'Not Found' in page_title:
-                            print(f"❌ Page title indicates error")
-                            return []
-                    except:
-                        pass
-                    
-                    # Success!
-                    page_loaded = True
-                    break
-                    
-                except Exception as e:
-                    print(f"❌ Attempt {attempt}/{max_retries} failed: {e}")
-                    
-                    if attempt < max_retries:
-                        print(f"⏳ Waiting before retry...")
-                        time.sleep(5)  # Wait 5 seconds before retry
-                    else:
-                        # Final attempt failed
-                        print(f"\n{'='*60}")
-                        print(f"❌ ALL {max_retries} ATTEMPTS FAILED")
-                        print(f"{'='*60}")
-                        print(f"⚠️  The page may be temporarily unavailable")
-                        print(f"⚠️  OR the URL might be invalid")
-                        print(f"⚠️  Try again later or check the URL manually")
-                        print(f"{'='*60}\n")
-                        return []
-            
-            if not page_loaded:
+            try:
+                with tracer.span(f"{league_name} team list", 'league'):
+                    self.load_page_with_retry(league_url, f"League page {league_name}", timeout=30)
+            except PageNotFoundError:
+                events.error('league_not_found', f"{league_name} {season} not found (404) - the league/season may not exist on EliteProspects",
+                             league=league_name, url=league_url)
+                return []
+            except Exception as e:
+                events.error('league_unavailable', f"{league_name} page unavailable after {self.retry.attempts} attempts - try again later",
+                             league=league_name, url=league_url, error=error_summary(e))
                 return []
             
-            time.sleep(self.delay)
-            print(f"⏱️ Waited {self.delay}s for page to fully render")
+            # Get current URL to check for redirects
+            current_url = self.driver.current_url
+            if current_url != league_url:
+                events.warning('league_redirect', f"{league_name} redirected: {league_url} -> {current_url}",
+                               league=league_name, requested=league_url, actual=current_url)
+            events.debug('league_loaded', league=league_name, title=self.driver.title)
 
             teams = []
             team_links = []
@@ -248,59 +1295,49 @@ class EliteProspectsScraper:
 
             # Try multiple XPath selectors for different league page structures
             self.report_progress(f"Searching for team links...")
-            print(f"🔎 Trying multiple XPath patterns...")
             
             # Pattern 1: div[3] (works for NA3HL, NAHL, etc)
             if len(team_links) == 0:
-                print(f"   Attempt 1: //section/div[3]/ul/li/span/a")
                 try:
                     team_links = self.driver.find_elements(By.XPATH, "//section/div[3]/ul/li/span/a[contains(@href, '/team/')]")
                     if len(team_links) > 0:
                         successful_pattern = "Pattern 1 (div[3])"
-                    print(f"   → Found {len(team_links)} teams")
                 except Exception as e:
-                    print(f"   → XPath error: {e}")
+                    events.debug('team_pattern_error', league=league_name, error=error_summary(e))
                     team_links = []
             
             # Pattern 2: div[2] (works for EHLP, USPHL Elite, etc)
             if len(team_links) == 0:
-                print(f"   Attempt 2: //section/div[2]/ul/li/span/a")
                 try:
                     team_links = self.driver.find_elements(By.XPATH, "//section/div[2]/ul/li/span/a[contains(@href, '/team/')]")
                     if len(team_links) > 0:
                         successful_pattern = "Pattern 2 (div[2]) - EHLP/Elite structure"
-                    print(f"   → Found {len(team_links)} teams")
                 except Exception as e:
-                    print(f"   → XPath error: {e}")
+                    events.debug('team_pattern_error', league=league_name, error=error_summary(e))
                     team_links = []
             
             # Pattern 3: Any div position in section
             if len(team_links) == 0:
-                print(f"   Attempt 3: //section//ul/li/span/a (any div)")
                 try:
                     team_links = self.driver.find_elements(By.XPATH, "//section//ul/li/span/a[contains(@href, '/team/')]")
                     if len(team_links) > 0:
                         successful_pattern = "Pattern 3 (flexible div)"
-                    print(f"   → Found {len(team_links)} teams")
                 except Exception as e:
-                    print(f"   → XPath error: {e}")
+                    events.debug('team_pattern_error', league=league_name, error=error_summary(e))
                     team_links = []
             
             # Pattern 4: Direct from content div (EHLP specific structure)
             if len(team_links) == 0:
-                print(f"   Attempt 4: //div[contains(@class,'Layout_content')]//section//ul/li/span/a")
                 try:
                     team_links = self.driver.find_elements(By.XPATH, "//div[contains(@class,'Layout_content')]//section//ul/li/span/a[contains(@href, '/team/')]")
                     if len(team_links) > 0:
                         successful_pattern = "Pattern 4 (Layout_content class)"
-                    print(f"   → Found {len(team_links)} teams")
                 except Exception as e:
-                    print(f"   → XPath error: {e}")
+                    events.debug('team_pattern_error', league=league_name, error=error_summary(e))
                     team_links = []
             
             # Final fallback: Any team link on page
             if len(team_links) == 0:
-                print(f"   Attempt 5: //a[contains(@href, '/team/')] (last resort)")
                 try:
                     all_links = self.driver.find_elements(By.XPATH, "//a[contains(@href, '/team/') and contains(@href, '/{season}')]".replace('{season}', season))
                     # Filter to only roster links (not stats, transactions, etc)
@@ -309,23 +1346,15 @@ class EliteProspectsScraper:
                                   and '/schedule' not in link.get_attribute('href')]
                     if len(team_links) > 0:
                         successful_pattern = "Pattern 5 (fallback with filtering)"
-                    print(f"   → Found {len(team_links)} team links (filtered)")
                 except Exception as e:
-                    print(f"   → XPath error: {e}")
+                    events.debug('team_pattern_error', league=league_name, error=error_summary(e))
                     team_links = []
 
-            print(f"\n📋 Final result: {len(team_links)} team links found")
-            if successful_pattern:
-                print(f"✅ Success using: {successful_pattern}")
-            logger.debug(f"Found {len(team_links)} potential team links")
             self.report_progress(f"Found {len(team_links)} teams")
             
             if len(team_links) == 0:
-                print(f"\n{'='*60}")
-                print(f"❌ NO TEAMS FOUND")
-                print(f"{'='*60}")
-                print(f"⚠️  Page might have different HTML structure")
-                print(f"⚠️  Saving screenshot and HTML for debugging...")
+                events.error('no_teams_found', f"No team links on the {league_name} page - the HTML structure may have changed",
+                             league=league_name, url=league_url)
                 try:
                     import os
                     league_slug = league_url.split('/league/')[-1].replace('/', '_')
@@ -334,25 +1363,18 @@ class EliteProspectsScraper:
                     screenshot_filename = f"league_page_{league_slug}.png"
                     screenshot_path = os.path.join(os.getcwd(), screenshot_filename)
                     self.driver.save_screenshot(screenshot_path)
-                    print(f"📸 Screenshot saved to: {screenshot_path}")
                     
                     # Save HTML source
                     html_filename = f"league_page_{league_slug}.html"
                     html_path = os.path.join(os.getcwd(), html_filename)
                     with open(html_path, 'w', encoding='utf-8') as f:
                         f.write(self.driver.page_source)
-                    print(f"📄 HTML source saved to: {html_path}")
-                    print(f"   Open this file to inspect the page structure")
-                    
-                    print(f"📸 View screenshot: file://{screenshot_path}")
-                    print(f"📄 View HTML: file://{html_path}")
+                    events.warning('league_debug_files', f"Saved file://{screenshot_path} and file://{html_path} for inspection",
+                                   league=league_name, screenshot=screenshot_path, html=html_path)
                 except Exception as e:
-                    print(f"❌ Could not save debug files: {e}")
-                print(f"{'='*60}\n")
+                    events.error('league_debug_files_failed', f"Could not save debug files: {e}", league=league_name)
                 return []
 
-            print(f"🔄 Processing {len(team_links)} team links...")
-            processed_count = 0
             for idx, link in enumerate(team_links, 1):
                 href = link.get_attribute('href')
                 team_name = link.text.strip()
@@ -376,7 +1398,7 @@ class EliteProspectsScraper:
                         
                         if team_id.isdigit():  # Valid numeric team ID
                             # Construct proper team URL with season
-                            team_url = f"https://www.eliteprospects.com/team/{team_id}/{team_slug}/{season}"
+                            team_url = f"{self.base_url}/team/{team_id}/{team_slug}/{season}"
 
                             teams.append({
                                 'id': team_id,
@@ -384,15 +1406,10 @@ class EliteProspectsScraper:
                                 'url': team_url,
                                 'league': self.extract_league_name(league_url)
                             })
-                            processed_count += 1
-                            if processed_count % 5 == 0:
-                                print(f"  ✓ Processed {processed_count}/{len(team_links)} teams...")
                     except Exception as e:
                         # Skip this team if URL parsing fails
                         continue
             
-            print(f"✅ Finished processing all team links - {len(teams)} teams extracted")
-
             # Remove duplicates
             unique_teams = []
             seen_ids = set()
@@ -401,31 +1418,22 @@ class EliteProspectsScraper:
                     unique_teams.append(team)
                     seen_ids.add(team['id'])
 
-            print(f"\n{'='*60}")
-            print(f"🔹 Found {len(unique_teams)} unique teams:")
-            print(f"{'='*60}")
-            for i, team in enumerate(unique_teams[:10], 1):  # Show first 10
-                print(f"   {i}. {team['name']}")
-            if len(unique_teams) > 10:
-                print(f"   ... and {len(unique_teams) - 10} more teams")
-            print(f"{'='*60}\n")
-            
-            logger.info(f"Found {len(unique_teams)} unique teams")
+            events.info('league_teams', league=league_name, teams=len(unique_teams), links=len(team_links),
+                        pattern=successful_pattern, names=[team['name'] for team in unique_teams])
             return unique_teams
 
         except Exception as e:
-            print(f"❌ Error in get_league_teams: {e}")
-            logger.error(f"Error scraping league teams: {e}")
+            events.error('league_teams_failed', f"Error in get_league_teams: {e}", league_url=league_url, error=str(e))
             import traceback
             traceback.print_exc()
             return []
 
     def extract_league_name(self, league_url):
-        """Extract league name from URL"""
+        """Extract league name from URL (the path segment after /league/, whatever the host)"""
         try:
-            parts = league_url.split('/')
+            parts = urlparse(league_url).path.split('/')
             for part in parts:
-                if part and part not in ['https:', 'www.eliteprospects.com', 'league']:
+                if part and part != 'league':
                     # Remove season from league name using simple string methods
                     clean_part = part
                     # Remove common season patterns like "-2025-2026"
@@ -442,11 +1450,11 @@ class EliteProspectsScraper:
         except:
             return "UNKNOWN"
 
+    @metrics.timed('scrape_team_roster')
     def scrape_team_roster(self, team_url, team_info=None):
         """Scrape team roster with real-time updates"""
         try:
-            self.driver.get(team_url)
-            time.sleep(self.delay + 2)
+            self.load_page_with_retry(team_url, f"Roster page {team_info.get('name', 'Unknown') if team_info else team_url}")
 
             players = []
 
@@ -455,10 +1463,12 @@ class EliteProspectsScraper:
                 "//div[@class='Roster_player__e6EbP']/a[contains(@class,'TextLink_link__RhSiC')]")
 
             total_players = len(player_elements)
-            print(f"🔍 Found {total_players} player elements in roster for {team_info.get('name', 'Unknown') if team_info else 'Unknown'}")
+            team_name = team_info.get('name', 'Unknown Team') if team_info else 'Unknown Team'
+            skipped = 0
+            events.debug('roster_elements', team=team_name, elements=total_players)
             
             if total_players == 0:
-                print(f"⚠️ No roster players found for {team_info.get('name', 'Unknown') if team_info else 'Unknown'}")
+                events.warning('roster_empty', f"No roster players found for {team_name}", team=team_name, url=team_url)
                 return []
 
             for i, player_elem in enumerate(player_elements):
@@ -474,17 +1484,25 @@ class EliteProspectsScraper:
                     except:
                         pass
                     
+                    # Rows linking to a league page (e.g. /league/<x>/team-captaincy/) are not players
+                    if '/league/' in profile_url:
+                        skipped += 1
+                        events.debug('player_skipped', team=team_name, name=player_name_raw, reason='not_a_player')
+                        continue
+                    
                     # AGGRESSIVE FILTERING: Clean all whitespace (including nbsp and other unicode)
                     cleaned_name = ''.join(player_name_raw.split())  # Removes ALL whitespace
                     
                     # Skip if the element is JUST "A" or "C" (captain designations) or single char
                     if cleaned_name in ['A', 'C', 'AC', 'CA', ''] or len(cleaned_name) <= 1:
-                        print(f"     ⏭️ Skipping captain designation or too short: '{player_name_raw}' (cleaned: '{cleaned_name}')")
+                        skipped += 1
+                        events.debug('player_skipped', team=team_name, name=player_name_raw, reason='captain')
                         continue
                     
                     # Also check the raw name
                     if player_name_raw in ['A', 'C', '']:
-                        print(f"     ⏭️ Skipping captain designation: '{player_name_raw}'")
+                        skipped += 1
+                        events.debug('player_skipped', team=team_name, name=player_name_raw, reason='captain')
                         continue
                     
                     # Remove captain designations from end of name
@@ -495,7 +1513,8 @@ class EliteProspectsScraper:
                     # Double-check after removal - check for single letters
                     cleaned_final = ''.join(player_name.split())
                     if cleaned_final in ['A', 'C', 'AC', 'CA', ''] or len(cleaned_final) <= 1:
-                        print(f"     ⏭️ Skipping invalid name after cleanup: '{player_name_raw}' -> '{player_name}' (cleaned: '{cleaned_final}')")
+                        skipped += 1
+                        events.debug('player_skipped', team=team_name, name=player_name_raw, reason='invalid_name')
                         continue
                     
                     # Extract position from parentheses in name
@@ -508,12 +1527,14 @@ class EliteProspectsScraper:
                             
                             # Skip goaltenders - we don't want (G) players
                             if position_from_name == 'G' or position_from_name == 'G/A':
-                                print(f"     ⏭️ Skipping goaltender: '{player_name_raw}'")
+                                skipped += 1
+                                events.debug('player_skipped', team=team_name, name=player_name_raw, reason='goaltender')
                                 continue
                             
                             # Skip (L) and (R) positions - these are not valid position designations
                             if position_from_name in ['L', 'R']:
-                                print(f"     ⏭️ Skipping invalid position: '{player_name_raw}' (Position: {position_from_name})")
+                                skipped += 1
+                                events.debug('player_skipped', team=team_name, name=player_name_raw, reason='invalid_position')
                                 continue
                             
                             # Remove position from name
@@ -532,7 +1553,8 @@ class EliteProspectsScraper:
 
                     year_text = self.safe_extract_text(parent_row,
                         ".//td[contains(@class,'SortTable_trow__T6wLH SortTable_left__VX4mw')]//span[1]")
-                    birth_year = self.parse_int(year_text) if year_text else self.calculate_birth_year(age)
+                    season = team_info.get('season', '2025-2026') if team_info else '2025-2026'
+                    birth_year = self.parse_int(year_text) if year_text else self.calculate_birth_year(age, season)
 
                     hometown = self.safe_extract_text(parent_row,
                         ".//td[@class='SortTable_trow__T6wLH SortTable_hideMobile__X1I3z SortTable_left__VX4mw']/a[contains(@class,'TextLink_link__RhSiC')]")
@@ -556,12 +1578,14 @@ class EliteProspectsScraper:
                         
                         # Block single letters and specific captain designations only
                         if final_cleaned in ['A', 'C', 'AC', 'CA', ''] or len(final_cleaned) <= 1:
-                            print(f"     ⏭️ FINAL BLOCK: Invalid name '{player_name}' (cleaned: '{final_cleaned}')")
+                            skipped += 1
+                            events.debug('player_skipped', team=team_name, name=player_name, reason='invalid_name')
                             continue
                         
                         # Also check raw player_name
                         if player_name.upper().strip() in ['A', 'C', 'AC', 'CA']:
-                            print(f"     ⏭️ FINAL BLOCK: Captain designation '{player_name}'")
+                            skipped += 1
+                            events.debug('player_skipped', team=team_name, name=player_name, reason='captain')
                             continue
                         
                         # Use position from name if available, otherwise from table
@@ -569,16 +1593,17 @@ class EliteProspectsScraper:
                         
                         # Skip goaltenders - check both sources
                         if final_position and final_position.strip().upper() in ['G', 'G/A', 'GOALIE', 'GOALTENDER']:
-                            print(f"     ⏭️ Skipping goaltender: {player_name} (Position: {final_position})")
+                            skipped += 1
+                            events.debug('player_skipped', team=team_name, name=player_name, reason='goaltender')
                             continue
                         
                         # Skip invalid L/R positions - final safety check
                         if final_position and final_position.strip().upper() in ['L', 'R']:
-                            print(f"     ⏭️ FINAL BLOCK: Invalid position {player_name} (Position: {final_position})")
+                            skipped += 1
+                            events.debug('player_skipped', team=team_name, name=player_name, reason='invalid_position')
                             continue
                         
-                        # REAL-TIME OUTPUT: Show player as it's found
-                        print(f"     ✓ {current_player}/{total_players}: {player_name} ({final_position})")
+                        events.debug('roster_player', team=team_name, index=current_player, name=player_name, position=final_position)
                         
                         player_data = {
                             'name': player_name,
@@ -606,68 +1631,43 @@ class EliteProspectsScraper:
                         
                         # Send real-time update every 5 players
                         if len(players) % 5 == 0 or len(players) == total_players:
-                            team_name = team_info.get('name', 'Unknown Team') if team_info else 'Unknown Team'
                             self.report_progress(
                                 f"Finding players in {team_name}...",
                                 team_data={'name': team_name, 'status': 'roster', 'players': players, 'current_count': len(players), 'total_count': total_players}
                             )
 
                 except Exception as e:
-                    print(f"     ❌ Error processing roster player {current_player}: {e}")
+                    events.warning('roster_player_error', team=team_name, index=current_player, error=error_summary(e))
                     continue
 
-            print(f"✅ Roster scrape completed: {len(players)} players")
+            print(f"✅ Roster scrape completed: {len(players)} players" + (f" ({skipped} skipped)" if skipped else ''))
             return players
 
         except Exception as e:
-            print(f"❌ Roster scrape failed: {e}")
+            events.error('roster_failed', f"Roster scrape failed: {error_summary(e)}", url=team_url, error=error_summary(e))
             return []
 
+    @metrics.timed('scrape_team_stats')
     def scrape_team_stats(self, team_url, team_info=None):
         """Scrape team statistics with real-time updates and retry logic"""
         
         team_name = team_info.get('name', 'Unknown') if team_info else 'Unknown'
         stats_url = f"{team_url}?tab=stats"
         
-        # Try loading stats page up to 3 times
-        max_retries = 3
-        page_loaded = False
-        
-        for attempt in range(1, max_retries + 1):
-            try:
-                if attempt > 1:
-                    print(f"🔄 Stats page retry {attempt}/{max_retries} for {team_name}")
-                    time.sleep(3)  # Brief pause before retry
-                
-                self.driver.get(stats_url)
-                WebDriverWait(self.driver, 15).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "body"))
-                )
-                time.sleep(self.delay + 2)
-                
-                # Success!
-                page_loaded = True
-                if attempt > 1:
-                    print(f"✅ Stats page loaded successfully on attempt {attempt}")
-                break
-                
-            except TimeoutException:
-                print(f"❌ Stats page timeout attempt {attempt}/{max_retries} for {team_name}")
-                if attempt < max_retries:
-                    print(f"⏳ Waiting before retry...")
-                    time.sleep(5)  # Wait 5 seconds before retry
-                else:
-                    print(f"❌ All {max_retries} attempts failed - proceeding without stats")
-                    return []
-                    
-            except Exception as e:
-                print(f"❌ Stats page error attempt {attempt}/{max_retries}: {e}")
-                if attempt < max_retries:
-                    time.sleep(5)
-                else:
-                    return []
+        def load_stats_page():
+            self.load_page(stats_url)
+            render_start = time.time()
+            WebDriverWait(self.driver, 15).until(
+                EC.presence_of_element_located((By.TAG_NAME, "body"))
+            )
+            self.add_phase('wait', time.time() - render_start)
         
-        if not page_loaded:
+        try:
+            self.retry.run(load_stats_page, f"Stats page {team_name}", lambda: self.should_stop,
+                           lambda seconds: self.add_phase('wait', seconds))
+        except Exception as e:
+            events.error('stats_unavailable', f"Stats page unavailable for {team_name} - proceeding without stats",
+                         team=team_name, url=stats_url, error=error_summary(e))
             return []
 
         try:
@@ -687,11 +1687,12 @@ class EliteProspectsScraper:
                     if not stats_rows:
                         stats_rows = stats_table[0].find_elements(By.XPATH, ".//tr")
                 else:
-                    print(f"❌ Stats table not found for {team_name}")
+                    events.warning('stats_table_missing', f"Stats table not found for {team_name}", team=team_name, url=stats_url)
                     return []
                 
             except Exception as e:
-                print(f"❌ Error finding stats table: {e}")
+                events.error('stats_table_error', f"Error finding stats table for {team_name}: {error_summary(e)}",
+                             team=team_name, error=error_summary(e))
                 return []
             
             # Filter to only valid player rows
@@ -709,10 +1710,10 @@ class EliteProspectsScraper:
                     continue
             
             total_stats_players = len(valid_rows)
-            print(f"🔍 Found {total_stats_players} valid stats rows for {team_name}")
+            events.debug('stats_rows', team=team_name, rows=len(stats_rows), valid=total_stats_players)
 
             if total_stats_players == 0:
-                print(f"❌ No valid stats found")
+                events.warning('stats_empty', f"No valid stats rows for {team_name}", team=team_name, rows=len(stats_rows))
                 return []
 
             for i, row in enumerate(valid_rows):
@@ -793,7 +1794,7 @@ class EliteProspectsScraper:
                             points = stat_cells[3]
                         
                     except Exception as e:
-                        print(f"     ❌ Error extracting stats: {e}")
+                        events.warning('stats_cell_error', team=team_name, name=player_name, error=error_summary(e))
 
                     if player_name and len(player_name) > 1:
                         stats_data = {
@@ -806,20 +1807,18 @@ class EliteProspectsScraper:
                             'pim': pim
                         }
                         stats.append(stats_data)
-                        
-                        # Debug output for first few players
-                        if len(stats) <= 3:
-                            print(f"     ✓ {player_name}: GP={games} G={goals} A={assists} P={points}")
+                        events.debug('stats_player', team=team_name, name=player_name, games=games, goals=goals,
+                                     assists=assists, points=points)
 
                 except Exception as e:
-                    print(f"     ❌ Error processing stats player {current_player}: {e}")
+                    events.warning('stats_player_error', team=team_name, index=current_player, error=error_summary(e))
                     continue
 
             print(f"✅ Stats scrape completed: {len(stats)} players")
             return stats
 
         except Exception as e:
-            print(f"❌ Stats scrape failed: {e}")
+            events.error('stats_failed', f"Stats scrape failed for {team_name}: {error_summary(e)}", team=team_name, error=error_summary(e))
             return []
 
     def is_valid_player_name(self, text):
@@ -895,14 +1894,15 @@ class EliteProspectsScraper:
         except:
             return ""
 
+    @metrics.timed('combine_roster_and_stats')
     def combine_roster_and_stats(self, roster, stats, team_info=None):
-        """Combine roster and stats data with enhanced name matching"""
+        """Combine roster and stats data with enhanced name matching into PlayerRecords"""
         combined = []
         
         season = team_info.get('season', '2025-2026') if team_info else '2025-2026'
         league = team_info.get('league', 'UNKNOWN') if team_info else 'UNKNOWN'
 
-        print(f"🔗 Combining {len(roster)} roster players with {len(stats)} stats players")
+        team_name = team_info.get('name', 'Unknown Team') if team_info else 'Unknown Team'
         
         stats_matched = set()
 
@@ -916,73 +1916,49 @@ class EliteProspectsScraper:
                     break
 
             # Combine data
-            player_data = roster_player.copy()
-            player_data['season'] = season
-            player_data['league'] = league
+            overrides = {'season': season, 'league': league}
             
             if stats_player:
-                games = stats_player.get('games', 0)
-                points = stats_player.get('points', 0)
-                ppg = round(points / games, 2) if games > 0 else 0.0
-                
-                player_data.update({
-                    'games': games,
+                overrides.update({
+                    'games': stats_player.get('games', 0),
                     'goals': stats_player.get('goals', 0),
                     'assists': stats_player.get('assists', 0),
-                    'points': points,
-                    'pim': stats_player.get('pim', 0),
-                    'ppg': ppg
+                    'points': stats_player.get('points', 0),
+                    'pim': stats_player.get('pim', 0)
                 })
                 
                 # Handle position priority: stats position takes precedence if available
                 stats_position = stats_player.get('position', '')
                 if stats_position:
-                    player_data['position'] = stats_position
-                    
-            else:
-                # Default stats if not found
-                player_data.update({
-                    'games': 0,
-                    'goals': 0,
-                    'assists': 0,
-                    'points': 0,
-                    'pim': 0,
-                    'ppg': 0.0
-                })
-
-            combined.append(player_data)
+                    overrides['position'] = stats_position
+            
+            try:
+                combined.append(PlayerRecord.from_dict(roster_player, **overrides))
+            except ValueError as e:
+                events.warning('schema_rejected', team=team_name, source='roster', error=str(e))
 
         # Add any unmatched stats-only players
         for j, stats_player in enumerate(stats):
             if j not in stats_matched:
-                clean_name = self.clean_name_for_matching(stats_player['name'])
-                
-                games = stats_player.get('games', 0)
-                points = stats_player.get('points', 0)
-                ppg = round(points / games, 2) if games > 0 else 0.0
-                
-                player_data = {
-                    'name': clean_name,
-                    'number': "",
-                    'position': stats_player.get('position', ''),
-                    'shoots': '',
-                    'age': 0,
-                    'birthYear': 0,
-                    'height': "",
-                    'weight': "",
-                    'hometown': "",
-                    'season': season,
-                    'league': league,
-                    'games': games,
-                    'goals': stats_player.get('goals', 0),
-                    'assists': stats_player.get('assists', 0),
-                    'points': points,
-                    'pim': stats_player.get('pim', 0),
-                    'ppg': ppg
-                }
-                combined.append(player_data)
-
-        print(f"🔗 Final result: {len(combined)} combined players")
+                try:
+                    record = PlayerRecord(
+                        name=self.clean_name_for_matching(stats_player['name']),
+                        position=stats_player.get('position', ''),
+                        season=season,
+                        league=league,
+                        games=stats_player.get('games', 0),
+                        goals=stats_player.get('goals', 0),
+                        assists=stats_player.get('assists', 0),
+                        points=stats_player.get('points', 0),
+                        pim=stats_player.get('pim', 0)
+                    )
+                    combined.append(record)
+                except ValueError as e:
+                    events.warning('schema_rejected', team=team_name, source='stats', error=str(e))
+
+        print(f"🔗 Combined {len(roster)} roster + {len(stats)} stats players into {len(combined)}")
+        events.info('team_combined', team=team_name, roster=len(roster), stats=len(stats),
+                    matched=len(stats_matched), combined=len(combined))
         return combined
 
     def scrape_team_complete(self, team_url, team_info=None):
@@ -995,6 +1971,8 @@ class EliteProspectsScraper:
         
         start_time = time.time()
         team_name = team_info.get('name', 'Unknown Team') if team_info else 'Unknown Team'
+        self.phase_times = {}
+        round_trips_start = self.round_trips
         
         print(f"\n🏒 Starting complete scrape for: {team_name}")
         
@@ -1006,56 +1984,72 @@ class EliteProspectsScraper:
             )
             
             # Scrape roster
-            roster = self.scrape_team_roster(team_url, team_info)
+            roster = self.timed_parse('roster_parse', lambda: self.scrape_team_roster(team_url, team_info))
             
             if self.should_stop:
                 self.report_progress("🛑 Stopped")
                 return []
                 
             # Scrape stats
-            stats = self.scrape_team_stats(team_url, team_info)
+            stats = self.timed_parse('stats_parse', lambda: self.scrape_team_stats(team_url, team_info))
             
             if self.should_stop:
                 self.report_progress("🛑 Stopped")
                 return []
                 
             # Combine data
-            combined_players = self.combine_roster_and_stats(roster, stats, team_info)
+            combined_players = self.timed_parse('combine', lambda: self.combine_roster_and_stats(roster, stats, team_info))
             total_time = time.time() - start_time
+            if team_info and combined_players:
+                self.timings.record(team_info.get('id'), team_info.get('league'), team_name, self.phase_times)
+            metrics.observe('scraper_team_round_trips', self.round_trips - round_trips_start)
+            metrics.inc('scraper_teams_total', outcome='ok' if combined_players else 'empty')
             
             # CRITICAL FIX: Immediately add completed team to live_teams
-            completed_team = {
-                'id': team_info.get('id', ''),
-                'name': team_name,
-                'league': team_info.get('league', 'UNKNOWN'),
-                'season': team_info.get('season', '2025-2026'),
-                'url': team_url,
-                'players': combined_players
-            }
+            completed_team = TeamRecord(
+                team_info.get('id', ''),
+                team_name,
+                team_info.get('league', 'UNKNOWN'),
+                team_info.get('season', '2025-2026'),
+                team_url,
+                combined_players
+            )
             
             # Add to live teams list for real-time updates
             self.live_teams.append(completed_team)
             
             print(f"✅ COMPLETED {team_name}: {len(combined_players)} players in {total_time:.1f}s")
-            print(f"📊 Live teams count: {len(self.live_teams)}")
+            events.info('team_scraped', team=team_name, team_id=team_info.get('id'), league=team_info.get('league'),
+                        players=len(combined_players), seconds=round(total_time, 2),
+                        round_trips=self.round_trips - round_trips_start,
+                        phases={phase: round(seconds, 2) for phase, seconds in self.phase_times.items()})
             
             # Send completion update with the completed team
             self.report_progress(
                 f"✅ Completed {team_name} - {len(combined_players)} players",
-                team_data=completed_team
+                team_data=completed_team,
+                new_team=completed_team
             )
             
             return combined_players
             
         except Exception as e:
             error_time = time.time() - start_time
-            print(f"❌ ERROR scraping {team_name} after {error_time:.1f}s: {e}")
+            metrics.inc('scraper_teams_total', outcome='error')
+            events.error('team_failed', f"ERROR scraping {team_name} after {error_time:.1f}s: {error_summary(e)}",
+                         team=team_name, url=team_url, seconds=round(error_time, 2), error=error_summary(e))
             self.report_progress(f"❌ Error with {team_name}: {str(e)}")
             return []
 
-    def scrape_multiple_teams(self, team_urls, season="2025-2026"):
-        """FIXED: Scrape multiple teams with proper real-time progress tracking"""
+    def scrape_multiple_teams(self, team_urls, season="2025-2026", deadline=None, estimate=None):
+        """FIXED: Scrape multiple teams with proper real-time progress tracking
+
+        Budgeted mode: with a deadline (epoch seconds), teams whose estimated scrape time
+        (estimate(team_info) -> seconds) would overrun it are skipped and collected in
+        self.skipped_teams, so callers can order teams by value and carry the rest over.
+        """
         all_teams = []
+        self.skipped_teams = []
         
         # DON'T reset live_teams here - we want to accumulate across leagues
         # self.live_teams will persist across multiple league scrapes
@@ -1075,18 +2069,28 @@ class EliteProspectsScraper:
 
         self.report_progress(f"Starting scrape of {self.total_teams} teams", 0, self.total_teams)
 
-        # Calculate estimated time
-        estimated_seconds = self.total_teams * (self.delay * 3 + 10)
-        estimated_minutes = estimated_seconds / 60
+        # Estimated time from each team's timing history
+        team_estimates = [self.timings.estimate(team_info.get('id'), team_info.get('league')) for team_info in team_urls]
+        estimated_minutes = sum(team_estimates) / 60
         self.report_progress(f"Estimated time: {estimated_minutes:.1f} minutes")
 
         start_time = time.time()
+        predicted_done = 0.0  # Estimated seconds of the teams finished so far (for calibrating the ETA)
+        phase_totals = {}
 
         for i, team_info in enumerate(team_urls):
             if self.should_stop:
                 self.report_progress("Scraping stopped by user", i, self.total_teams)
                 break
 
+            if deadline is not None:
+                expected = estimate(team_info) if estimate else 0
+                if time.time() + expected > deadline:
+                    self.skipped_teams.append(team_info)
+                    events.info('team_over_budget', team=team_info.get('name', 'Unknown'), league=team_info.get('league'),
+                                expected_seconds=round(expected, 1))
+                    continue
+
             try:
                 current_num = i + 1
                 team_name = team_info.get('name', f'Team {current_num}')
@@ -1094,27 +2098,30 @@ class EliteProspectsScraper:
                 print(f"\n📍 Team {current_num}/{self.total_teams}: {team_name}")
                 self.report_progress(f"Scraping {team_name}", current_num, self.total_teams)
 
-                # Add season to team_info
-                team_info_with_season = team_info.copy()
-                team_info_with_season['season'] = season
+                # Add season to team_info (our own dict from get_league_teams - no copy needed)
+                team_info['season'] = season
 
                 # Scrape team data - this will add to live_teams automatically
                 start_team_time = time.time()
-                players = self.scrape_team_complete(team_info['url'], team_info_with_season)
+                with tracer.span(team_name, 'team', league=team_info.get('league'), url=team_info['url']):
+                    players = self.scrape_team_complete(team_info['url'], team_info)
                 team_scrape_time = time.time() - start_team_time
 
-                # Create final team data structure
-                team_data = {
-                    'id': team_info['id'],
-                    'name': team_info['name'],
-                    'league': team_info['league'],
-                    'season': season,
-                    'url': team_info['url'],
-                    'players': players
-                }
+                # Create final team data structure (shares the players list with live_teams)
+                team_data = TeamRecord(
+                    team_info['id'],
+                    team_info['name'],
+                    team_info['league'],
+                    season,
+                    team_info['url'],
+                    players
+                )
 
                 all_teams.append(team_data)
                 self.scraped_count += 1
+                predicted_done += team_estimates[i]
+                for phase, seconds in self.phase_times.items():
+                    phase_totals[phase] = phase_totals.get(phase, 0.0) + seconds
 
                 print(f"✅ Team {current_num} completed: {len(players)} players in {team_scrape_time:.1f}s")
                 
@@ -1124,30 +2131,23 @@ class EliteProspectsScraper:
                     current_num, self.total_teams
                 )
 
-                # Respectful delay between teams
-                if current_num < self.total_teams and not self.should_stop:
-                    print(f"⏳ Waiting {self.delay} seconds before next team...")
-                    time.sleep(self.delay)
-
-                    # Longer break every batch_size teams
-                    if current_num % self.batch_size == 0:
-                        batch_break = self.delay * 3
-                        print(f"⏳ Batch break: waiting {batch_break} seconds...")
-                        self.report_progress(f"Batch break - pausing {batch_break} seconds...")
-                        time.sleep(batch_break)
+                # Pacing between pages is the rate controller's job (see load_page)
+                if current_num % self.batch_size == 0:
+                    print(f"🚦 Pace: {self.rate.summary()}")
 
                 # Progress updates - every few teams
                 if current_num % 3 == 0 or current_num == self.total_teams:
+                    # Remaining teams' estimates, scaled by how this run compares to history so far
                     elapsed = time.time() - start_time
-                    avg_time_per_team = elapsed / current_num
-                    remaining_teams = self.total_teams - current_num
-                    eta_seconds = remaining_teams * avg_time_per_team
+                    pace = elapsed / predicted_done if predicted_done else 1.0
+                    eta_seconds = sum(team_estimates[current_num:]) * pace
                     eta_minutes = eta_seconds / 60
 
                     self.report_progress(f"Progress: {current_num}/{self.total_teams} teams (ETA: {eta_minutes:.0f}m)")
 
             except Exception as e:
-                print(f"❌ TEAM SCRAPE FAILED for {team_info.get('name', f'Team {current_num}')}: {e}")
+                events.error('team_failed', f"TEAM SCRAPE FAILED for {team_info.get('name', f'Team {current_num}')}: {error_summary(e)}",
+                             team=team_info.get('name'), url=team_info.get('url'), error=error_summary(e))
                 self.report_progress(f"❌ Error with {team_info['name']}: {str(e)}")
                 continue
 
@@ -1158,10 +2158,18 @@ class EliteProspectsScraper:
         print(f"🏁 SCRAPING COMPLETED!")
         print(f"{'='*60}")
         print(f"   📊 Teams scraped: {len(all_teams)}/{self.total_teams}")
-        print(f"   📊 Total players: {sum(len(team.get('players', [])) for team in all_teams)}")
+        if self.skipped_teams:
+            print(f"   ⏭️ Skipped for time: {len(self.skipped_teams)}")
+        print(f"   📊 Total players: {sum(len(team.players) for team in all_teams)}")
         print(f"   ⏱️  Time elapsed: {elapsed_minutes:.1f} minutes")
         print(f"   ⚡ Average: {elapsed_time/len(all_teams) if all_teams else 0:.1f}s per team")
+        print(f"   🚦 Settled rate: {self.rate.summary()}")
+        if phase_totals:
+            print(f"   ⏱️  Where time went:")
+            for line in TimingStore.summary_lines(phase_totals):
+                print(line)
         print(f"{'='*60}\n")
+        self.timings.save()
         print(f"   ⏱️ Total time: {elapsed_minutes:.1f} minutes")
 
         self.report_progress(f"Scraping completed! {len(all_teams)} teams in {elapsed_minutes:.1f} minutes",
@@ -1179,9 +2187,10 @@ class EliteProspectsScraper:
         except:
             return 0
 
-    def calculate_birth_year(self, age):
-        """Calculate birth year from age"""
-        current_year = 2025
+    def calculate_birth_year(self, age, season="2025-2026"):
+        """Calculate birth year from age, relative to the season's start year"""
+        season_start = season[:4] if season else ''
+        current_year = int(season_start) if season_start.isdigit() else datetime.now().year
         return current_year - age if age > 0 else 0
 
     def parse_int(self, text):
@@ -1220,18 +2229,814 @@ class EliteProspectsScraper:
         
         return clean_name
 
+    def is_responsive(self):
+        """Whether the browser still answers - a crashed chromedriver fails every later page"""
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+
     def close(self):
         """Close the webdriver"""
         if hasattr(self, 'driver'):
-            self.driver.quit()
+            try:
+                self.driver.quit()
+            except Exception as e:
+                logger.warning(f"Closing the browser failed: {e}")
+
+
+class ProgressLog:
+    """Append-only progress model: every event and completed team gets a monotonically increasing sequence number"""
+
+    def __init__(self, max_events=500):
+        self.condition = threading.Condition(threading.RLock())
+        self.max_events = max_events
+        self.reset()
+
+    def reset(self):
+        """Start a new scraping session - clients holding an old epoch resync from zero"""
+        with self.condition:
+            self.epoch = str(time.time_ns())
+            self.seq = 0
+            self.events = deque(maxlen=self.max_events)  # (seq, event)
+            self.team_seqs = []
+            self.teams = []
+            self.condition.notify_all()
+
+    def publish(self, progress_info, new_team=None):
+        """Record one progress event (and optionally a completed team); returns its sequence number"""
+        with self.condition:
+            self.seq += 1
+            event = {
+                'seq': self.seq,
+                'message': progress_info.get('message', ''),
+                'current': progress_info.get('current', 0),
+                'total': progress_info.get('total', 0),
+                'percentage': progress_info.get('percentage', 0)
+            }
+            # Scheduler jobs tag their events so clients can tell concurrent leagues apart
+            for key in ['job_id', 'league']:
+                if key in progress_info:
+                    event[key] = progress_info[key]
+            self.events.append((self.seq, event))
+            if new_team is not None:
+                self.team_seqs.append(self.seq)
+                self.teams.append(new_team)
+            self.condition.notify_all()
+            return self.seq
+
+    def since(self, cursor=0, epoch=None):
+        """Teams and events added after a client cursor (a stale epoch restarts from zero)"""
+        with self.condition:  # Re-entrant for wait_since (Condition wraps an RLock)
+            reset = epoch is not None and epoch != self.epoch
+            if reset or cursor > self.seq:
+                cursor = 0
+                reset = epoch is not None
+            first_team = bisect.bisect_right(self.team_seqs, cursor)
+            return {
+                'epoch': self.epoch,
+                'cursor': self.seq,
+                'reset': reset,
+                'teams': self.teams[first_team:],
+                'events': [event for seq, event in self.events if seq > cursor]
+            }
+
+    def wait_since(self, cursor=0, epoch=None, timeout=15):
+        """Block until something newer than the cursor exists (or the epoch changes); None on timeout"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.seq > cursor or (epoch is not None and epoch != self.epoch), timeout)
+            if self.seq <= cursor and (epoch is None or epoch == self.epoch):
+                return None
+            return self.since(cursor, epoch)
+
+    def all_teams(self):
+        """Zero-copy view of every completed team in this session"""
+        with self.condition:
+            return LiveTeamsView(self.teams)
+
+
+def position_group(position):
+    """Collapse a position string to 'F' or 'D' ('' when unknown)"""
+    position = (position or '').upper().strip()
+    if not position:
+        return ''
+    return 'D' if position.startswith(('D', 'LD', 'RD')) else 'F'
+
+
+def normalize_search_text(text):
+    """Case- and accent-insensitive form used by the search index ('Jönsson-O'Neil' -> 'jonsson oneil')"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c)).casefold()
+    text = text.replace("'", '').replace('’', '')
+    return ' '.join(''.join(c if c.isalnum() else ' ' for c in text).split())
+
+
+def trigrams(text):
+    """Character trigrams of each word of normalised text (words padded so starts weigh more)"""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class SearchIndex:
+    """Name and hometown search: sorted token list for prefixes, trigram postings for typos
+
+    Entries are current players (row into DataIndex.players) followed by players only
+    known from earlier snapshots (history index), which have no row.
+    """
+
+    MIN_SIMILARITY = 0.5  # Share of the query's trigrams a fuzzy match must contain
+
+    def __init__(self, players, history_players=None, current_ids=()):
+        self.entries = []  # (player_id, name, team, league, row or None, points)
+        name_keys = []
+        town_keys = []
+        self.grams = {}         # trigram -> [entry]
+        self.entry_grams = []   # entry -> frozenset of its name's trigrams
+        self.word_grams = []    # entry -> trigram set per name word (fuzzy scoring)
+        self.normalized = []    # entry -> normalised name
+
+        def add(player_id, name, team, league, row, points, hometown=''):
+            entry = len(self.entries)
+            self.entries.append((player_id, name, team, league, row, points))
+            normalized = normalize_search_text(name)
+            self.normalized.append(normalized)
+            for token in set(normalized.split()):
+                name_keys.append((token, entry))
+            for token in set(normalize_search_text(hometown).split()):
+                town_keys.append((token, entry))
+            words = tuple(frozenset(trigrams(word)) for word in normalized.split())
+            grams = frozenset().union(*words)
+            self.word_grams.append(words)
+            self.entry_grams.append(grams)
+            for gram in grams:
+                self.grams.setdefault(gram, []).append(entry)
+
+        for row, (player, team) in enumerate(players):
+            add(extract_player_id(player.profile_url), player.name, team.name, player.league,
+                row, player.points, player.hometown_city)
+        for player_id, (name, team, league) in (history_players or {}).items():
+            if player_id not in current_ids:
+                add(player_id, name, team, league, None, -1)
+
+        name_keys.sort()
+        town_keys.sort()
+        self.name_keys = [key for key, _ in name_keys]
+        self.name_entries = [entry for _, entry in name_keys]
+        self.town_keys = [key for key, _ in town_keys]
+        self.town_entries = [entry for _, entry in town_keys]
+
+    @staticmethod
+    def _prefix(keys, entries, prefix):
+        """Entries with a token starting with prefix (binary search into the sorted tokens)"""
+        start = bisect.bisect_left(keys, prefix)
+        end = bisect.bisect_left(keys, prefix + '\uffff', start)
+        return set(entries[start:end])
+
+    def _all_prefixes(self, keys, entries, tokens):
+        """Entries where every query token prefixes one of the entry's tokens"""
+        matches = None
+        for token in sorted(tokens, key=len, reverse=True):  # Longest token is the most selective
+            found = self._prefix(keys, entries, token)
+            matches = found if matches is None else matches & found
+            if not matches:
+                break
+        return matches or set()
+
+    def search(self, query, limit=20, leagues=None):
+        """Ranked [(score, match, entry)] - exact > name prefix > token prefix > fuzzy > hometown"""
+        normalized = normalize_search_text(query)
+        if not normalized:
+            return []
+        tokens = normalized.split()
+        scored = {}
+
+        def keep(entry, score, match):
+            if leagues and self.entries[entry][3] not in leagues:
+                return
+            if entry not in scored or scored[entry][0] < score:
+                scored[entry] = (score, match)
+
+        for entry in self._all_prefixes(self.name_keys, self.name_entries, tokens):
+            name = self.normalized[entry]
+            if name == normalized:
+                keep(entry, 1.0, 'exact')
+            elif name.startswith(normalized):
+                keep(entry, 0.9, 'prefix')
+            else:
+                keep(entry, 0.8, 'token')
+        
+        # Typo tolerance only when the prefix pass neither filled the page nor hit the exact name
+        exact = any(match == 'exact' for _, match in scored.values())
+        if len(scored) < limit and len(normalized) >= 3 and not exact:
+            query_grams = trigrams(normalized)
+            needed = max(1, int(len(query_grams) * self.MIN_SIMILARITY + 0.999))
+            # Prefix filtering: a match shares at least one of the rarest (total - needed + 1) grams
+            rarest = sorted(query_grams, key=lambda gram: len(self.grams.get(gram, ())))
+            candidates = set()
+            for gram in rarest[:len(query_grams) - needed + 1]:
+                candidates.update(self.grams.get(gram, ()))
+            for entry in candidates.difference(scored):
+                shared = len(query_grams & self.entry_grams[entry])
+                if shared >= needed:
+                    # Dice against the words that matched, so 'smiht' prefers Smith to Smithknecht
+                    matched = sum(len(word) for word in self.word_grams[entry] if not query_grams.isdisjoint(word))
+                    keep(entry, round(0.7 * 2 * shared / (len(query_grams) + matched), 3), 'fuzzy')
+        
+        for entry in self._all_prefixes(self.town_keys, self.town_entries, tokens):
+            keep(entry, 0.2, 'hometown')
+
+        ranked = sorted(scored.items(), key=lambda item: (-item[1][0], -self.entries[item[0]][5], self.entries[item[0]][1]))
+        return [(score, match, entry) for entry, (score, match) in ranked[:limit]]
+
+
+class DataIndex:
+    """Query-ready snapshot of the scraped data - built off to the side, then swapped in whole"""
+
+    SORT_FIELDS = {
+        'name': lambda p, t: p.name.lower(),
+        'team': lambda p, t: t.name.lower(),
+        'league': lambda p, t: p.league,
+        'position': lambda p, t: p.position,
+        'age': lambda p, t: p.age,
+        'birthYear': lambda p, t: p.birth_year,
+        'height': lambda p, t: p.height_in,
+        'weight': lambda p, t: p.weight_lbs,
+        'games': lambda p, t: p.games,
+        'goals': lambda p, t: p.goals,
+        'assists': lambda p, t: p.assists,
+        'points': lambda p, t: p.points,
+        'ppg': lambda p, t: p.ppg,
+        'pim': lambda p, t: p.pim
+    }
+
+    def __init__(self, data_by_league, generation=0, history_players=None):
+        self.generation = generation
+        self.data_by_league = data_by_league  # Never mutated after the index is built
+        self.history_players = history_players or {}  # player id -> (name, team, league) from older snapshots
+        self.teams_by_id = {}     # team id -> TeamRecord
+        self.players_by_id = {}   # EliteProspects player id -> row
+        self.league_teams = {}    # league name and lower-case name -> [TeamRecord]
+        self.players = []     # [(PlayerRecord, TeamRecord)] - row number is the player's position
+        self.by_league = {}   # league -> [row]
+        self.by_team = {}     # team id / lower-case team name -> [row]
+        self.by_position = {} # position and position group -> [row]
+        self.ranks = {}       # sort field -> rank per row (lazily built, unique so keyset cursors work)
+        self._rank_lock = threading.Lock()
+
+        for league_name, teams in data_by_league.items():
+            self.league_teams[league_name] = teams
+            self.league_teams.setdefault(league_name.lower(), teams)
+            for team in teams:
+                self.teams_by_id.setdefault(team.id, team)
+                for player in team.players:
+                    row = len(self.players)
+                    self.players.append((player, team))
+                    player_id = extract_player_id(player.profile_url)
+                    if player_id:
+                        # Traded mid-season: keep the stint with the most games
+                        existing = self.players_by_id.get(player_id)
+                        if existing is None or self.players[existing][0].games < player.games:
+                            self.players_by_id[player_id] = row
+                    self.by_league.setdefault(league_name, []).append(row)
+                    self.by_team.setdefault(team.id, []).append(row)
+                    self.by_team.setdefault(team.name.lower(), []).append(row)
+                    position = player.position.upper().strip()
+                    if position:
+                        self.by_position.setdefault(position, []).append(row)
+                    group = position_group(position)
+                    if group and group != position:
+                        self.by_position.setdefault(group, []).append(row)
+
+        self.search = SearchIndex(self.players, self.history_players, self.players_by_id)
+
+    def rank(self, field):
+        """Rank of every row when sorted ascending by field (ties broken by row number)"""
+        if field not in self.ranks:
+            with self._rank_lock:
+                if field not in self.ranks:
+                    key = self.SORT_FIELDS[field]
+                    order = sorted(range(len(self.players)), key=lambda row: (key(*self.players[row]), row))
+                    ranks = [0] * len(order)
+                    for position, row in enumerate(order):
+                        ranks[row] = position
+                    self.ranks[field] = ranks
+        return self.ranks[field]
+
+    def candidates(self, leagues=None, teams=None, positions=None):
+        """Rows matching the indexed filters (league, team, position)"""
+        postings = []
+        for index, values in [(self.by_league, leagues), (self.by_team, teams), (self.by_position, positions)]:
+            if values:
+                rows = set()
+                for value in values:
+                    rows.update(index.get(value, []))
+                postings.append(rows)
+        if not postings:
+            return list(range(len(self.players)))
+        postings.sort(key=len)
+        rows = postings[0]
+        for other in postings[1:]:
+            rows = rows & other
+        return list(rows)
+
+
+def parse_list_param(name, transform=None):
+    """Comma-separated query parameter as a list ('' entries dropped)"""
+    values = [value.strip() for value in request.args.get(name, '').split(',') if value.strip()]
+    return [transform(value) for value in values] if transform else values
+
+
+def player_row(player, team, fields=None):
+    """Serialise one player for the query API, optionally projected to a set of fields"""
+    row = player.to_dict()
+    row['team'] = team.name
+    row['team_id'] = team.id
+    if fields:
+        return {field: row[field] for field in fields if field in row}
+    return row
+
+
+class CachedBody:
+    """One serialised response body plus its pre-compressed variants"""
+    __slots__ = ('etag', 'mimetype', 'bodies')
+
+    MIN_COMPRESS_BYTES = 512
+
+    def __init__(self, body, mimetype, generation):
+        self.etag = f"g{generation}-{hashlib.blake2b(body, digest_size=8).hexdigest()}"
+        self.mimetype = mimetype
+        self.bodies = {'identity': body}
+        if len(body) >= self.MIN_COMPRESS_BYTES:
+            self.bodies['gzip'] = gzip.compress(body, compresslevel=6)
+            if brotli is not None:
+                self.bodies['br'] = brotli.compress(body, quality=5)
+
+    def respond(self):
+        """Build the response for the current request (304, or the best accepted encoding)"""
+        if request.if_none_match.contains(self.etag):
+            response = Response(status=304)
+        else:
+            encoding = 'identity'
+            for candidate in ['br', 'gzip']:
+                if candidate in self.bodies and candidate in request.accept_encodings:
+                    encoding = candidate
+                    break
+            response = Response(self.bodies[encoding], mimetype=self.mimetype)
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(self.etag)
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = 'no-cache'  # Always revalidate; 304s are nearly free
+        return response
+
+
+class ResponseCache:
+    """LRU of serialised responses keyed by (path, query string, data generation)"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+def cached_response(view):
+    """Serve a data endpoint from the response cache; entries die with the data generation"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        generation = data_index.generation
+        key = (request.path, request.query_string, generation)
+        entry = response_cache.get(key)
+        if entry is None:
+            response = app.make_response(view(*args, **kwargs))
+            # The view may itself publish data (ensure_league_loaded) - its body then belongs to no single generation
+            if response.status_code != 200 or data_index.generation != generation:
+                return response
+            entry = CachedBody(response.get_data(), response.mimetype, generation)
+            response_cache.put(key, entry)
+        return entry.respond()
+    return wrapper
+
+
+def is_snapshot_file(name):
+    """True for dated snapshot files (YYYY-MM-DD.json) - data/ also holds index, latest and state files"""
+    try:
+        datetime.strptime(name, '%Y-%m-%d.json')
+    except ValueError:
+        return False
+    return len(name) == len('YYYY-MM-DD.json')
+
+
+class SnapshotFile:
+    """Memory-mapped JSON snapshot with a byte-range table of its top-level leagues
+
+    Snapshots are written with json.dump(..., indent=2), so every top-level key
+    starts a line with exactly two spaces of indent. Finding those lines is a
+    byte search over the mapping; one league can then be parsed on its own
+    without touching the rest of the file. Other layouts fall back to a full parse.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        stat = os.stat(path)
+        self.mtime = stat.st_mtime_ns
+        self.size = stat.st_size
+        self.mm = None
+        self.parsed = None
+        with open(path, 'rb') as f:
+            if self.size > 0:
+                self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.offsets = self._scan_leagues() if self.mm is not None else {}
+        if self.offsets is None:
+            self.parsed = json_loads(self.mm[:]) if self.mm is not None else {}
+
+    def _scan_leagues(self):
+        """{league: (start, end)} byte ranges of each top-level value - SIMPLE BYTE SEARCH"""
+        mm = self.mm
+        if mm[:2] != b'{\n':
+            return None
+        keys = []
+        pos = mm.find(b'\n  "')
+        while pos != -1:
+            key_start = pos + 3
+            key_end = key_start + 1
+            while True:
+                key_end = mm.find(b'"', key_end)
+                if key_end == -1:
+                    return None
+                backslashes = 0
+                while mm[key_end - 1 - backslashes] == 0x5C:
+                    backslashes += 1
+                if backslashes % 2 == 0:
+                    break
+                key_end += 1
+            if mm[key_end + 1:key_end + 3] != b': ':
+                return None
+            keys.append((json.loads(mm[key_start:key_end + 1]), key_end + 3, pos))
+            pos = mm.find(b'\n  "', key_end)
+        
+        file_end = mm.rfind(b'\n}')
+        offsets = {}
+        for i, (name, value_start, line_start) in enumerate(keys):
+            value_end = keys[i + 1][2] if i + 1 < len(keys) else file_end
+            # Drop the separating comma before the next key
+            while value_end > value_start and mm[value_end - 1] in b' ,\r\n':
+                value_end -= 1
+            offsets[name] = (value_start, value_end)
+        return offsets
+
+    def is_current(self):
+        """False once the file on disk was replaced (same-day re-run, budgeted run or shard merge)"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        return stat.st_mtime_ns == self.mtime and stat.st_size == self.size
+
+    def leagues(self):
+        return list(self.parsed.keys()) if self.parsed is not None else list(self.offsets.keys())
+
+    def league_bytes(self, league_name):
+        """Raw JSON of one league's team list, straight from the mapping (no parse)"""
+        if self.parsed is not None:
+            return json.dumps(self.parsed[league_name]).encode('utf-8')
+        start, end = self.offsets[league_name]
+        return self.mm[start:end]
+
+    def load_league(self, league_name):
+        """Parse just one league's team list"""
+        if self.parsed is not None:
+            return self.parsed.get(league_name, [])
+        start, end = self.offsets[league_name]
+        return json_loads(self.mm[start:end])
+
+    def close(self):
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+
+
+class SnapshotCache:
+    """Bounded LRU of memory-mapped historical snapshots (data/<date>.json)"""
+
+    def __init__(self, data_dir, max_snapshots=4):
+        self.data_dir = data_dir
+        self.max_snapshots = max_snapshots
+        self.snapshots = OrderedDict()
+        self.lock = threading.Lock()
+
+    def dates(self):
+        """Snapshot dates listed in data/index.json"""
+        try:
+            with open(os.path.join(self.data_dir, 'index.json')) as f:
+                files = json.load(f).get('files', [])
+        except (OSError, ValueError):
+            return []
+        return [name[:-len('.json')] for name in files if is_snapshot_file(name)]
+
+    def get(self, date):
+        """SnapshotFile for a listed date ('latest' = newest), or None"""
+        dates = self.dates()
+        if date == 'latest':
+            on_disk = [d for d in dates if os.path.exists(os.path.join(self.data_dir, f'{d}.json'))]
+            date = on_disk[-1] if on_disk else ''
+        if date not in dates:
+            return None
+        with self.lock:
+            snapshot = self.snapshots.get(date)
+            if snapshot is not None:
+                if snapshot.is_current():
+                    self.snapshots.move_to_end(date)
+                    return snapshot
+                # Rewritten since it was mapped - readers still holding the old mapping keep the old inode
+                del self.snapshots[date]
+        
+        path = os.path.join(self.data_dir, f'{date}.json')
+        if not os.path.exists(path):
+            return None
+        snapshot = SnapshotFile(path)
+        with self.lock:
+            self.snapshots[date] = snapshot
+            self.snapshots.move_to_end(date)
+            while len(self.snapshots) > self.max_snapshots:
+                # Evicted mappings close once the last in-flight reader drops them
+                self.snapshots.popitem(last=False)
+        return snapshot
+
+
+class ScrapeJob:
+    """One multi-league scrape request with per-league status"""
+
+    def __init__(self, leagues, season, priority, options):
+        self.id = uuid.uuid4().hex[:12]
+        self.priority = priority
+        self.season = season
+        self.options = options
+        self.created = time.time()
+        self.cancelled = False
+        self.lock = threading.Lock()
+        self.scrapers = set()  # Scrapers currently working on this job (for cancellation)
+        self.leagues = {
+            league['name']: {'url': league['url'], 'status': 'queued', 'current': 0, 'total': 0,
+                             'teams': 0, 'players': 0, 'message': '', 'error': None}
+            for league in leagues
+        }
+
+    def update_league(self, league_name, **fields):
+        with self.lock:
+            self.leagues[league_name].update(fields)
+
+    def status(self):
+        """Overall job status derived from its leagues"""
+        states = [league['status'] for league in self.leagues.values()]
+        if self.cancelled and any(state in ['queued', 'running'] for state in states):
+            return 'cancelling' if 'running' in states else 'cancelled'
+        if self.cancelled:
+            return 'cancelled'
+        if 'running' in states:
+            return 'running'
+        if 'queued' in states:
+            return 'queued' if all(state == 'queued' for state in states) else 'running'
+        return 'failed' if all(state == 'failed' for state in states) else 'completed'
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                'id': self.id,
+                'status': self.status(),
+                'priority': self.priority,
+                'season': self.season,
+                'created': self.created,
+                'options': dict(self.options),
+                'leagues': {name: dict(league) for name, league in self.leagues.items()}
+            }
+
+
+class ScrapeScheduler:
+    """Priority queue of league tasks run by a pool of workers, each with its own WebDriver"""
+
+    IDLE_TIMEOUT = 300  # Close a worker's browser after this many idle seconds
+
+    def __init__(self, max_workers=2, max_jobs=100):
+        self.max_workers = max(1, max_workers)
+        self.max_jobs = max_jobs
+        self.tasks = queue.PriorityQueue()  # (-priority, seq, job_id, league_name)
+        self.sequence = itertools.count()
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+        self.workers = []
+        self.rate = None  # One pace for all workers and the legacy /api/scrape - they all hit the same site
+        self.rate_holders = {}  # min_delay of scrapes outside the job queue, kept in force while they run
+        self.timings = TimingStore(TIMINGS_FILE)
+
+    def submit(self, leagues, season='2025-2026', priority=0, **options):
+        """Queue a multi-league job; higher priority runs first, FIFO within a priority"""
+        job = ScrapeJob(leagues, season, priority, options)
+        with self.lock:
+            self.jobs[job.id] = job
+            # Forget the oldest finished jobs
+            for old_id in list(self.jobs):
+                if len(self.jobs) <= self.max_jobs:
+                    break
+                if self.jobs[old_id].status() in ['completed', 'failed', 'cancelled']:
+                    del self.jobs[old_id]
+            self._ensure_workers()
+        for league_name in job.leagues:
+            self.tasks.put((-priority, next(self.sequence), job.id, league_name))
+        print(f"🗂️ Job {job.id} queued: {len(job.leagues)} leagues (priority {priority})")
+        return job
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def list(self):
+        with self.lock:
+            return list(self.jobs.values())
+
+    def cancel(self, job_id):
+        """Cancel queued leagues and signal running ones to stop"""
+        job = self.get(job_id)
+        if job is None:
+            return None
+        with job.lock:
+            job.cancelled = True
+            scrapers = list(job.scrapers)
+            for league in job.leagues.values():
+                if league['status'] == 'queued':
+                    league['status'] = 'cancelled'
+        for scraper in scrapers:
+            scraper.stop_scraping()
+        print(f"🛑 Job {job_id} cancelled")
+        return job
+
+    def _ensure_workers(self):
+        self.workers = [worker for worker in self.workers if worker.is_alive()]
+        while len(self.workers) < self.max_workers:
+            worker = threading.Thread(target=self._worker_loop, args=(len(self.workers) + 1,),
+                                      name=f'scrape-worker-{len(self.workers) + 1}', daemon=True)
+            self.workers.append(worker)
+            worker.start()
+
+    def _worker_loop(self, worker_id):
+        scraper = None
+        scraper_headless = None
+        while True:
+            try:
+                _, _, job_id, league_name = self.tasks.get(timeout=self.IDLE_TIMEOUT)
+            except queue.Empty:
+                if scraper is not None:
+                    print(f"🧹 Worker {worker_id}: idle - closing browser")
+                    scraper.close()
+                    scraper = None
+                continue
+            
+            job = self.get(job_id)
+            if job is None or job.cancelled:
+                if job is not None:
+                    job.update_league(league_name, status='cancelled')
+                continue
+            
+            options = job.options
+            self._update_pace(options)
+            try:
+                if scraper is None or scraper_headless != options.get('headless', True):
+                    if scraper is not None:
+                        scraper.close()
+                    scraper = EliteProspectsScraper(
+                        headless=options.get('headless', True),
+                        delay=options.get('delay', 3),
+                        max_teams=options.get('max_teams'),
+                        batch_size=options.get('batch_size', 5),
+                        rate_controller=self.rate,
+                        timing_store=self.timings
+                    )
+                    scraper_headless = options.get('headless', True)
+                scraper.delay = options.get('delay', 3)
+                scraper.max_teams = options.get('max_teams')
+                scraper.batch_size = options.get('batch_size', 5)
+                scraper.should_stop = False
+                scraper.live_teams = []
+            except Exception as e:
+                print(f"❌ Worker {worker_id}: could not start browser: {e}")
+                job.update_league(league_name, status='failed', error=str(e))
+                scraper = None
+                continue
+            
+            if not self._run_league(worker_id, scraper, job, league_name) or not scraper.is_responsive():
+                # A dead chromedriver would fail every later league this worker picks up
+                print(f"♻️ Worker {worker_id}: discarding browser after a failed league")
+                scraper.close()
+                scraper = None
+
+    def shared_rate(self, options, holder):
+        """The shared rate controller for a scrape outside the job queue; release_rate(holder) when done"""
+        with self.lock:
+            self.rate_holders[holder] = options.get('min_delay', MIN_DELAY)
+        self._update_pace(options)
+        return self.rate
+
+    def release_rate(self, holder):
+        with self.lock:
+            self.rate_holders.pop(holder, None)
+
+    def _update_pace(self, options):
+        """Floor the shared pace at the most polite min_delay among unfinished jobs and rate holders
+
+        The first scrape's delay is the starting pace; after that the shared controller
+        keeps the pace it adapted to.
+        """
+        with self.lock:
+            floors = [job.options.get('min_delay', MIN_DELAY) for job in self.jobs.values()
+                      if job.status() not in ['completed', 'failed', 'cancelled']]
+            floors += self.rate_holders.values()
+            if self.rate is None:
+                self.rate = AdaptiveRateController(options.get('delay', 3), max(floors, default=MIN_DELAY))
+            elif floors:
+                self.rate.set_min_interval(max(floors))
+
+    def _run_league(self, worker_id, scraper, job, league_name):
+        """Scrape one league of a job; False if it raised and the browser may be unusable"""
+        league_url = job.leagues[league_name]['url']
+        with job.lock:
+            # Starting the browser can take seconds - a cancel() in that window found no scraper to stop
+            if job.cancelled:
+                job.leagues[league_name]['status'] = 'cancelled'
+                return True
+            job.scrapers.add(scraper)
+            job.leagues[league_name]['status'] = 'running'
+        
+        def job_progress(progress_info):
+            new_team = progress_info.pop('new_team', None)
+            progress_info.update({'job_id': job.id, 'league': league_name})
+            progress_log.publish(progress_info, new_team)
+            fields = {'message': progress_info.get('message', '')}
+            if progress_info.get('total'):
+                fields.update(current=progress_info['current'], total=progress_info['total'])
+            job.update_league(league_name, **fields)
+        
+        scraper.set_progress_callback(job_progress)
+        print(f"🏒 Worker {worker_id}: job {job.id} - {league_name}")
+        try:
+            teams = scraper.get_league_teams(f"{league_url}/{job.season}", job.season)
+            league_teams = scraper.scrape_multiple_teams(teams, job.season) if teams else []
+            
+            if job.cancelled or scraper.should_stop:
+                job.update_league(league_name, status='cancelled')
+            elif not league_teams:
+                job.update_league(league_name, status='failed', error='No teams found')
+            else:
+                publish_scraped_league(league_name, league_teams)
+                job.update_league(
+                    league_name, status='completed', teams=len(league_teams),
+                    players=sum(len(team.players) for team in league_teams)
+                )
+        except Exception as e:
+            print(f"❌ Worker {worker_id}: {league_name} failed: {e}")
+            job.update_league(league_name, status='failed', error=str(e))
+            return False
+        finally:
+            with job.lock:
+                job.scrapers.discard(scraper)
+        return True
 
 
 # Flask API
+class RecordJSONProvider(DefaultJSONProvider):
+    """JSON provider that serialises player/team records only at the response edge"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, (PlayerRecord, TeamRecord)):
+            return o.to_dict()
+        if isinstance(o, LiveTeamsView):
+            return list(o)
+        return DefaultJSONProvider.default(o)
+
+
 app = Flask(__name__)
+app.json = RecordJSONProvider(app)
 CORS(app)
 
 # Multi-league global storage
-scraped_data_by_league = {}  # {'NA3HL': [teams], 'USPHL': [teams]}
+scraped_data_by_league = {}  # {'NA3HL': [TeamRecord], 'USPHL': [TeamRecord]}
 scraping_progress = {
     'active': False,
     'message': 'Ready',
@@ -1244,40 +3049,251 @@ scraping_progress = {
 }
 active_scraper = None
 completed_leagues = []
+progress_log = ProgressLog()
+data_index = DataIndex(scraped_data_by_league)  # Swapped (never mutated) whenever the data changes
+data_lock = threading.Lock()  # Serialises index rebuilds; readers never take it
+state_lock = threading.RLock()  # Guards scraping_progress and active_scraper
+scrape_scheduler = ScrapeScheduler(int(os.environ.get('SCRAPE_WORKERS', 2)))
+response_cache = ResponseCache()
+
+DATA_DIR = 'data'
+HISTORY_DIR = os.path.join(DATA_DIR, 'history')
+LATEST_SNAPSHOT = os.path.join(DATA_DIR, 'latest.json')
+SNAPSHOT_WATCH_INTERVAL = 10  # seconds between latest.json checks
+# Production mode (serve.py): read workers forward scrape control to one runner process,
+# which writes the leagues it scrapes to LIVE_SNAPSHOT for the read workers to pick up
+RUNNER_URL = os.environ.get('SCRAPE_RUNNER_URL', '').rstrip('/')
+LIVE_SNAPSHOT = os.environ.get('LIVE_SNAPSHOT', '')
+RUNNER_ROUTES = ('/api/progress', '/api/stop', '/api/cleanup', '/api/scrape', '/api/jobs', '/api/resume', '/api/metrics', '/api/events')
+HOP_HEADERS = {'connection', 'keep-alive', 'transfer-encoding', 'te', 'upgrade', 'host',
+               'proxy-authorization', 'proxy-authenticate', 'trailer'}
+live_leagues = set()  # Leagues scraped by this process (runner only)
+live_lock = threading.Lock()
+pending_snapshot = None  # SnapshotFile whose leagues are still being loaded at boot
+snapshot_cache = SnapshotCache(DATA_DIR)
+pending_lock = threading.Lock()
+
+
+def publish_league_data(league_name, teams):
+    """Store a league's teams and swap in freshly built indexes
+
+    Copy-on-write: the new league map and its indexes are built off to the side
+    and both globals are rebound together, so readers never see a half-built index.
+    """
+    global data_index, scraped_data_by_league
+    with data_lock:
+        data_by_league = dict(data_index.data_by_league)
+        data_by_league[league_name] = teams
+        new_index = DataIndex(data_by_league, data_index.generation + 1, data_index.history_players)
+        scraped_data_by_league = data_by_league
+        data_index = new_index
+
+
+def publish_dataset(data_by_league):
+    """Swap in several leagues at once (one index rebuild, one generation bump)"""
+    global data_index, scraped_data_by_league
+    with data_lock:
+        merged = dict(data_index.data_by_league)
+        merged.update(data_by_league)
+        new_index = DataIndex(merged, data_index.generation + 1, data_index.history_players)
+        scraped_data_by_league = merged
+        data_index = new_index
+
+
+def publish_scraped_league(league_name, teams):
+    """Publish a freshly scraped league; the production runner also shares it with the read workers"""
+    publish_league_data(league_name, teams)
+    if LIVE_SNAPSHOT and not RUNNER_URL:
+        with live_lock:
+            live_leagues.add(league_name)
+            write_live_snapshot()
+
+
+def write_live_snapshot(path=None):
+    """Write this session's scraped leagues in the snapshot layout SnapshotFile maps (one league per line)"""
+    path = path or LIVE_SNAPSHOT
+    data_by_league = data_index.data_by_league
+    lines = [
+        f"  {json.dumps(name)}: {json.dumps(teams_to_dicts(data_by_league[name]), separators=(',', ':'))}"
+        for name in sorted(live_leagues) if name in data_by_league
+    ]
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path + '.tmp', 'w') as f:
+            f.write('{\n' + ',\n'.join(lines) + '\n}\n')
+        os.replace(path + '.tmp', path)
+    except OSError as e:
+        print(f"⚠️ Could not write live snapshot: {e}")
+
+
+def load_history_players(history_dir=HISTORY_DIR):
+    """Names of every player in the history index, so search also covers earlier snapshots"""
+    history_players = {}
+    try:
+        with open(os.path.join(history_dir, 'index.json')) as f:
+            history_index = json.load(f)
+    except (OSError, ValueError):
+        return history_players
+    if history_index.get('layout') != HISTORY_LAYOUT:
+        return history_players  # Older layout - the next save migrates it
+    buckets = history_index.get('buckets', HISTORY_BUCKETS)
+    for bucket in range(buckets):
+        try:
+            entries = read_player_history(player_history_path(history_dir, bucket, buckets))
+        except OSError:
+            continue
+        for player_id, entry in entries.items():
+            if entry.get('name'):
+                history_players[player_id] = (entry['name'], entry.get('team', ''), entry.get('league', ''))
+    return history_players
+
+
+def publish_history(history_players):
+    """Swap in a new set of history-only players for search"""
+    global data_index
+    with data_lock:
+        data_index = DataIndex(data_index.data_by_league, data_index.generation + 1, history_players)
+
+
+def load_snapshot_league(snapshot, league_name):
+    """Parse one league of a snapshot into TeamRecords"""
+    return [TeamRecord.from_dict(team) for team in snapshot.load_league(league_name)]
+
+
+def ensure_league_loaded(league_name):
+    """Load a league from the boot snapshot right now if the warm start hasn't reached it yet"""
+    with pending_lock:
+        snapshot = pending_snapshot
+        if snapshot is None:
+            return
+        for name in snapshot.leagues():
+            if name.lower() == league_name.lower() and name not in data_index.data_by_league:
+                publish_league_data(name, load_snapshot_league(snapshot, name))
+
+
+def warm_start(path=LATEST_SNAPSHOT):
+    """Load the latest persisted snapshot league by league so the API answers right after boot"""
+    global pending_snapshot
+    if not os.path.exists(path):
+        print(f"ℹ️ No snapshot at {path} - starting empty")
+        return None
+    
+    start_time = time.time()
+    snapshot = SnapshotFile(path)
+    with pending_lock:
+        pending_snapshot = snapshot
+    
+    for league_name in snapshot.leagues():
+        with pending_lock:
+            if league_name not in data_index.data_by_league:
+                publish_league_data(league_name, load_snapshot_league(snapshot, league_name))
+    
+    with pending_lock:
+        pending_snapshot = None
+    snapshot.close()
+    
+    total_players = len(data_index.players)
+    print(f"🔥 Warm start: {len(snapshot.leagues())} leagues, {total_players} players from {path} "
+          f"in {time.time() - start_time:.2f}s ({'orjson' if orjson else 'json'})")
+    return snapshot.mtime
+
+
+def watch_snapshot(path=LATEST_SNAPSHOT, last_mtime=None, interval=SNAPSHOT_WATCH_INTERVAL):
+    """Hot-swap the in-memory dataset whenever the weekly job writes a new snapshot"""
+    while True:
+        time.sleep(interval)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            if mtime == last_mtime:
+                continue
+            snapshot = SnapshotFile(path)
+            data_by_league = {name: load_snapshot_league(snapshot, name) for name in snapshot.leagues()}
+            snapshot.close()
+            publish_dataset(data_by_league)
+            if path == LATEST_SNAPSHOT:
+                publish_history(load_history_players())
+            last_mtime = mtime
+            print(f"🔄 Reloaded {path}: {len(data_by_league)} leagues (generation {data_index.generation})")
+        except FileNotFoundError:
+            continue
+        except Exception as e:
+            # Usually a snapshot caught mid-write - retry on the next tick
+            print(f"⚠️ Snapshot reload failed: {e}")
+
+
+def start_warm_start(path=LATEST_SNAPSHOT, watch=True):
+    """Warm start in the background, then keep watching the snapshot for changes"""
+    def run():
+        last_mtime = None
+        try:
+            last_mtime = warm_start(path)
+            publish_history(load_history_players())
+        except Exception as e:
+            print(f"⚠️ Warm start failed: {e}")
+        if watch:
+            watch_snapshot(path, last_mtime)
+    
+    thread = threading.Thread(target=run, name='snapshot-loader', daemon=True)
+    thread.start()
+    return thread
 
 
 def progress_callback(progress_info):
     """Multi-league progress callback"""
     global scraping_progress, scraped_data_by_league
     
-    scraping_progress.update(progress_info)
-    scraping_progress['active'] = not progress_info.get('completed', False)
+    new_team = progress_info.pop('new_team', None)
+    progress_log.publish(progress_info, new_team)
     
-    # Current team being scraped
-    if 'team_data' in progress_info:
-        scraping_progress['current_team'] = progress_info['team_data']
-    
-    # League-specific progress
-    if 'current_league' in progress_info:
-        league_name = progress_info['current_league']
-        if 'leagues' not in scraping_progress:
-            scraping_progress['leagues'] = {}
-        scraping_progress['leagues'][league_name] = {
-            'current': progress_info.get('current', 0),
-            'total': progress_info.get('total', 0),
-            'percentage': progress_info.get('percentage', 0),
-            'status': progress_info.get('status', 'pending')
-        }
+    with state_lock:
+        scraping_progress.update(progress_info)
+        scraping_progress['active'] = not progress_info.get('completed', False)
+        
+        # Current team being scraped
+        if 'team_data' in progress_info:
+            scraping_progress['current_team'] = progress_info['team_data']
+        
+        # League-specific progress
+        if 'current_league' in progress_info:
+            league_name = progress_info['current_league']
+            if 'leagues' not in scraping_progress:
+                scraping_progress['leagues'] = {}
+            scraping_progress['leagues'][league_name] = {
+                'current': progress_info.get('current', 0),
+                'total': progress_info.get('total', 0),
+                'percentage': progress_info.get('percentage', 0),
+                'status': progress_info.get('status', 'pending')
+            }
+        
+        # Overall progress
+        if scraping_progress.get('total_leagues', 0) > 0:
+            completed = scraping_progress.get('current_league_index', 0)
+            total = scraping_progress['total_leagues']
+            scraping_progress['overall_percentage'] = (completed / total) * 100
     
     # Store league data
     if 'league_data' in progress_info and 'league_name' in progress_info:
-        scraped_data_by_league[progress_info['league_name']] = progress_info['league_data']
+        publish_scraped_league(progress_info['league_name'], progress_info['league_data'])
+
+
+@app.before_request
+def forward_to_runner():
+    """Production mode: scrape control, jobs and progress live in the runner process"""
+    if not RUNNER_URL or not request.path.startswith(RUNNER_ROUTES):
+        return None
+    headers = {key: value for key, value in request.headers.items() if key.lower() not in HOP_HEADERS}
+    try:
+        upstream = requests.request(
+            request.method, RUNNER_URL + request.full_path.rstrip('?'), headers=headers,
+            data=request.get_data(), stream=True, allow_redirects=False, timeout=(5, None)
+        )
+    except requests.RequestException as e:
+        return jsonify({'error': f'Scrape runner unavailable: {e}'}), 502
     
-    # Overall progress
-    if scraping_progress.get('total_leagues', 0) > 0:
-        completed = scraping_progress.get('current_league_index', 0)
-        total = scraping_progress['total_leagues']
-        scraping_progress['overall_percentage'] = (completed / total) * 100
+    response_headers = [(key, value) for key, value in upstream.raw.headers.items() if key.lower() not in HOP_HEADERS]
+    # Stream through untouched (SSE events arrive as they are sent, gzip bodies stay compressed)
+    body = upstream.raw.stream(64 * 1024, decode_content=False)
+    return Response(stream_with_context(body), status=upstream.status_code, headers=response_headers)
 
 
 @app.route('/')
@@ -1288,16 +3304,61 @@ def serve_dashboard():
 
 @app.route('/api/progress', methods=['GET'])
 def get_progress():
-    """FIXED: Get current scraping progress with proper live data"""
-    return jsonify(scraping_progress)
+    """Get current scraping progress; with ?since=<cursor> only teams/events newer than the cursor"""
+    since = request.args.get('since', type=int)
+    with state_lock:
+        status = dict(scraping_progress)
+    if since is None:
+        # Legacy clients: full live team list
+        return jsonify({**status, 'live_teams': progress_log.all_teams()})
+    
+    delta = progress_log.since(since, request.args.get('epoch'))
+    return jsonify({**status, **delta})
+
+
+@app.route('/api/progress/stream', methods=['GET'])
+def stream_progress():
+    """Server-Sent Events stream of progress deltas; reconnects resume from Last-Event-ID (<epoch>:<seq>)"""
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('lastEventId', '')
+    epoch, _, seq = last_event_id.partition(':')
+    cursor = int(seq) if seq.isdigit() else 0
+    epoch = epoch or None
+    
+    def generate():
+        nonlocal cursor, epoch
+        yield 'retry: 3000\n\n'
+        while True:
+            delta = progress_log.wait_since(cursor, epoch, timeout=15)
+            if delta is None:
+                yield ': keep-alive\n\n'
+                continue
+            cursor, epoch = delta['cursor'], delta['epoch']
+            with state_lock:
+                status = dict(scraping_progress)
+            payload = app.json.dumps({**status, **delta})
+            yield f"id: {epoch}:{cursor}\nevent: progress\ndata: {payload}\n\n"
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+def set_scraping_status(**fields):
+    """Update the scraping status and publish it to progress subscribers"""
+    with state_lock:
+        scraping_progress.update(fields)
+        progress_log.publish(scraping_progress)
 
 
 @app.route('/api/stop', methods=['POST'])
 def stop_scraping():
     """Stop active scraping"""
-    global active_scraper
-    if active_scraper:
-        active_scraper.stop_scraping()
+    with state_lock:
+        scraper = active_scraper
+    if scraper:
+        scraper.stop_scraping()
         return jsonify({'status': 'Stop signal sent'})
     return jsonify({'status': 'No active scraping'})
 
@@ -1306,10 +3367,14 @@ def stop_scraping():
 def cleanup_scraper():
     """Cleanup scraper after all leagues are done"""
     global active_scraper
-    if active_scraper:
+    with state_lock:
+        scraper = active_scraper
+        if scraper and scraping_progress.get('active', False):
+            return jsonify({'status': 'Scraping in progress - not cleaned up'}), 409
+        active_scraper = None
+    if scraper:
         try:
-            active_scraper.close()
-            active_scraper = None
+            scraper.close()
             print("🧹 Scraper cleaned up successfully")
             return jsonify({'status': 'Cleanup successful'})
         except Exception as e:
@@ -1323,14 +3388,12 @@ def scrape_teams():
     """Single-league scraping API endpoint (original working version)"""
     global scraped_data_by_league, active_scraper, scraping_progress
 
-    if scraping_progress.get('active', False):
-        return jsonify({'error': 'Scraping already in progress'}), 409
-
     data = request.json
     league_url = data.get('league_url')  # Single URL like original
     league_name = data.get('league_name', 'UNKNOWN')
     season = data.get('season', '2025-2026')
     delay = data.get('delay', 3)
+    min_delay = data.get('min_delay', MIN_DELAY)
     max_teams = data.get('max_teams')
     batch_size = data.get('batch_size', 5)
     headless = data.get('headless', True)
@@ -1339,25 +3402,42 @@ def scrape_teams():
     if not league_url:
         return jsonify({'error': 'League URL required'}), 400
 
+    # Check-and-claim atomically so two requests can't both start a scrape
+    with state_lock:
+        if scraping_progress.get('active', False):
+            return jsonify({'error': 'Scraping already in progress'}), 409
+        scraping_progress['active'] = True
+
     def scrape_in_background():
         global active_scraper, scraped_data_by_league, scraping_progress
         
         try:
-            scraping_progress = {
-                'active': True,
-                'message': f'Starting {league_name}...',
-                'completed': False
-            }
+            with state_lock:
+                scraping_progress = {
+                    'active': True,
+                    'message': f'Starting {league_name}...',
+                    'completed': False
+                }
+                # A new session starts a new progress epoch (clients resync from zero)
+                if is_first_league:
+                    progress_log.reset()
+                progress_log.publish(scraping_progress)
 
             print(f"\n{'='*60}")
             print(f"🏒 Scraping: {league_name}")
             print(f"🔗 URL: {league_url}/{season}")
             print(f"{'='*60}\n")
 
+            # Paced with the scheduler's workers - they all hit the same site
+            rate = scrape_scheduler.shared_rate({'delay': delay, 'min_delay': min_delay}, 'api_scrape')
+
             # Reuse existing scraper if available, otherwise create new one
             if not active_scraper:
                 print("🆕 Creating new scraper instance")
-                active_scraper = EliteProspectsScraper(headless=headless, delay=delay, max_teams=max_teams, batch_size=batch_size)
+                scraper = EliteProspectsScraper(headless=headless, delay=delay, max_teams=max_teams, batch_size=batch_size,
+                                                rate_controller=rate, timing_store=scrape_scheduler.timings)
+                with state_lock:
+                    active_scraper = scraper
             else:
                 print("♻️ Reusing existing scraper instance")
                 # Update scraper parameters for this league
@@ -1377,7 +3457,7 @@ def scrape_teams():
             
             if not teams or len(teams) == 0:
                 print(f"⚠️ No teams found in {league_name}")
-                scraping_progress.update({'active': False, 'completed': True, 'message': f'No teams found in {league_name}'})
+                set_scraping_status(active=False, completed=True, message=f'No teams found in {league_name}')
                 # DON'T close scraper - might be reused
                 return
             
@@ -1387,17 +3467,17 @@ def scrape_teams():
             league_teams = active_scraper.scrape_multiple_teams(teams, season)
             
             # Store results
-            scraped_data_by_league[league_name] = league_teams
+            publish_scraped_league(league_name, league_teams)
             
             # DON'T close scraper here - might be reused by next league
             # active_scraper.close()
             # active_scraper = None
             
-            scraping_progress.update({
-                'active': False, 
-                'completed': True, 
-                'message': f'Complete! {league_name}: {len(league_teams)} teams'
-            })
+            set_scraping_status(
+                active=False,
+                completed=True,
+                message=f'Complete! {league_name}: {len(league_teams)} teams'
+            )
             
             print(f"\n{'='*60}")
             print(f"✅ {league_name} complete: {len(league_teams)} teams")
@@ -1407,11 +3487,15 @@ def scrape_teams():
             print(f"❌ Error: {e}")
             import traceback
             traceback.print_exc()
-            scraping_progress.update({'active': False, 'completed': True, 'message': f'Error: {str(e)}'})
-            # Keep scraper alive even on error
-            # if active_scraper:
-            #     active_scraper.close()
-            #     active_scraper = None
+            set_scraping_status(active=False, completed=True, message=f'Error: {str(e)}')
+            # Keep scraper alive even on error - unless its browser died
+            if active_scraper and not active_scraper.is_responsive():
+                print("♻️ Discarding unresponsive browser")
+                active_scraper.close()
+                with state_lock:
+                    active_scraper = None
+        finally:
+            scrape_scheduler.release_rate('api_scrape')
 
     thread = threading.Thread(target=scrape_in_background)
     thread.daemon = True
@@ -1430,7 +3514,102 @@ def scrape_teams():
     })
 
 
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Queue a multi-league scrape job (runs alongside other jobs on the worker pool)"""
+    data = request.json or {}
+    leagues = data.get('leagues') or []
+    if not isinstance(leagues, list) or not leagues:
+        return jsonify({'error': 'At least one league required'}), 400
+    if not all(isinstance(league, dict) and league.get('name') and league.get('url') for league in leagues):
+        return jsonify({'error': 'Each league needs a name and url'}), 400
+    if len({league['name'] for league in leagues}) != len(leagues):
+        return jsonify({'error': 'Duplicate league names'}), 400
+    
+    try:
+        priority = int(data.get('priority', 0))
+        delay = float(data.get('delay', 3))
+        min_delay = float(data.get('min_delay', MIN_DELAY))
+        batch_size = int(data.get('batch_size', 5))
+        max_teams = int(data['max_teams']) if data.get('max_teams') else None
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Invalid numeric option'}), 400
+    
+    job = scrape_scheduler.submit(
+        [{'name': league['name'], 'url': league['url'].rstrip('/')} for league in leagues],
+        season=data.get('season', '2025-2026'),
+        priority=priority,
+        delay=delay,
+        min_delay=min_delay,
+        max_teams=max_teams,
+        batch_size=batch_size,
+        headless=bool(data.get('headless', True))
+    )
+    return jsonify(job.to_dict()), 202
+
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """All known jobs, newest first"""
+    return jsonify({'jobs': [job.to_dict() for job in reversed(scrape_scheduler.list())]})
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = scrape_scheduler.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a job: queued leagues are dropped, running ones stop after the current team"""
+    job = scrape_scheduler.cancel(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Scraper counters and latency histograms in Prometheus text format"""
+    index = data_index
+    gauges = {
+        'api_data_generation': ('Generation of the in-memory dataset', index.generation),
+        'api_players': ('Players in the in-memory dataset', len(index.players)),
+        'api_response_cache_entries': ('Cached API responses', len(response_cache.entries)),
+    }
+    rate = scrape_scheduler.rate
+    if rate is not None:
+        gauges['scraper_rate_requests_per_minute'] = ('Current scrape pace', round(rate.rate * 60, 2))
+    return Response(metrics.render_prometheus(gauges), mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/api/events', methods=['GET'])
+def get_events():
+    """Recent structured scrape events, newest first
+
+    limit (max 1000), level=<debug|info|warning|error> (that level and above),
+    event=<name>. Totals count every event emitted, including sampled-out ones.
+    """
+    level = request.args.get('level')
+    if level and level not in EventLog.LEVELS:
+        return jsonify({'error': f"Unknown level; use one of {', '.join(EventLog.LEVELS)}"}), 400
+    try:
+        limit = min(max(int(request.args.get('limit', 100)), 1), 1000)
+    except ValueError:
+        return jsonify({'error': 'Invalid limit'}), 400
+    with events.lock:
+        totals = [{'level': key[0], 'event': key[1], 'count': count} for key, count in events.counts.items()]
+    return jsonify({
+        'events': events.recent(limit, level, request.args.get('event')),
+        'totals': totals
+    })
+
+
 @app.route('/api/teams', methods=['GET'])
+@cached_response
 def get_teams():
     """Get scraped teams data - returns league-grouped data"""
     global scraped_data_by_league
@@ -1440,17 +3619,219 @@ def get_teams():
     return jsonify(scraped_data_by_league)
 
 
+@app.route('/api/players', methods=['GET'])
+@cached_response
+def query_players():
+    """Filtered, sorted, projected and cursor-paginated player rows
+
+    Filters: league, team (id or name), position (C/LW/RW/D/... or F/D), shoots,
+    min_/max_height (inches), min_/max_weight (lbs), min_/max_age, birth_year,
+    min_games, min_ppg, q (name substring). sort=<field> or -<field>,
+    fields=<comma list>, limit (max 1000), cursor (from next_cursor).
+    """
+    index = data_index  # One consistent snapshot for the whole request
+    
+    sort = request.args.get('sort', '-points')
+    descending = sort.startswith('-')
+    sort_field = sort.lstrip('-+')
+    if sort_field not in DataIndex.SORT_FIELDS:
+        return jsonify({'error': f'Unknown sort field: {sort_field}'}), 400
+    
+    try:
+        limit = min(max(int(request.args.get('limit', 100)), 1), 1000)
+        numeric = {
+            name: float(request.args[name])
+            for name in ['min_height', 'max_height', 'min_weight', 'max_weight', 'min_age', 'max_age', 'min_games', 'min_ppg']
+            if request.args.get(name)
+        }
+        birth_years = set(parse_list_param('birth_year', int))
+    except ValueError:
+        return jsonify({'error': 'Numeric parameters must be numbers'}), 400
+    
+    after_rank = None
+    cursor = request.args.get('cursor')
+    if cursor:
+        generation, _, rank_text = cursor.partition('.')
+        if generation != str(index.generation) or not rank_text.isdigit():
+            return jsonify({'error': 'Cursor expired - data changed, restart from the first page'}), 410
+        after_rank = int(rank_text)
+    
+    rows = index.candidates(
+        leagues=parse_list_param('league'),
+        teams=parse_list_param('team', str.lower),
+        positions=parse_list_param('position', str.upper)
+    )
+    
+    # Remaining filters are plain comparisons on the typed record fields
+    shoots = request.args.get('shoots', '').upper()
+    name_query = request.args.get('q', '').lower().strip()
+    checks = []
+    if shoots:
+        checks.append(lambda p: p.shoots == shoots)
+    if birth_years:
+        checks.append(lambda p: p.birth_year in birth_years)
+    if name_query:
+        checks.append(lambda p: name_query in p.name.lower())
+    if 'min_height' in numeric:
+        checks.append(lambda p: p.height_in and p.height_in >= numeric['min_height'])
+    if 'max_height' in numeric:
+        checks.append(lambda p: p.height_in and p.height_in <= numeric['max_height'])
+    if 'min_weight' in numeric:
+        checks.append(lambda p: p.weight_lbs and p.weight_lbs >= numeric['min_weight'])
+    if 'max_weight' in numeric:
+        checks.append(lambda p: p.weight_lbs and p.weight_lbs <= numeric['max_weight'])
+    if 'min_age' in numeric:
+        checks.append(lambda p: p.age and p.age >= numeric['min_age'])
+    if 'max_age' in numeric:
+        checks.append(lambda p: p.age and p.age <= numeric['max_age'])
+    if 'min_games' in numeric:
+        checks.append(lambda p: p.games >= numeric['min_games'])
+    if 'min_ppg' in numeric:
+        checks.append(lambda p: p.ppg >= numeric['min_ppg'])
+    if checks:
+        players = index.players
+        rows = [row for row in rows if all(check(players[row][0]) for check in checks)]
+    
+    # Sort by precomputed rank; descending order just flips the rank
+    ranks = index.rank(sort_field)
+    if descending:
+        top = len(ranks) - 1
+        sort_key = lambda row: top - ranks[row]
+    else:
+        sort_key = ranks.__getitem__
+    rows.sort(key=sort_key)
+    
+    start = 0
+    if after_rank is not None:
+        start = bisect.bisect_right(rows, after_rank, key=sort_key)
+    page = rows[start:start + limit]
+    next_cursor = None
+    if start + limit < len(rows):
+        next_cursor = f"{index.generation}.{sort_key(page[-1])}"
+    
+    fields = parse_list_param('fields')
+    return jsonify({
+        'players': [player_row(*index.players[row], fields) for row in page],
+        'count': len(rows),
+        'next_cursor': next_cursor,
+        'generation': index.generation
+    })
+
+
 @app.route('/api/team/<team_id>', methods=['GET'])
+@cached_response
 def get_team(team_id):
     """Get specific team data from any league"""
-    global scraped_data_by_league
+    team = data_index.teams_by_id.get(str(team_id))
+    if team is None:
+        return jsonify({'error': 'Team not found'}), 404
+    return jsonify(team)
+
+
+@app.route('/api/player/<player_id>', methods=['GET'])
+@cached_response
+def get_player(player_id):
+    """Get a player by EliteProspects player ID"""
+    index = data_index
+    row = index.players_by_id.get(player_id)
+    if row is None:
+        return jsonify({'error': 'Player not found'}), 404
+    return jsonify(player_row(*index.players[row]))
+
+
+@app.route('/api/search', methods=['GET'])
+@cached_response
+def search_players():
+    """Ranked player search over names (prefix and typo-tolerant) and hometowns
+
+    q=<text>, limit (max 100), league=<comma list>. Players only found in
+    earlier snapshots are included with source 'history'.
+    """
+    query = request.args.get('q', '').strip()
+    if len(query) < 2:
+        return jsonify({'error': 'Query must be at least 2 characters'}), 400
+    try:
+        limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+    except ValueError:
+        return jsonify({'error': 'Invalid limit'}), 400
+    
+    index = data_index
+    search = index.search
+    results = []
+    for score, match, entry in search.search(query, limit, set(parse_list_param('league'))):
+        player_id, name, team, league, row, _ = search.entries[entry]
+        if row is not None:
+            result = player_row(*index.players[row], ['name', 'position', 'hometown', 'points', 'profile_url', 'team', 'team_id', 'league'])
+            result['source'] = 'current'
+        else:
+            result = {'name': name, 'team': team, 'league': league, 'source': 'history'}
+        results.append({'id': player_id, **result, 'score': score, 'match': match})
+    
+    return jsonify({'query': query, 'count': len(results), 'results': results})
+
+
+@app.route('/api/league/<league_name>', methods=['GET'])
+@cached_response
+def get_league(league_name):
+    """Get all teams of one league (name match is case-insensitive)"""
+    ensure_league_loaded(league_name)
+    index = data_index
+    teams = index.league_teams.get(league_name)
+    if teams is None:
+        teams = index.league_teams.get(league_name.lower())
+    if teams is None:
+        return jsonify({'error': 'League not found'}), 404
+    return jsonify(teams)
+
+
+@app.route('/api/player/<player_id>/history', methods=['GET'])
+def get_player_history(player_id):
+    """Get a player's per-snapshot stat line from the precomputed history index"""
+    if not player_id.isdigit():
+        return jsonify({'error': 'Invalid player ID'}), 400
     
-    for league_name, teams in scraped_data_by_league.items():
-        for team in teams:
-            if str(team.get('id', '')) == str(team_id):
-                return jsonify(team)
+    try:
+        with open(os.path.join(HISTORY_DIR, 'index.json')) as f:
+            history_index = json.load(f)
+        if history_index.get('layout') != HISTORY_LAYOUT:
+            raise ValueError('older history layout')
+        bucket_file = player_history_path(HISTORY_DIR, player_id, history_index.get('buckets', HISTORY_BUCKETS))
+        bucket = read_player_history(bucket_file, player_id)
+    except (OSError, ValueError):
+        return jsonify({'error': 'Player history not available'}), 404
+    
+    if player_id not in bucket:
+        return jsonify({'error': 'Player not found'}), 404
     
-    return jsonify({'error': 'Team not found'}), 404
+    return jsonify({'id': player_id, 'fields': history_index.get('fields', HISTORY_FIELDS), **bucket[player_id]})
+
+
+@app.route('/api/snapshots', methods=['GET'])
+def list_snapshots():
+    """List the snapshot dates available from data/index.json"""
+    return jsonify({'snapshots': snapshot_cache.dates()})
+
+
+@app.route('/api/snapshots/<date>', methods=['GET'])
+def get_snapshot_leagues(date):
+    """Leagues (and team counts) in one snapshot, without parsing any league"""
+    snapshot = snapshot_cache.get(date)
+    if snapshot is None:
+        return jsonify({'error': 'Snapshot not found'}), 404
+    return jsonify({'date': os.path.basename(snapshot.path)[:-len('.json')], 'leagues': snapshot.leagues()})
+
+
+@app.route('/api/snapshots/<date>/<league_name>', methods=['GET'])
+@cached_response
+def get_snapshot_league(date, league_name):
+    """One league of a historical snapshot, served from its byte range in the mapped file"""
+    snapshot = snapshot_cache.get(date)
+    if snapshot is None:
+        return jsonify({'error': 'Snapshot not found'}), 404
+    matches = [name for name in snapshot.leagues() if name.lower() == league_name.lower()]
+    if not matches:
+        return jsonify({'error': 'League not found in snapshot'}), 404
+    return Response(snapshot.league_bytes(matches[0]), mimetype='application/json')
 
 
 @app.route('/api/resume', methods=['POST'])
@@ -1466,6 +3847,7 @@ def resume_scraping():
 
 if __name__ == "__main__":
     port = int(os.environ.get('PORT', 5000))
+    host = os.environ.get('HOST', '0.0.0.0')
     
     print("\n" + "=" * 70)
     print("🏒 Juniors Stats Web Scraper 2025-26")
@@ -1475,6 +3857,10 @@ if __name__ == "__main__":
     print(f"⚡ Speed optimization: Images disabled for faster scraping\n")
     print("=" * 70 + "\n")
 
+    # Serve the last saved snapshot right away and follow new ones
+    if os.environ.get('WARM_START', '1') != '0':
+        start_warm_start(LATEST_SNAPSHOT)
+
     # Start Flask API
     from werkzeug.serving import WSGIRequestHandler
     
@@ -1485,7 +3871,7 @@ if __name__ == "__main__":
     try:
         app.run(
             debug=False, 
-            host='0.0.0.0', 
+            host=host, 
             port=port,
             request_handler=QuietHandler,
             use_reloader=False,
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Offline EliteProspects pages - a WebDriver stand-in backed by lxml, and
+generators for league, roster and stats pages in the site's HTML shape.
+
+The scraper's parsers only use find_elements/find_element, .text and
+get_attribute, so FixtureDriver lets EliteProspectsScraper(driver=...) parse
+recorded or generated pages without Chrome or a network. The benchmark corpus
+(benchmark_parsers.py) and the mock server share the page generators.
+"""
+
+import os
+import gzip
+import json
+import time
+from html import escape
+
+import requests
+from lxml import html as lxml_html
+from selenium.common.exceptions import InvalidSelectorException, NoSuchElementException, TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+
+BASE_URL = 'https://www.eliteprospects.com'
+CORPUS_DIR = os.path.join('benchmarks', 'corpus')
+NOT_FOUND_PAGE = ('<html><head><title>404 - Page not found | Elite Prospects</title></head>'
+                  '<body><main><h1>Page not found</h1></main></body></html>')
+
+# Site class names the parsers' XPaths depend on
+ROW = 'SortTable_trow__T6wLH'
+RIGHT = 'SortTable_right__s2qUT'
+LEFT = 'SortTable_left__VX4mw'
+HIDE_MOBILE = 'SortTable_hideMobile__X1I3z'
+PLAYER = 'Roster_player__e6EbP'
+LINK = 'TextLink_link__RhSiC'
+GOALIES = ['Sam Keeper', 'Alex Netherton']  # Generated rosters carry two goaltenders for the parsers to skip
+
+
+def select(node, by, value):
+    """Elements matching a Selenium locator below node"""
+    if by == By.XPATH:
+        return [match for match in node.xpath(value) if hasattr(match, 'tag')]
+    if by == By.TAG_NAME:
+        return list(node.iterdescendants(value))
+    raise InvalidSelectorException(f"FixtureDriver supports XPath and tag name locators, not {by}")
+
+
+class FixtureElement:
+    """One parsed node with the WebElement surface the parsers use"""
+
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+    @property
+    def text(self):
+        # A browser collapses runs of whitespace in rendered text
+        return ' '.join(self.node.text_content().split())
+
+    def get_attribute(self, name):
+        return self.node.get(name)
+
+    def find_elements(self, by, value):
+        return [FixtureElement(node) for node in select(self.node, by, value)]
+
+    def find_element(self, by, value):
+        nodes = select(self.node, by, value)
+        if not nodes:
+            raise NoSuchElementException(f"No element for {by}={value}")
+        return FixtureElement(nodes[0])
+
+
+class FixtureDriver:
+    """WebDriver stand-in serving pages from a {url: html} mapping
+
+    Each page is parsed once and cached, so parser timings exclude HTML parsing the
+    way they exclude the browser's. Unknown URLs get a 404 page like the site's;
+    latency (seconds) simulates navigation time.
+    """
+
+    def __init__(self, pages, latency=0.0):
+        self.pages = pages
+        self.latency = latency
+        self.documents = {}
+        self.current_url = None
+        self.page_source = ''
+        self.root = None
+        self.page_loads = 0
+
+    def get(self, url):
+        if self.latency:
+            time.sleep(self.latency)
+        self.page_loads += 1
+        page = self.pages.get(url, NOT_FOUND_PAGE)
+        document = self.documents.get(url)
+        if document is None:
+            document = self.documents[url] = parse_page(page, url)
+        self.show(url, page, document)
+
+    def show(self, url, page, document):
+        self.root = FixtureElement(document)
+        self.current_url = url
+        self.page_source = page
+
+    @property
+    def title(self):
+        titles = self.root.node.xpath('//title') if self.root is not None else []
+        return titles[0].text_content().strip() if titles else ''
+
+    def find_elements(self, by, value):
+        return self.root.find_elements(by, value)
+
+    def find_element(self, by, value):
+        return self.root.find_element(by, value)
+
+    def execute_script(self, script, *args):
+        # The only script the scraper runs asks for the document size
+        return len(self.page_source.encode('utf-8'))
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def save_screenshot(self, path):
+        return False
+
+    def quit(self):
+        self.documents.clear()
+
+    def close(self):
+        pass
+
+
+class HttpDriver(FixtureDriver):
+    """FixtureDriver that fetches every page over HTTP - a Chrome-free client for the mock server
+
+    Timeouts and connection failures surface as the WebDriver exceptions Chrome would
+    raise; latencies holds each navigation's seconds.
+    """
+
+    def __init__(self, timeout=30):
+        super().__init__({})
+        self.session = requests.Session()
+        self.timeout = timeout
+        self.latencies = []
+
+    def set_page_load_timeout(self, seconds):
+        self.timeout = seconds
+
+    def get(self, url):
+        self.page_loads += 1
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.Timeout as e:
+            raise TimeoutException(f"Page load timed out: {url} ({e})")
+        except requests.RequestException as e:
+            raise WebDriverException(f"Navigation failed: {url} ({e})")
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+        self.show(response.url, response.text, parse_page(response.text, response.url))
+
+    def quit(self):
+        self.session.close()
+
+
+def parse_page(page, url):
+    document = lxml_html.document_fromstring(page or '<html></html>')
+    document.make_links_absolute(url)  # href attributes read absolute in a browser
+    return document
+
+
+def team_path(team_id, slug, season):
+    return f"/team/{team_id}/{slug}/{season}"
+
+
+def render_page(title, content):
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{escape(title)}</title></head>'
+            f'<body><div class="Layout_content__bjHk4"><main>{content}</main></div></body></html>')
+
+
+def render_league_page(league_name, season, teams, layout=3):
+    """League standings page linking every team
+
+    teams: dicts with id, name and url. The team list sits in the section's third
+    div, or its second with layout=2 (the EHLP-style pages the scraper also handles).
+    """
+    links = ''.join(
+        f'<li><span><a class="{LINK}" href="{escape(team_path(team["id"], team["url"].rstrip("/").split("/")[-2], season))}">'
+        f'{escape(team["name"])}</a></span></li>'
+        for team in teams
+    )
+    filler = '<div><p>Standings</p></div>' * (layout - 1)
+    content = (f'<section><h1>{escape(league_name)} {season}</h1>{filler}<div><ul>{links}</ul></div></section>'
+               f'<section><h2>League leaders</h2><ul><li><span>-</span></li></ul></section>')
+    return render_page(f"{league_name} - {season} | Elite Prospects", content)
+
+
+def render_roster_row(player, captain=''):
+    number = escape(str(player.get('jersey') or player.get('number') or ''))
+    name = f"{player['name']} ({player.get('position', '')}){' ' + captain if captain else ''}"
+    hidden = f'{ROW} {HIDE_MOBILE}'
+    return (
+        f'<tr><td class="{ROW} {RIGHT}">{number}</td>'
+        f'<td class="{ROW} {LEFT}"><div class="{PLAYER}"><a class="{LINK}" href="{escape(player.get("profile_url") or "#")}">'
+        f'{escape(name)}</a></div></td>'
+        f'<td class="{hidden}"><img alt="flag"></td>'
+        f'<td class="{hidden}">{escape(str(player.get("age") or ""))}</td>'
+        f'<td class="{hidden} {LEFT}"><a class="{LINK}" href="#">{escape(player.get("hometown") or "")}</a></td>'
+        f'<td class="{hidden}">{escape(player.get("height") or "")}</td>'
+        f'<td class="{hidden}">{escape(str(player.get("weight") or ""))}</td>'
+        f'<td class="{hidden}">{escape(player.get("shoots") or "")}</td>'
+        f'<td class="{hidden} {LEFT}">{escape(player.get("position") or "")}</td></tr>'
+    )
+
+
+def render_roster_page(team, season):
+    """Team roster page: skaters from team['players'] (captain marks included) plus two goaltenders"""
+    players = team.get('players', [])
+    rows = [render_roster_row(player, 'C' if i == 0 else 'A' if i in (1, 2) else '') for i, player in enumerate(players)]
+    rows += [render_roster_row({'name': name, 'position': 'G', 'jersey': f'#{30 + i}', 'age': 19}) for i, name in enumerate(GOALIES)]
+    content = (f'<section><h1>{escape(team["name"])} {season}</h1><table><thead><tr><th>#</th><th>Player</th></tr></thead>'
+               f'<tbody>{"".join(rows)}</tbody></table></section>')
+    return render_page(f"{team['name']} - {season} Roster | Elite Prospects", content)
+
+
+def render_stats_page(team, season):
+    """Team stats tab: a skater table (GP, G, A, TP, PIM, +/-) followed by a goaltender table"""
+    rows = []
+    for rank, player in enumerate(team.get('players', []), 1):
+        stats = ''.join(f'<td class="{ROW} {RIGHT}">{int(player.get(key) or 0)}</td>'
+                        for key in ('games', 'goals', 'assists', 'points', 'pim'))
+        rows.append(f'<tr><td class="{ROW} {LEFT}">{rank}</td>'
+                    f'<td class="{ROW} {LEFT}"><a class="{LINK}" href="{escape(player.get("profile_url") or "#")}">'
+                    f'{escape(player["name"])} ({escape(player.get("position") or "")})</a></td>'
+                    f'{stats}<td class="{ROW} {RIGHT}">0</td></tr>')
+    goalies = ''.join(f'<tr><td class="{ROW} {LEFT}">{i}</td><td class="{ROW} {LEFT}">{escape(name)}</td>'
+                      f'<td class="{ROW} {RIGHT}">0</td><td class="{ROW} {RIGHT}">.000</td></tr>'
+                      for i, name in enumerate(GOALIES, 1))
+    content = (f'<section><h1>{escape(team["name"])} stats</h1>'
+               f'<table><thead><tr><th>#</th><th>Player</th><th>GP</th><th>G</th><th>A</th><th>TP</th><th>PIM</th><th>+/-</th></tr></thead>'
+               f'<tbody>{"".join(rows)}</tbody></table>'
+               f'<table><thead><tr><th>#</th><th>Goaltender</th><th>GP</th><th>SV%</th></tr></thead><tbody>{goalies}</tbody></table></section>')
+    return render_page(f"{team['name']} - {season} Stats | Elite Prospects", content)
+
+
+def save_corpus(path, corpus):
+    """Write one league's corpus as gzipped JSON (byte-identical for identical content)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'wb') as raw, gzip.GzipFile(filename='', mode='wb', fileobj=raw, mtime=0) as f:
+        f.write(json.dumps(corpus, ensure_ascii=False, sort_keys=True, indent=1).encode('utf-8'))
+
+
+def load_corpus(directory=CORPUS_DIR):
+    """Every league corpus in a directory: dicts with league, league_url, season, source, teams and pages"""
+    corpora = []
+    for name in sorted(os.listdir(directory)) if os.path.isdir(directory) else []:
+        if name.endswith('.json.gz'):
+            with gzip.open(os.path.join(directory, name), 'rt', encoding='utf-8') as f:
+                corpora.append(json.load(f))
+    return corpora
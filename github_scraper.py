@@ -7,6 +7,11 @@ Data is committed to the repo and served via GitHub Pages.
 import os
 import sys
 import json
+import csv
+import time
+import shutil
+import argparse
+import multiprocessing
 from datetime import datetime
 import importlib.util
 
@@ -16,68 +21,100 @@ spec = importlib.util.spec_from_file_location("scraper_module", scraper_file)
 scraper_module = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(scraper_module)
 EliteProspectsScraper = scraper_module.EliteProspectsScraper
+extract_player_id = scraper_module.extract_player_id
+player_history_path = scraper_module.player_history_path
+teams_to_dicts = scraper_module.teams_to_dicts
+TimingStore = scraper_module.TimingStore
+metrics = scraper_module.metrics
+tracer = scraper_module.tracer
+events = scraper_module.events
 
 # Configuration
 DATA_DIR = 'data'
+HISTORY_DIR = os.path.join(DATA_DIR, 'history')
+VIEWS_DIR = os.path.join(DATA_DIR, 'views')
+PARTIALS_DIR = os.path.join(DATA_DIR, 'partials')
+# Per-run diagnostics stay out of the committed data/ tree (CI uploads them as an artifact)
+RUN_LOGS_DIR = 'run-logs'
+METRICS_DIR = os.path.join(RUN_LOGS_DIR, 'metrics')
+LOGS_DIR = os.path.join(RUN_LOGS_DIR, 'logs')
+SCRAPE_STATE_FILE = os.path.join(DATA_DIR, 'scrape_state.json')
+TIMINGS_FILE = scraper_module.TIMINGS_FILE
+EP_BASE_URL = scraper_module.EP_BASE_URL  # EP_BASE_URL=http://127.0.0.1:8000 scrapes mock_eliteprospects.py
 LEAGUES_TO_SCRAPE = [
     {
         'name': 'NA3HL',
-        'url': 'https://www.eliteprospects.com/league/na3hl',
+        'url': f'{EP_BASE_URL}/league/na3hl',
         'max_teams': None
     },
     {
         'name': 'USPHL Premier',
-        'url': 'https://www.eliteprospects.com/league/usphl-premier',
+        'url': f'{EP_BASE_URL}/league/usphl-premier',
         'max_teams': None
     },
     {
         'name': 'USPHL Elite',
-        'url': 'https://www.eliteprospects.com/league/usphl-elite',
+        'url': f'{EP_BASE_URL}/league/usphl-elite',
         'max_teams': None
     },
     {
         'name': 'EHL',
-        'url': 'https://www.eliteprospects.com/league/ehl',
+        'url': f'{EP_BASE_URL}/league/ehl',
         'max_teams': None
     },
     {
         'name': 'EHLP',
-        'url': 'https://www.eliteprospects.com/league/ehlp',
+        'url': f'{EP_BASE_URL}/league/ehlp',
         'max_teams': None
     },
     {
         'name': 'NCDC',
-        'url': 'https://www.eliteprospects.com/league/ncdc',
+        'url': f'{EP_BASE_URL}/league/ncdc',
         'max_teams': None
     },
     {
         'name': 'NAHL',
-        'url': 'https://www.eliteprospects.com/league/nahl',
+        'url': f'{EP_BASE_URL}/league/nahl',
         'max_teams': None
     }
 ]
 
 SEASON = '2025-2026'
 DELAY = 3
+MIN_DELAY = scraper_module.MIN_DELAY  # The adaptive pace speeds up from DELAY while the site is healthy, never past this
+EXPORT_CSV = os.environ.get('EXPORT_CSV', '').lower() in ('1', 'true', 'yes')
+LEADERBOARD_SIZE = 25
+LEADERBOARD_MIN_GAMES = 5
+SAVE_RESERVE_SECONDS = 300  # Budgeted runs stop scraping this long before the budget ends
+NEVER_SCRAPED_DAYS = 3650
 
+def league_slug(league_name):
+    """File-name friendly league name"""
+    return league_name.lower().replace('/', '-').replace(' ', '-')
+
+@metrics.timed('save_data')
 def save_data(scraped_data, timestamp):
     """Save scraped data to JSON files"""
     os.makedirs(DATA_DIR, exist_ok=True)
     
-    # Save with timestamp
+    # Save with timestamp - also written aside and renamed: a same-day re-run replaces a
+    # snapshot the API may have memory-mapped, and truncating it in place would break readers
     dated_file = os.path.join(DATA_DIR, f'{timestamp}.json')
-    with open(dated_file, 'w') as f:
+    with open(dated_file + '.tmp', 'w') as f:
         json.dump(scraped_data, f, indent=2)
+    os.replace(dated_file + '.tmp', dated_file)
     print(f"✅ Saved: {dated_file}")
     
-    # Save as 'latest.json' for dashboard
+    # Save as 'latest.json' for dashboard - written aside and renamed so
+    # a running API server never hot-loads a half-written file
     latest_file = os.path.join(DATA_DIR, 'latest.json')
-    with open(latest_file, 'w') as f:
+    with open(latest_file + '.tmp', 'w') as f:
         json.dump(scraped_data, f, indent=2)
+    os.replace(latest_file + '.tmp', latest_file)
     print(f"✅ Saved: {latest_file}")
     
     # Create index of all data files
-    data_files = sorted([f for f in os.listdir(DATA_DIR) if f.endswith('.json') and f != 'latest.json' and f != 'index.json'])
+    data_files = sorted(f for f in os.listdir(DATA_DIR) if scraper_module.is_snapshot_file(f))
     index = {
         'last_updated': timestamp,
         'total_scrapes': len(data_files),
@@ -89,53 +126,270 @@ def save_data(scraped_data, timestamp):
         json.dump(index, f, indent=2)
     print(f"✅ Updated index: {index_file}")
 
+def load_json(path, default):
+    """Load a JSON file, falling back to a default when it is missing or unreadable"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def history_lines(scraped_data, timestamp):
+    """One history log line per player ID for a snapshot
+
+    A player listed by two teams (mid-season trade) keeps the fuller stat line,
+    with that line's team and league. Teams a budgeted run carried over from an
+    earlier scrape are skipped - their lines went in under the date they were scraped.
+    """
+    rows = {}
+    for league_name, teams in scraped_data.items():
+        for team in teams:
+            if team.get('scraped', timestamp) != timestamp:
+                continue
+            for player in team.get('players') or []:
+                player_id = extract_player_id(player.get('profile_url', ''))
+                if not player_id:
+                    continue
+                row = [
+                    player_id,
+                    timestamp,
+                    player.get('games', 0),
+                    player.get('goals', 0),
+                    player.get('assists', 0),
+                    player.get('points', 0),
+                    player.get('pim', 0),
+                    player.get('name', ''),
+                    team.get('name', ''),
+                    league_name
+                ]
+                if player_id not in rows or row[2] >= rows[player_id][2]:
+                    rows[player_id] = row
+    return rows.values()
+
+def queue_history_lines(logs, rows, bucket_count):
+    """Group history lines by the bucket log they go to"""
+    for row in rows:
+        bucket_file = player_history_path(HISTORY_DIR, row[0], bucket_count)
+        logs.setdefault(bucket_file, []).append(json.dumps(row, separators=(',', ':')))
+
+def migrate_history_buckets(logs, bucket_count):
+    """Convert the older rewrite-in-place JSON buckets ({id: {name, team, league, series}}) to log lines
+
+    Returns the converted files, to delete once the logs are written.
+    """
+    converted = []
+    for name in sorted(os.listdir(HISTORY_DIR)):
+        if not name.endswith('.json') or name == 'index.json':
+            continue
+        bucket_file = os.path.join(HISTORY_DIR, name)
+        bucket = load_json(bucket_file, {})
+        queue_history_lines(logs, (
+            [player_id, *line, entry.get('name', ''), entry.get('team', ''), entry.get('league', '')]
+            for player_id, entry in bucket.items()
+            for line in entry.get('series', [])
+        ), bucket_count)
+        converted.append(bucket_file)
+    print(f"📚 Migrating {len(converted)} history buckets to append-only bucket logs")
+    return converted
+
+@metrics.timed('update_player_history')
+def update_player_history(scraped_data, timestamp):
+    """Append this snapshot to the per-player history index (keyed by EliteProspects player ID)
+
+    Only the new snapshot's lines are written - appended to the bucket logs, never
+    re-reading or rewriting earlier history.
+    """
+    try:
+        os.makedirs(HISTORY_DIR, exist_ok=True)
+        index_file = os.path.join(HISTORY_DIR, 'index.json')
+        history_index = load_json(index_file, None)
+        logs = {}
+        converted = []
+        
+        if history_index is None or history_index.get('layout') != scraper_module.HISTORY_LAYOUT:
+            # First run: seed the logs once from the snapshots already on disk (or from the older buckets)
+            previous_index = history_index
+            history_index = {'fields': scraper_module.HISTORY_FIELDS, 'buckets': scraper_module.HISTORY_BUCKETS,
+                             'layout': scraper_module.HISTORY_LAYOUT, 'dates': []}
+            if previous_index is not None:
+                converted = migrate_history_buckets(logs, history_index['buckets'])
+                history_index['dates'] = [date for date in previous_index.get('dates', []) if date < timestamp]
+            else:
+                snapshot_index = load_json(os.path.join(DATA_DIR, 'index.json'), {})
+                for data_file in snapshot_index.get('files', []):
+                    snapshot_date = data_file[:-len('.json')]
+                    if snapshot_date >= timestamp:
+                        continue
+                    snapshot = load_json(os.path.join(DATA_DIR, data_file), None)
+                    if snapshot:
+                        queue_history_lines(logs, history_lines(snapshot, snapshot_date), history_index['buckets'])
+                        history_index['dates'].append(snapshot_date)
+                        print(f"📚 Seeded history from {data_file}")
+        
+        queue_history_lines(logs, history_lines(scraped_data, timestamp), history_index['buckets'])
+        if timestamp not in history_index['dates']:
+            history_index['dates'].append(timestamp)
+            history_index['dates'].sort()
+        history_index['last_updated'] = timestamp
+        
+        for bucket_file, lines in logs.items():
+            with open(bucket_file, 'a') as f:
+                f.write('\n'.join(lines) + '\n')
+        
+        with open(index_file, 'w') as f:
+            json.dump(history_index, f, indent=2)
+        for bucket_file in converted:
+            os.remove(bucket_file)
+        print(f"✅ Updated player history: {sum(len(lines) for lines in logs.values())} lines appended "
+              f"to {len(logs)} bucket logs in {HISTORY_DIR}")
+        
+    except Exception as e:
+        print(f"❌ Error updating player history: {e}")
+
+VIEW_COLUMNS = ['league', 'team', 'name', 'position', 'birthYear', 'games', 'goals', 'assists', 'points', 'pim', 'profile_url',
+                'scraped']
+LEADER_COLUMNS = ['name', 'team', 'league', 'position', 'birthYear', 'games', 'goals', 'assists', 'points', 'ppg', 'profile_url',
+                  'scraped']
+
+def leaderboard(ranked, keys):
+    """Top LEADERBOARD_SIZE rows of an already-ranked frame for every group of keys"""
+    top = ranked.groupby(keys, sort=True).head(LEADERBOARD_SIZE)
+    return {
+        str(group): frame[LEADER_COLUMNS].to_dict('records')
+        for group, frame in top.groupby(keys, sort=True)
+    }
+
+@metrics.timed('write_materialized_views')
+def write_materialized_views(scraped_data, timestamp):
+    """Compute leaderboards and aggregates in one pandas pass and write them as small JSON views
+
+    Every row and team total carries 'scraped', the date its numbers are from -
+    older than the views' date for teams a budgeted run carried over.
+    """
+    try:
+        import pandas as pd
+        
+        rows = (
+            (league_name, team.get('name', ''), player.get('name', ''), player.get('position', ''),
+             player.get('birthYear', 0), player.get('games', 0), player.get('goals', 0),
+             player.get('assists', 0), player.get('points', 0), player.get('pim', 0),
+             player.get('profile_url', ''), team.get('scraped', timestamp))
+            for league_name, teams in scraped_data.items()
+            for team in teams
+            for player in team.get('players') or []
+        )
+        df = pd.DataFrame.from_records(rows, columns=VIEW_COLUMNS)
+        if df.empty:
+            print("⚠️ No players - skipping materialized views")
+            return
+        
+        for column in ['birthYear', 'games', 'goals', 'assists', 'points', 'pim']:
+            df[column] = pd.to_numeric(df[column], errors='coerce').fillna(0).astype(int)
+        df['profile_url'] = df['profile_url'].fillna('')
+        df['ppg'] = (df['points'] / df['games'].where(df['games'] > 0)).fillna(0.0).round(2)
+        position = df['position'].fillna('').str.upper().str.strip()
+        df['position_group'] = 'F'
+        df.loc[position.str.startswith(('D', 'LD', 'RD')), 'position_group'] = 'D'
+        df.loc[position == '', 'position_group'] = '-'
+        
+        # Rank once; every leaderboard is a grouped head() over the same order
+        ranked = df[df['games'] >= LEADERBOARD_MIN_GAMES].sort_values(
+            ['ppg', 'points', 'games'], ascending=[False, False, True], kind='mergesort'
+        )
+        
+        team_totals = df.groupby(['league', 'team'], sort=True).agg(
+            players=('name', 'size'), games=('games', 'max'), goals=('goals', 'sum'),
+            assists=('assists', 'sum'), points=('points', 'sum'), pim=('pim', 'sum'), scraped=('scraped', 'min')
+        ).reset_index()
+        league_averages = df.groupby('league', sort=True).agg(
+            teams=('team', 'nunique'), players=('name', 'size'), games=('games', 'mean'),
+            goals=('goals', 'mean'), assists=('assists', 'mean'), points=('points', 'mean'),
+            pim=('pim', 'mean')
+        ).round(2)
+        league_averages['ppg'] = ranked.groupby('league')['ppg'].mean().round(3)
+        league_averages = league_averages.fillna(0).reset_index()
+        
+        views = {
+            'leaders_by_league.json': leaderboard(ranked, 'league'),
+            'leaders_by_position.json': leaderboard(ranked[ranked['position_group'] != '-'], 'position_group'),
+            'leaders_by_birth_year.json': leaderboard(ranked[ranked['birthYear'] > 0], 'birthYear'),
+            'team_totals.json': {
+                league: frame.drop(columns='league').to_dict('records')
+                for league, frame in team_totals.groupby('league', sort=True)
+            },
+            'league_averages.json': {row.pop('league'): row for row in league_averages.to_dict('records')}
+        }
+        
+        os.makedirs(VIEWS_DIR, exist_ok=True)
+        for filename, view in views.items():
+            with open(os.path.join(VIEWS_DIR, filename), 'w') as f:
+                json.dump({'generated': timestamp, 'data': view}, f, separators=(',', ':'))
+        
+        views_index = {
+            'generated': timestamp,
+            'leaderboard_size': LEADERBOARD_SIZE,
+            'min_games': LEADERBOARD_MIN_GAMES,
+            'carried_over_teams': sorted({f"{league} / {team}" for league, team, scraped in
+                                          df[['league', 'team', 'scraped']].itertuples(index=False) if scraped != timestamp}),
+            'views': sorted(views.keys())
+        }
+        with open(os.path.join(VIEWS_DIR, 'index.json'), 'w') as f:
+            json.dump(views_index, f, indent=2)
+        print(f"✅ Wrote {len(views)} materialized views to {VIEWS_DIR}")
+        
+    except Exception as e:
+        print(f"❌ Error writing materialized views: {e}")
+
+EXCEL_COLUMNS = [
+    'Name', 'Jersey', 'Position', 'Shoots', 'Age', 'Birth Year', 'Height', 'Weight',
+    'Hometown', 'GP', 'G', 'A', 'P', 'PPG', 'PIM', 'Team', 'League', 'Season', 'Profile URL'
+]
+
+def iter_player_rows(league_name, teams):
+    """Yield one export row per player, straight from the team list"""
+    for team in teams:
+        team_name = team.get('name', '')
+        for player in team.get('players') or []:
+            yield [
+                player.get('name', ''),
+                player.get('jersey', ''),
+                player.get('position', ''),
+                player.get('shoots', ''),
+                player.get('age', ''),
+                player.get('birthYear', ''),
+                player.get('height', ''),
+                player.get('weight', ''),
+                player.get('hometown', ''),
+                player.get('games', 0),
+                player.get('goals', 0),
+                player.get('assists', 0),
+                player.get('points', 0),
+                player.get('ppg', 0.0),
+                player.get('pim', 0),
+                team_name,
+                league_name,
+                player.get('season', SEASON),
+                player.get('profile_url', '')
+            ]
+
 def create_excel(scraped_data, timestamp):
-    """Create Excel file"""
+    """Create Excel file, streaming rows through openpyxl write-only mode"""
     try:
-        import openpyxl
         from openpyxl import Workbook
         
         excel_file = os.path.join(DATA_DIR, f'{timestamp}.xlsx')
-        wb = Workbook()
+        wb = Workbook(write_only=True)
         
         for league_name, teams in scraped_data.items():
             sheet_name = league_name.replace('/', '-')[:31]
             ws = wb.create_sheet(title=sheet_name)
             
-            all_players = []
-            for team in teams:
-                if 'players' in team and team['players']:
-                    for player in team['players']:
-                        all_players.append({
-                            'Name': player.get('name', ''),
-                            'Jersey': player.get('jersey', ''),
-                            'Position': player.get('position', ''),
-                            'Shoots': player.get('shoots', ''),
-                            'Age': player.get('age', ''),
-                            'Birth Year': player.get('birthYear', ''),
-                            'Height': player.get('height', ''),
-                            'Weight': player.get('weight', ''),
-                            'Hometown': player.get('hometown', ''),
-                            'GP': player.get('games', 0),
-                            'G': player.get('goals', 0),
-                            'A': player.get('assists', 0),
-                            'P': player.get('points', 0),
-                            'PPG': player.get('ppg', 0.0),
-                            'PIM': player.get('pim', 0),
-                            'Team': team.get('name', ''),
-                            'League': league_name,
-                            'Season': player.get('season', SEASON),
-                            'Profile URL': player.get('profile_url', '')
-                        })
-            
-            if all_players:
-                headers = list(all_players[0].keys())
-                ws.append(headers)
-                for player in all_players:
-                    ws.append(list(player.values()))
-        
-        if 'Sheet' in wb.sheetnames:
-            wb.remove(wb['Sheet'])
+            header_written = False
+            for row in iter_player_rows(league_name, teams):
+                if not header_written:
+                    ws.append(EXCEL_COLUMNS)
+                    header_written = True
+                ws.append(row)
         
         wb.save(excel_file)
         print(f"✅ Created Excel: {excel_file}")
@@ -143,30 +397,119 @@ def create_excel(scraped_data, timestamp):
     except Exception as e:
         print(f"❌ Error creating Excel: {e}")
 
-def main():
-    print("\n" + "="*70)
-    print("🏒 GITHUB ACTIONS SCRAPER")
-    print("="*70)
-    print(f"⏰ Time: {datetime.now().isoformat()}")
-    print(f"📁 Data directory: {DATA_DIR}")
-    print(f"🏒 Leagues: {len(LEAGUES_TO_SCRAPE)}")
-    print("="*70 + "\n")
-    
-    timestamp = datetime.now().strftime('%Y-%m-%d')
+def create_csv(scraped_data, timestamp):
+    """Create one CSV file per league"""
+    try:
+        csv_dir = os.path.join(DATA_DIR, 'csv', timestamp)
+        os.makedirs(csv_dir, exist_ok=True)
+        
+        for league_name, teams in scraped_data.items():
+            csv_file = os.path.join(csv_dir, f'{league_slug(league_name)}.csv')
+            with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(EXCEL_COLUMNS)
+                writer.writerows(iter_player_rows(league_name, teams))
+            print(f"✅ Created CSV: {csv_file}")
+        
+    except Exception as e:
+        print(f"❌ Error creating CSV: {e}")
+
+def export_stage(scraped_data, timestamp, emit_csv=False):
+    """Run the spreadsheet exports (Excel and optional CSV)"""
+    create_excel(scraped_data, timestamp)
+    if emit_csv:
+        create_csv(scraped_data, timestamp)
+
+def start_export(scraped_data, timestamp, emit_csv=False):
+    """Start the export stage in a background process so it overlaps the JSON saves"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    process = multiprocessing.Process(
+        target=export_stage,
+        args=(scraped_data, timestamp, emit_csv),
+        name='export-stage'
+    )
+    process.start()
+    return process
+
+def timing_key(league_name):
+    """League key used by the timing store (the scraper names leagues after their URL slug)"""
+    return league_slug(league_name).upper()
+
+def balance_shards(leagues, count, timings):
+    """Split leagues into count shards with equal expected time (longest first onto the lightest shard)"""
+    estimates = {league['name']: timings.league_estimate(timing_key(league['name'])) for league in leagues}
+    known = sorted(value for value in estimates.values() if value)
+    fallback = known[len(known) // 2] if known else 1.0
+    shards = [{'seconds': 0.0, 'leagues': []} for _ in range(count)]
+    for league in sorted(leagues, key=lambda league: estimates[league['name']] or fallback, reverse=True):
+        lightest = min(shards, key=lambda shard: shard['seconds'])
+        lightest['leagues'].append(league)
+        lightest['seconds'] += estimates[league['name']] or fallback
+    for number, shard in enumerate(shards, 1):
+        print(f"⚖️ Shard {number}/{count}: ~{shard['seconds'] / 60:.0f} min - {', '.join(league['name'] for league in shard['leagues'])}")
+    return [shard['leagues'] for shard in shards]
+
+def select_leagues(shard=None, league_names=None):
+    """Leagues for this process: --leagues by name or slug, then shard i of n balanced by past timings"""
+    leagues = LEAGUES_TO_SCRAPE
+    if league_names:
+        wanted = {name.strip().lower() for name in league_names.split(',') if name.strip()}
+        leagues = [league for league in leagues if league['name'].lower() in wanted or league_slug(league['name']) in wanted]
+        unknown = wanted - {league['name'].lower() for league in leagues} - {league_slug(league['name']) for league in leagues}
+        if unknown:
+            raise ValueError(f"Unknown leagues: {', '.join(sorted(unknown))}")
+    if shard:
+        index, count = (int(part) for part in shard.split('/'))
+        if not 1 <= index <= count:
+            raise ValueError(f"Invalid shard {shard} (expected i/n with 1 <= i <= n)")
+        # Every shard reads the same committed timings, so they all agree on the split
+        leagues = balance_shards(leagues, count, TimingStore(TIMINGS_FILE))[index - 1]
+    return leagues
+
+def partials_dir(timestamp):
+    return os.path.join(PARTIALS_DIR, timestamp)
+
+def save_partial(league_name, teams, timestamp, state_entries=None, timing_entries=None):
+    """Write one league's team dicts (plus scrape state and timings) as a partial snapshot for a later merge"""
+    directory = partials_dir(timestamp)
+    os.makedirs(directory, exist_ok=True)
+    partial_file = os.path.join(directory, f'{league_slug(league_name)}.json')
+    with open(partial_file + '.tmp', 'w') as f:
+        json.dump({league_name: teams}, f)
+    os.replace(partial_file + '.tmp', partial_file)
+    if state_entries:
+        with open(os.path.join(directory, f'{league_slug(league_name)}.state'), 'w') as f:
+            json.dump(state_entries, f)
+    if timing_entries:
+        with open(os.path.join(directory, f'{league_slug(league_name)}.timings'), 'w') as f:
+            json.dump(timing_entries, f)
+    print(f"✅ Saved partial: {partial_file}")
+
+def load_partials(timestamp):
+    """Combine the partial snapshots of one run, in LEAGUES_TO_SCRAPE order"""
+    directory = partials_dir(timestamp)
+    partials = {}
+    for partial_file in sorted(os.listdir(directory)):
+        if partial_file.endswith('.json'):
+            partials.update(load_json(os.path.join(directory, partial_file), {}))
+    order = [league['name'] for league in LEAGUES_TO_SCRAPE]
+    return dict(sorted(partials.items(), key=lambda item: order.index(item[0]) if item[0] in order else len(order)))
+
+def scrape_leagues(leagues, timestamp, partial=False):
+    """Scrape leagues one after another with one driver; partial mode writes each league as it finishes"""
     scraped_data = {}
-    scraper = None
+    scraper = EliteProspectsScraper(
+        headless=True,
+        delay=DELAY,
+        min_delay=MIN_DELAY,
+        max_teams=None,
+        batch_size=5
+    )
     
     try:
-        scraper = EliteProspectsScraper(
-            headless=True,
-            delay=DELAY,
-            max_teams=None,
-            batch_size=5
-        )
-        
-        for i, league in enumerate(LEAGUES_TO_SCRAPE, 1):
+        for i, league in enumerate(leagues, 1):
             print(f"\n{'='*70}")
-            print(f"🏒 LEAGUE {i}/{len(LEAGUES_TO_SCRAPE)}: {league['name']}")
+            print(f"🏒 LEAGUE {i}/{len(leagues)}: {league['name']}")
             print(f"{'='*70}\n")
             
             try:
@@ -174,7 +517,7 @@ def main():
                 teams = scraper.get_league_teams(league_url, SEASON)
                 
                 if not teams:
-                    print(f"⚠️ No teams found for {league['name']}")
+                    events.warning('league_empty', f"No teams found for {league['name']}", league=league['name'])
                     continue
                 
                 print(f"📋 Found {len(teams)} teams in {league['name']}")
@@ -182,56 +525,322 @@ def main():
                 if league.get('max_teams'):
                     teams = teams[:league['max_teams']]
                 
-                scraped_teams = scraper.scrape_multiple_teams(teams, SEASON)
+                with tracer.span(league['name'], 'league', teams=len(teams)):
+                    scraped_teams = scraper.scrape_multiple_teams(teams, SEASON)
                 
                 if scraped_teams:
                     scraped_data[league['name']] = scraped_teams
-                    total_players = sum(len(team.get('players', [])) for team in scraped_teams)
+                    total_players = sum(len(team.players) for team in scraped_teams)
                     print(f"\n✅ {league['name']} COMPLETE: {len(scraped_teams)} teams, {total_players} players")
+                    events.info('league_scraped', league=league['name'], teams=len(scraped_teams), listed=len(teams),
+                                players=total_players)
+                    if partial:
+                        save_partial(league['name'], teams_to_dicts(scraped_teams), timestamp,
+                                     timing_entries=league_timings(scraper.timings, scraped_teams))
                 
             except Exception as e:
-                print(f"❌ Error scraping {league['name']}: {e}")
+                events.error('league_failed', f"Error scraping {league['name']}: {e}", league=league['name'], error=str(e))
+                continue
+    
+    finally:
+        try:
+            scraper.close()
+        except:
+            pass
+    
+    return scraped_data
+
+def league_timings(timings, teams):
+    """Timing entries of the given teams (shards hand these to merge)"""
+    return {team.id: timings.teams[team.id] for team in teams if team.id in timings.teams}
+
+def load_scrape_state():
+    """Per-team scrape history: {'teams': {team id: {league, name, last_scraped, carry_over}}}"""
+    return load_json(SCRAPE_STATE_FILE, {'teams': {}})
+
+def save_scrape_state(state, timestamp):
+    state['last_updated'] = timestamp
+    with open(SCRAPE_STATE_FILE, 'w') as f:
+        json.dump(state, f, indent=2)
+    print(f"✅ Updated scrape state: {SCRAPE_STATE_FILE}")
+
+def team_priority(team_info, state, today):
+    """Expected value of re-scraping a team: carried-over teams first, then the stalest
+
+    Days since the last scrape stands in for games played since then - junior
+    schedules are spread evenly enough over the season for that to rank well.
+    """
+    entry = state['teams'].get(team_info['id'])
+    if entry is None or not entry.get('last_scraped'):
+        return (True, NEVER_SCRAPED_DAYS)
+    days = (today - datetime.strptime(entry['last_scraped'], '%Y-%m-%d')).days
+    return (entry.get('carry_over', False), days)
+
+def team_estimator(timings):
+    """Seconds a team is expected to take, from the per-phase timing history"""
+    return lambda team_info: timings.estimate(team_info['id'], team_info.get('league'))
+
+def carried_over(team, state, fallback):
+    """Last run's team dict, marked with the date it was actually scraped"""
+    scraped = team.get('scraped') or state['teams'].get(team.get('id'), {}).get('last_scraped') or fallback or 'unknown'
+    return dict(team, scraped=scraped)
+
+def scrape_budgeted(leagues, timestamp, budget_minutes, partial=False):
+    """Scrape the most valuable teams that fit the budget; everything else keeps last run's data
+
+    Returns {league name: [team dicts]} with fresh teams and carried-over previous
+    teams in league page order. Carried-over teams keep last run's data and carry
+    'scraped': <date it was scraped>, so history and views don't count them as new.
+    Skipped teams are flagged to go first next run.
+    """
+    deadline = time.time() + budget_minutes * 60 - SAVE_RESERVE_SECONDS
+    state = load_scrape_state()
+    previous = load_json(os.path.join(DATA_DIR, 'latest.json'), {})
+    previous_date = load_json(os.path.join(DATA_DIR, 'index.json'), {}).get('last_updated')
+    today = datetime.strptime(timestamp, '%Y-%m-%d')
+    timings = TimingStore(TIMINGS_FILE)
+    estimate = team_estimator(timings)
+    
+    scraper = EliteProspectsScraper(headless=True, delay=DELAY, min_delay=MIN_DELAY, max_teams=None, batch_size=5,
+                                    timing_store=timings)
+    league_teams = {}
+    try:
+        for league in leagues:
+            if time.time() >= deadline:
+                print(f"⏭️ Budget spent - not listing {league['name']}")
                 continue
+            teams = scraper.get_league_teams(f"{league['url']}/{SEASON}", SEASON)
+            if league.get('max_teams'):
+                teams = teams[:league['max_teams']]
+            league_teams[league['name']] = teams
+            print(f"📋 Found {len(teams)} teams in {league['name']}")
         
-        if scraped_data:
-            print(f"\n{'='*70}")
-            print("💾 SAVING DATA")
-            print(f"{'='*70}\n")
-            
-            save_data(scraped_data, timestamp)
-            create_excel(scraped_data, timestamp)
-            
-            total_leagues = len(scraped_data)
-            total_teams = sum(len(teams) for teams in scraped_data.values())
-            total_players = sum(
-                sum(len(team.get('players', [])) for team in teams)
-                for teams in scraped_data.values()
-            )
-            
-            print(f"\n{'='*70}")
-            print("✅ SCRAPING COMPLETE")
-            print(f"{'='*70}")
-            print(f"📊 Leagues: {total_leagues}")
-            print(f"🏒 Teams: {total_teams}")
-            print(f"👤 Players: {total_players}")
-            print(f"⏰ Date: {timestamp}")
-            print(f"{'='*70}\n")
-        else:
-            print("\n❌ No data scraped")
-            sys.exit(1)
+        # One queue across leagues, most valuable first (stable: page order breaks ties)
+        queue = [team for teams in league_teams.values() for team in teams]
+        queue.sort(key=lambda team: team_priority(team, state, today), reverse=True)
+        remaining = deadline - time.time()
+        print(f"⏱️ Budget: {remaining / 60:.1f} min for {len(queue)} teams "
+              f"(~{sum(estimate(team) for team in queue) / 60:.1f} min estimated)")
+        with tracer.span('budgeted queue', 'league', teams=len(queue)):
+            scraped_teams = scraper.scrape_multiple_teams(queue, SEASON, deadline=deadline, estimate=estimate)
+        skipped = {team['id'] for team in scraper.skipped_teams}
+    finally:
+        try:
+            scraper.close()
+        except:
+            pass
+    
+    # A failed team comes back empty - it keeps last run's roster and goes first next run
+    fresh = {team.id: team for team in scraped_teams if team.players}
+    failed = {team['id'] for team in queue} - fresh.keys() - skipped  # Empty or raised
+    scraped_data = {}
+    for league in leagues:
+        league_name = league['name']
+        teams = league_teams.get(league_name)
+        if not teams:
+            # Not listed (budget spent or page failed) - last run's data stands
+            if previous.get(league_name):
+                print(f"📦 {league_name}: keeping last run's {len(previous[league_name])} teams")
+                scraped_data[league_name] = [carried_over(team, state, previous_date) for team in previous[league_name]]
+                if partial:
+                    save_partial(league_name, scraped_data[league_name], timestamp)
+            continue
+        previous_teams = {team.get('id'): team for team in previous.get(league_name, [])}
+        combined = []
+        entries = {}
+        for team_info in teams:
+            team_id = team_info['id']
+            entry = dict(state['teams'].get(team_id, {}), league=league_name, name=team_info['name'])
+            if team_id in fresh:
+                combined.append(teams_to_dicts([fresh[team_id]])[0])
+                entry['last_scraped'] = timestamp
+                entry['carry_over'] = False
+            else:
+                if team_id in previous_teams:
+                    combined.append(carried_over(previous_teams[team_id], state, previous_date))
+                entry['carry_over'] = team_id in skipped or team_id in failed
+            entries[team_id] = entry
+        state['teams'].update(entries)
+        if combined:
+            scraped_data[league_name] = combined
+            if partial:
+                league_fresh = [fresh[team_info['id']] for team_info in teams if team_info['id'] in fresh]
+                save_partial(league_name, combined, timestamp, entries, league_timings(timings, league_fresh))
         
-    except Exception as e:
-        print(f"\n❌ FATAL ERROR: {e}")
-        import traceback
-        traceback.print_exc()
+        carried = sum(1 for team_info in teams if team_info['id'] not in fresh and team_info['id'] in previous_teams)
+        print(f"📊 {league_name}: {sum(1 for team_info in teams if team_info['id'] in fresh)} fresh, "
+              f"{carried} kept from last run, "
+              f"{sum(1 for team_info in teams if team_info['id'] in skipped or team_info['id'] in failed)} carried over")
+    
+    if not partial:
+        save_scrape_state(state, timestamp)
+    return scraped_data
+
+def save_all(scraped_data, timestamp):
+    """Dated snapshot, latest.json, index.json, history, views and the Excel export"""
+    print(f"\n{'='*70}")
+    print("💾 SAVING DATA")
+    print(f"{'='*70}\n")
+    
+    export_process = start_export(scraped_data, timestamp, EXPORT_CSV)
+    save_data(scraped_data, timestamp)
+    update_player_history(scraped_data, timestamp)
+    write_materialized_views(scraped_data, timestamp)
+    export_process.join()
+    if export_process.exitcode != 0:
+        print(f"⚠️ Export stage exited with code {export_process.exitcode}")
+    
+    total_leagues = len(scraped_data)
+    total_teams = sum(len(teams) for teams in scraped_data.values())
+    total_players = sum(
+        sum(len(team.get('players', [])) for team in teams)
+        for teams in scraped_data.values()
+    )
+    
+    print(f"\n{'='*70}")
+    print("✅ SCRAPING COMPLETE")
+    print(f"{'='*70}")
+    print(f"📊 Leagues: {total_leagues}")
+    print(f"🏒 Teams: {total_teams}")
+    print(f"👤 Players: {total_players}")
+    print(f"⏰ Date: {timestamp}")
+    print(f"{'='*70}\n")
+
+def merge(timestamp=None):
+    """Combine a run's partial snapshots and run the save steps once"""
+    if timestamp is None:
+        runs = sorted(os.listdir(PARTIALS_DIR)) if os.path.isdir(PARTIALS_DIR) else []
+        if not runs:
+            print(f"❌ No partial snapshots in {PARTIALS_DIR}")
+            sys.exit(1)
+        timestamp = runs[-1]
+    if not os.path.isdir(partials_dir(timestamp)):
+        print(f"❌ No partial snapshots for {timestamp}")
         sys.exit(1)
     
-    finally:
-        if scraper:
-            try:
-                scraper.close()
-            except:
-                pass
+    scraped_data = load_partials(timestamp)
+    missing = [league['name'] for league in LEAGUES_TO_SCRAPE if league['name'] not in scraped_data]
+    print(f"🧩 Merging {len(scraped_data)} partial leagues for {timestamp}")
+    if missing:
+        print(f"⚠️ No partial for: {', '.join(missing)}")
+    if not scraped_data:
+        print("\n❌ No data scraped")
+        sys.exit(1)
+    
+    save_all(scraped_data, timestamp)
+    
+    # Shards leave per-team timings (and, when budgeted, scrape state) next to their partials
+    partial_files = sorted(os.listdir(partials_dir(timestamp)))
+    state_files = [name for name in partial_files if name.endswith('.state')]
+    if state_files:
+        state = load_scrape_state()
+        for state_file in state_files:
+            state['teams'].update(load_json(os.path.join(partials_dir(timestamp), state_file), {}))
+        save_scrape_state(state, timestamp)
+    # Shard metrics and event logs are kept with the run's own
+    for metrics_file in (name for name in partial_files if name.endswith('.metrics')):
+        os.makedirs(os.path.join(METRICS_DIR, timestamp), exist_ok=True)
+        shutil.copyfile(os.path.join(partials_dir(timestamp), metrics_file),
+                        os.path.join(METRICS_DIR, timestamp, metrics_file[:-len('.metrics')] + '.json'))
+    for events_file in (name for name in partial_files if name.endswith('.events')):
+        os.makedirs(os.path.join(LOGS_DIR, timestamp), exist_ok=True)
+        shutil.copyfile(os.path.join(partials_dir(timestamp), events_file),
+                        os.path.join(LOGS_DIR, timestamp, events_file[:-len('.events')] + '.ndjson'))
+    metrics.dump(os.path.join(METRICS_DIR, timestamp, 'merge.json'))
+    
+    timing_files = [name for name in partial_files if name.endswith('.timings')]
+    if timing_files:
+        timings = TimingStore(TIMINGS_FILE)
+        for timing_file in timing_files:
+            timings.merge(load_json(os.path.join(partials_dir(timestamp), timing_file), {}))
+        timings.save()
+        print(f"✅ Updated timings: {TIMINGS_FILE}")
+    
+    # Partials are intermediates - the dated snapshot now holds everything
+    shutil.rmtree(partials_dir(timestamp), ignore_errors=True)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Scrape the configured leagues into data/')
+    parser.add_argument('command', nargs='?', choices=['scrape', 'merge'], default='scrape',
+                        help='scrape (default) or merge partial snapshots')
+    parser.add_argument('--shard', help='Run shard i/n of the leagues and write partial snapshots')
+    parser.add_argument('--leagues', help='Comma-separated league names or slugs (writes partial snapshots)')
+    parser.add_argument('--timestamp', help='Run date YYYY-MM-DD (default: today; merge: newest partials)')
+    parser.add_argument('--trace', metavar='PATH',
+                        help='Write a Chrome trace-event file of every league, team, phase and WebDriver call')
+    parser.add_argument('--log-level', choices=list(scraper_module.EventLog.LEVELS),
+                        help='Lowest event level written to the NDJSON event log (default: SCRAPE_LOG_LEVEL or info)')
+    parser.add_argument('--budget-minutes', type=float,
+                        help='Wall-clock budget: scrape the stalest teams that fit, keep last run\'s data for the rest')
+    return parser.parse_args(argv)
+
+def main():
+    args = parse_args()
+    if args.trace:
+        tracer.start(args.trace)
+    if args.command == 'merge':
+        merge(args.timestamp)
+        return
+    
+    try:
+        leagues = select_leagues(args.shard, args.leagues)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+    partial = bool(args.shard or args.leagues)
+    
+    print("\n" + "="*70)
+    print("🏒 GITHUB ACTIONS SCRAPER")
+    print("="*70)
+    print(f"⏰ Time: {datetime.now().isoformat()}")
+    print(f"📁 Data directory: {DATA_DIR}")
+    print(f"🏒 Leagues: {len(leagues)}" + (f" ({', '.join(league['name'] for league in leagues)})" if partial else ''))
+    print("="*70 + "\n")
+    
+    timestamp = args.timestamp or datetime.now().strftime('%Y-%m-%d')
+    run_name = None
+    if partial:
+        run_name = f"shard-{args.shard.replace('/', '-of-')}" if args.shard else '+'.join(league_slug(league['name']) for league in leagues)
+    
+    # Structured event log next to the run's other outputs (SCRAPE_EVENTS overrides the path)
+    if args.log_level:
+        events.set_level(args.log_level)
+    if events.path is None:
+        events.start(os.path.join(partials_dir(timestamp), f'{run_name}.events') if partial
+                     else os.path.join(LOGS_DIR, timestamp, 'scrape.ndjson'))
+    
+    with tracer.span('run', 'run', leagues=len(leagues), budget_minutes=args.budget_minutes):
+        try:
+            if args.budget_minutes:
+                # Already plain dicts - fresh teams merged with last run's data for the rest
+                scraped_data = scrape_budgeted(leagues, timestamp, args.budget_minutes, partial)
+            else:
+                scraped_data = scrape_leagues(leagues, timestamp, partial)
+                # Serialisation edge: records become plain dicts for JSON, history, views and exports
+                scraped_data = {name: teams_to_dicts(teams) for name, teams in scraped_data.items()}
+        
+            if not scraped_data:
+                print("\n❌ No data scraped")
+                sys.exit(1)
+        
+            if partial:
+                print(f"\n✅ Partial run complete: {len(scraped_data)} leagues in {partials_dir(timestamp)}")
+                metrics.dump(os.path.join(partials_dir(timestamp), f'{run_name}.metrics'))
+            else:
+                save_all(scraped_data, timestamp)
+                metrics.dump(os.path.join(METRICS_DIR, timestamp, 'scrape.json'))
+        
+        except Exception as e:
+            print(f"\n❌ FATAL ERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            sys.exit(1)
+        
+        finally:
+            print(f"\n📒 Events ({events.path}):")
+            for line in events.summary_lines():
+                print(line)
+            events.close()
 
 if __name__ == '__main__':
     main()
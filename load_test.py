@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test - scrapes a mock EliteProspects (mock_eliteprospects.py)
+with concurrent scrapers and reports throughput and tail latency.
+
+Every worker is an EliteProspectsScraper with its own driver, and all of them
+share one rate controller as the API's ScrapeScheduler workers do. Comma lists
+sweep settings, one run per combination:
+
+  python load_test.py --leagues 50 --teams 30 --workers 1,2,4,8 --pacing off
+  python load_test.py --workers 2 --delay 0.5,1,3 --latency 150 --jitter 100 --error-rate 0.01
+  python load_test.py --target http://127.0.0.1:8000 --driver chrome
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import argparse
+import itertools
+import threading
+import contextlib
+
+import requests
+
+import fixtures
+import github_scraper
+import mock_eliteprospects
+from benchmark_parsers import Unpaced
+
+scraper_module = github_scraper.scraper_module
+SEASON = github_scraper.SEASON
+PROGRESS_SECONDS = 5
+
+
+class LoadTestScraper(scraper_module.EliteProspectsScraper):
+    """Scraper that also keeps every page navigation's latency"""
+
+    def __init__(self, *args, **kwargs):
+        self.navigations = []
+        super().__init__(*args, **kwargs)
+
+    def add_phase(self, phase, seconds):
+        super().add_phase(phase, seconds)
+        if phase == 'navigation':
+            self.navigations.append(seconds)
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile of an already sorted list"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, int(round(percent / 100 * len(values) + 0.5)) - 1))]
+
+
+def counter_deltas(before, prefix):
+    after = scraper_module.metrics.to_dict()['counters']
+    return {key[len(prefix):].strip('{}'): value - before.get(key, 0)
+            for key, value in after.items() if key.startswith(prefix) and value - before.get(key, 0)}
+
+
+def run_once(base_url, leagues, workers, delay, pacing, driver, min_delay=None):
+    """Scrape every league with `workers` concurrent scrapers; returns the run's measurements"""
+    rate = scraper_module.AdaptiveRateController(delay, min_delay) if pacing == 'adaptive' else Unpaced(delay)
+    timings = scraper_module.TimingStore(None)
+    with scraper_module.circuit_breakers_lock:
+        scraper_module.circuit_breakers.clear()  # Each run starts with a closed breaker
+    work = queue.SimpleQueue()
+    for league in leagues:
+        work.put(league)
+    scrapers = []
+    totals = {'listed': 0, 'teams': 0, 'players': 0}
+    lock = threading.Lock()
+    counters = scraper_module.metrics.to_dict()['counters']
+    served = requests.get(f"{base_url}/__mock__/stats", timeout=10).json()
+
+    def scrape(number):
+        scraper = LoadTestScraper(headless=True, delay=delay, rate_controller=rate, timing_store=timings,
+                                  driver=fixtures.HttpDriver() if driver == 'http' else None, base_url=base_url)
+        with lock:
+            scrapers.append(scraper)
+        try:
+            while True:
+                try:
+                    league = work.get_nowait()
+                except queue.Empty:
+                    return
+                teams = scraper.get_league_teams(league['url'], SEASON)
+                scraped = scraper.scrape_multiple_teams(teams, SEASON)
+                with lock:
+                    totals['listed'] += len(teams)
+                    totals['teams'] += sum(1 for team in scraped if team.players)
+                    totals['players'] += sum(len(team.players) for team in scraped)
+        finally:
+            scraper.close()
+
+    threads = [threading.Thread(target=scrape, args=(number,), name=f'load-worker-{number}') for number in range(workers)]
+    start = time.time()
+    with open(os.devnull, 'w') as quiet, contextlib.redirect_stdout(quiet):
+        for thread in threads:
+            thread.start()
+        while alive := [thread for thread in threads if thread.is_alive()]:
+            alive[0].join(PROGRESS_SECONDS)
+            with lock:
+                pages = sum(len(scraper.navigations) for scraper in scrapers)
+            print(f"   … {time.time() - start:.0f}s: {pages} pages, {len(timings.teams)} teams", file=sys.stderr)
+    wall = time.time() - start
+
+    navigations = sorted(seconds for scraper in scrapers for seconds in scraper.navigations)
+    team_seconds = sorted(entry['total'] for entry in timings.teams.values())
+    after = requests.get(f"{base_url}/__mock__/stats", timeout=10).json()
+    return {
+        'workers': workers, 'delay': delay, 'pacing': pacing, 'driver': driver,
+        'seconds': round(wall, 2), 'pages': len(navigations),
+        'pages_per_second': round(len(navigations) / wall, 2) if wall else 0.0,
+        'teams': totals['teams'], 'teams_listed': totals['listed'],
+        'teams_per_minute': round(totals['teams'] * 60 / wall, 1) if wall else 0.0,
+        'players': totals['players'],
+        'navigation_ms': {f"p{q}": round(percentile(navigations, q) * 1000, 1) for q in (50, 95, 99)}
+                         | {'max': round(navigations[-1] * 1000, 1) if navigations else 0.0},
+        'team_seconds': {f"p{q}": round(percentile(team_seconds, q), 2) for q in (50, 95, 99)},
+        'page_loads': counter_deltas(counters, 'scraper_page_loads_total'),
+        'retries': counter_deltas(counters, 'scraper_retries_total'),
+        'served': {key: value - served.get(key, 0) for key, value in after.items() if value - served.get(key, 0)},
+        'final_rate_per_minute': round(rate.rate * 60, 1),
+    }
+
+
+def print_report(results):
+    print(f"\n{'workers':>7} {'delay':>6} {'pacing':>8} {'sec':>8} {'pages/s':>8} {'teams/min':>9} "
+          f"{'nav p50':>8} {'p95':>8} {'p99':>8} {'max ms':>8} {'team p95':>9} {'teams':>9}")
+    for result in results:
+        navigation = result['navigation_ms']
+        print(f"{result['workers']:>7} {result['delay']:>6} {result['pacing']:>8} {result['seconds']:>8.1f} "
+              f"{result['pages_per_second']:>8.2f} {result['teams_per_minute']:>9.1f} {navigation['p50']:>8.1f} "
+              f"{navigation['p95']:>8.1f} {navigation['p99']:>8.1f} {navigation['max']:>8.1f} "
+              f"{result['team_seconds']['p95']:>8.2f}s {result['teams']:>4}/{result['teams_listed']:<4}")
+    for result in results:
+        trouble = {**{f"load {key}": value for key, value in result['page_loads'].items() if 'ok' not in key},
+                   **{f"retry {key}": value for key, value in result['retries'].items()}}
+        if trouble:
+            print(f"   workers={result['workers']} delay={result['delay']}: " +
+                  ', '.join(f"{key} {value}" for key, value in trouble.items()) + f" | served {result['served']}")
+
+
+def parse_list(text, cast):
+    return [cast(value) for value in text.split(',') if value.strip()]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Load-test the scrape pipeline against a mock EliteProspects')
+    parser.add_argument('--target', help='Base URL of a running mock_eliteprospects.py (default: start one in-process)')
+    parser.add_argument('--workers', default='2', help='Concurrent scrapers (comma list to sweep)')
+    parser.add_argument('--delay', default='0.5', help='Starting seconds between page loads (comma list to sweep)')
+    parser.add_argument('--min-delay', type=float, default=scraper_module.AdaptiveRateController.MIN_INTERVAL,
+                        help='Fastest pace the adaptive controller may reach, in seconds between page loads')
+    parser.add_argument('--pacing', choices=['adaptive', 'off'], default='adaptive',
+                        help='adaptive: the production AIMD controller; off: no waits, raw pipeline capacity')
+    parser.add_argument('--driver', choices=['http', 'chrome'], default='http',
+                        help='http: fetch and parse without a browser; chrome: real headless Chrome')
+    parser.add_argument('--json', metavar='PATH', help='Also write the results as JSON')
+    mock_eliteprospects.add_site_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    server = None
+    base_url = args.target
+    if not base_url:
+        server = mock_eliteprospects.serve_in_background(mock_eliteprospects.build_server(args))
+        base_url = server.base_url
+        print(f"🏒 Mock EliteProspects on {base_url}: {args.leagues} leagues x {args.teams} teams x {args.players} players"
+              f" (latency {args.latency:g}±{args.jitter:g} ms, drops {args.error_rate:.1%}, throttle {args.throttle_rps or 'off'})")
+    base_url = base_url.rstrip('/')
+    leagues = requests.get(f"{base_url}/__mock__/leagues", timeout=10).json()
+
+    results = []
+    try:
+        for workers, delay in itertools.product(parse_list(args.workers, int), parse_list(args.delay, float)):
+            print(f"\n🚀 {len(leagues)} leagues, {workers} worker(s), delay {delay}s, pacing {args.pacing}, {args.driver} driver")
+            results.append(run_once(base_url, leagues, workers, delay, args.pacing, args.driver, args.min_delay))
+    finally:
+        if server:
+            server.shutdown()
+
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Mock EliteProspects - a local stand-in that serves generated league, roster and
+stats pages in the site's HTML shape, with injectable latency, dropped
+connections and throttling.
+
+The first leagues are the ones in github_scraper.LEAGUES_TO_SCRAPE (same
+slugs), then synthetic ones, so both the real pipeline and load_test.py can
+run against it:
+
+  python mock_eliteprospects.py --leagues 50 --teams 30 --latency 200 --error-rate 0.01
+  EP_BASE_URL=http://127.0.0.1:8000 python github_scraper.py --leagues NAHL
+
+GET /__mock__/leagues lists the generated leagues, /__mock__/stats counts the
+requests served by outcome.
+"""
+
+import json
+import time
+import random
+import argparse
+import threading
+import functools
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import fixtures
+import github_scraper
+
+SEASON = github_scraper.SEASON
+FIRST_NAMES = ['Jack', 'Liam', 'Noah', 'Owen', 'Ryan', 'Cole', 'Evan', 'Luke', 'Nate', 'Gavin', 'Tyler', 'Mason',
+               'Logan', 'Carter', 'Hunter', 'Brody', 'Caleb', 'Dylan', 'Ethan', 'Aidan', 'Jonas', 'Mikko', 'Oskar', 'Viktor']
+LAST_NAMES = ['Anderson', 'Brooks', 'Carlson', 'Dahl', 'Erickson', 'Fischer', 'Gallagher', 'Hanson', 'Iverson',
+              'Johansson', 'Keller', 'Lindqvist', 'Morrison', 'Nielsen', 'OConnor', 'Peterson', 'Quinn', 'Robinson',
+              'Sullivan', 'Thompson', 'Underwood', 'Virtanen', 'Walsh', 'Young']
+TOWNS = ['Minneapolis, MN, USA', 'Boston, MA, USA', 'Detroit, MI, USA', 'Buffalo, NY, USA', 'Fargo, ND, USA',
+         'Anchorage, AK, USA', 'Toronto, ON, CAN', 'Calgary, AB, CAN', 'Helsinki, FIN', 'Stockholm, SWE']
+MASCOTS = ['Wings', 'Bruins', 'Titans', 'Jr. Wolves', 'Rebels', 'Knights', 'Huskies', 'Lumberjacks', 'Stars', 'Freeze']
+POSITIONS = ['C', 'LW', 'RW', 'D', 'D', 'F']
+
+
+def slugify(name):
+    return ''.join(c if c.isalnum() else '-' for c in name.lower()).strip('-')
+
+
+class MockSite:
+    """Deterministic leagues, teams and players (same seed, same pages)"""
+
+    def __init__(self, leagues=7, teams=30, players=25, seed=0):
+        self.players_per_team = players
+        self.seed = seed
+        rng = random.Random(seed)
+        names = [(league['name'], league['url'].rstrip('/').split('/')[-1]) for league in github_scraper.LEAGUES_TO_SCRAPE]
+        names += [(f"Mock League {number}", f"mock-league-{number}") for number in range(len(names) + 1, leagues + 1)]
+        self.leagues = {}
+        self.teams = {}
+        team_id = 10000
+        for name, slug in names[:leagues]:
+            league_teams = []
+            for number in range(teams):
+                team_id += 1
+                town = rng.choice(TOWNS).split(',')[0]
+                team_name = f"{town} {rng.choice(MASCOTS)} {number + 1}"
+                team = {'id': str(team_id), 'name': team_name, 'league': name,
+                        'url': fixtures.team_path(team_id, slugify(team_name), SEASON)}
+                league_teams.append(team)
+                self.teams[str(team_id)] = team
+            self.leagues[slug] = {'name': name, 'slug': slug, 'teams': league_teams}
+        self.page = functools.lru_cache(maxsize=4096)(self.render)
+
+    def roster(self, team_id):
+        """The team dict with generated players, as a dated snapshot holds it"""
+        team = self.teams[team_id]
+        rng = random.Random(self.seed * 1000003 + int(team_id))
+        players = []
+        for number in range(1, self.players_per_team + 1):
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            games = rng.randint(0, 40)
+            goals = rng.randint(0, games // 2 + 1)
+            assists = rng.randint(0, games // 2 + 2)
+            age = rng.randint(16, 21)
+            players.append({
+                'name': name, 'jersey': f"#{number}", 'position': rng.choice(POSITIONS), 'shoots': rng.choice('LR'),
+                'age': age, 'height': f"{rng.randint(5, 6)}'{rng.randint(0, 11)}\"", 'weight': str(rng.randint(150, 220)),
+                'hometown': rng.choice(TOWNS), 'profile_url': f"/player/{int(team_id) * 100 + number}/{slugify(name)}",
+                'games': games, 'goals': goals, 'assists': assists, 'points': goals + assists, 'pim': rng.randint(0, 60)
+            })
+        return dict(team, players=players)
+
+    def render(self, path, tab=None):
+        """(status, html) for a site path (self.page is the cached version)"""
+        parts = [part for part in path.split('/') if part]
+        if len(parts) == 3 and parts[0] == 'league' and parts[1] in self.leagues and parts[2] == SEASON:
+            league = self.leagues[parts[1]]
+            return 200, fixtures.render_league_page(league['name'], SEASON, league['teams'])
+        if len(parts) == 4 and parts[0] == 'team' and parts[1] in self.teams and parts[3] == SEASON:
+            team = self.roster(parts[1])
+            render = fixtures.render_stats_page if tab == 'stats' else fixtures.render_roster_page
+            return 200, render(team, SEASON)
+        return 404, fixtures.NOT_FOUND_PAGE
+
+    def league_index(self, base_url):
+        return [{'name': league['name'], 'slug': slug, 'url': f"{base_url}/league/{slug}", 'teams': len(league['teams'])}
+                for slug, league in self.leagues.items()]
+
+
+class MockServer(ThreadingHTTPServer):
+    """Threaded HTTP server around a MockSite with fault injection
+
+    latency/jitter in milliseconds (uniform), error_rate = share of requests whose
+    connection is dropped without a response, throttle_rps = token-bucket limit
+    above which pages are '429 Too Many Requests' (0 = unlimited).
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, site, latency=0, jitter=0, error_rate=0.0, throttle_rps=0):
+        super().__init__(address, MockHandler)
+        self.site = site
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rps = throttle_rps
+        self.burst = max(throttle_rps, 1)  # One second's worth of requests
+        self.tokens = float(self.burst)
+        self.refilled = None
+        self.lock = threading.Lock()
+        self.rng = random.Random()
+        self.counts = {}
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def admit(self):
+        """Outcome for the next page request: 'ok', 'dropped' or 'throttled'"""
+        with self.lock:
+            if self.error_rate and self.rng.random() < self.error_rate:
+                return 'dropped'
+            if self.throttle_rps:
+                now = time.monotonic()
+                if self.refilled is not None:
+                    self.tokens = min(self.burst, self.tokens + (now - self.refilled) * self.throttle_rps)
+                self.refilled = now
+                if self.tokens < 1:
+                    return 'throttled'
+                self.tokens -= 1
+            return 'ok'
+
+    def delay(self):
+        with self.lock:
+            milliseconds = self.latency + self.rng.uniform(-self.jitter, self.jitter) if self.jitter else self.latency
+        return max(milliseconds, 0) / 1000
+
+    def count(self, outcome):
+        with self.lock:
+            self.counts[outcome] = self.counts.get(outcome, 0) + 1
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counts)
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        if url.path.startswith('/__mock__/'):
+            body = {'leagues': lambda: server.site.league_index(server.base_url),
+                    'stats': server.stats}.get(url.path[len('/__mock__/'):].strip('/'))
+            return self.respond(200, json.dumps(body()), 'application/json') if body else self.respond(404, '{}', 'application/json')
+
+        outcome = server.admit()
+        time.sleep(server.delay())
+        if outcome == 'dropped':
+            server.count('dropped')
+            self.close_connection = True
+            return
+        if outcome == 'throttled':
+            server.count('throttled')
+            return self.respond(429, fixtures.render_page('429 Too Many Requests', '<h1>Too Many Requests</h1>'),
+                                headers={'Retry-After': '1'})
+        status, page = server.site.page(url.path, parse_qs(url.query).get('tab', [None])[0])
+        server.count(str(status))
+        self.respond(status, page)
+
+    def respond(self, status, body, content_type='text/html; charset=utf-8', headers=None):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # Thousands of requests per load test - /__mock__/stats has the counts
+
+
+def build_server(args, host='127.0.0.1', port=0):
+    """MockServer for parsed add_site_arguments options (port 0 picks a free port)"""
+    return MockServer((host, port), MockSite(args.leagues, args.teams, args.players, args.seed),
+                      latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, throttle_rps=args.throttle_rps)
+
+
+def serve_in_background(server):
+    """Serve from a daemon thread (stop with server.shutdown())"""
+    threading.Thread(target=server.serve_forever, name='mock-eliteprospects', daemon=True).start()
+    return server
+
+
+def add_site_arguments(parser):
+    """Site size and fault options shared with load_test.py"""
+    parser.add_argument('--leagues', type=int, default=7, help='Leagues to generate (the real seven first)')
+    parser.add_argument('--teams', type=int, default=30, help='Teams per league')
+    parser.add_argument('--players', type=int, default=25, help='Skaters per team')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the generated names and stats')
+    parser.add_argument('--latency', type=float, default=0, help='Added response latency in ms')
+    parser.add_argument('--jitter', type=float, default=0, help='Uniform latency jitter in ms (+/-)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests dropped without a response')
+    parser.add_argument('--throttle-rps', type=float, default=0, help='Requests/second above which pages are 429s (0 = off)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve generated EliteProspects-shaped pages for offline runs and load tests')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    add_site_arguments(parser)
+    args = parser.parse_args()
+
+    server = build_server(args, args.host, args.port)
+    print(f"🏒 Mock EliteProspects on {server.base_url}: {args.leagues} leagues x {args.teams} teams x {args.players} players")
+    print(f"   Scrape it with: EP_BASE_URL={server.base_url} python github_scraper.py")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Production server - the API under gunicorn with several read workers.
+
+One dedicated runner process (the scraper module's app under a single
+gunicorn worker, bound to localhost) owns the WebDriver, the job scheduler and
+scrape progress; read workers forward those routes to it. The runner is
+restarted whenever it crashes, so a crash costs the scrape in flight, not every
+later one.
+
+The dataset is loaded once in the master before forking, so workers share its
+pages copy-on-write. Each worker then follows data/latest.json and the runner's
+live snapshot on its own: every weekly snapshot is parsed once per worker, and
+the reloaded copies are private to each worker, so memory after the first
+reload is about WEB_CONCURRENCY times the dataset. Size WEB_CONCURRENCY for
+that, or restart the server after the weekly run to share pages again.
+
+Usage: python serve.py   (PORT, WEB_CONCURRENCY, WEB_THREADS, RUNNER_PORT)
+       python serve.py runner   (the runner alone; serve.py starts it itself)
+"""
+
+import os
+import sys
+import time
+import subprocess
+import threading
+import importlib.util
+
+from gunicorn.app.base import BaseApplication
+
+DATA_DIR = 'data'
+LIVE_SNAPSHOT = os.path.join(DATA_DIR, 'live', 'scraped.json')
+PORT = int(os.environ.get('PORT', 5000))
+RUNNER_PORT = int(os.environ.get('RUNNER_PORT', 5001))
+WORKERS = int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 2))
+THREADS = int(os.environ.get('WEB_THREADS', 8))  # Progress streams hold a thread each
+RUNNER_RESTART_DELAY = 5  # seconds before restarting a runner that exited
+
+scraper_file = 'enhanced_scraper_2025-2026.py'
+
+
+def start_runner(fresh=True):
+    """Start the single scrape runner process on localhost"""
+    env = dict(os.environ, LIVE_SNAPSHOT=LIVE_SNAPSHOT)
+    env.pop('SCRAPE_RUNNER_URL', None)
+    # A fresh session: leagues scraped by an earlier runner are in latest.json or gone
+    if fresh and os.path.exists(LIVE_SNAPSHOT):
+        os.remove(LIVE_SNAPSHOT)
+    return subprocess.Popen([sys.executable, os.path.abspath(__file__), 'runner'], env=env)
+
+
+class RunnerSupervisor:
+    """Restarts the runner process whenever it crashes, until stop()"""
+
+    def __init__(self):
+        self.stopping = threading.Event()
+        self.process = start_runner()
+        self.thread = threading.Thread(target=self.watch, name='runner-supervisor', daemon=True)
+        self.thread.start()
+
+    def watch(self):
+        while not self.stopping.is_set():
+            code = self.process.wait()
+            # A clean exit is a shutdown (e.g. SIGTERM to the whole process group), not a crash
+            if code == 0 or self.stopping.wait(RUNNER_RESTART_DELAY):
+                return
+            print(f"⚠️ Scrape runner exited with code {code} - restarting")
+            self.process = start_runner(fresh=False)
+            print(f"🏃 Scrape runner: pid {self.process.pid} on 127.0.0.1:{RUNNER_PORT}")
+
+    def stop(self):
+        self.stopping.set()
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def load_read_app():
+    """Import the API in read-worker mode and load the dataset before the workers fork"""
+    os.environ['SCRAPE_RUNNER_URL'] = f'http://127.0.0.1:{RUNNER_PORT}'
+    os.environ['LIVE_SNAPSHOT'] = LIVE_SNAPSHOT
+    os.environ.pop('SCRAPE_TRACE', None)  # Only the runner drives WebDriver - and it owns the trace file
+    spec = importlib.util.spec_from_file_location("scraper_module", scraper_file)
+    scraper_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(scraper_module)
+
+    latest_mtime = scraper_module.warm_start(scraper_module.LATEST_SNAPSHOT)
+    scraper_module.publish_history(scraper_module.load_history_players())
+    return scraper_module, latest_mtime
+
+
+class RunnerServer(BaseApplication):
+    """gunicorn application for the runner: one worker, since it owns the scheduler and WebDriver"""
+
+    def load_config(self):
+        for key, value in {
+            'bind': f'127.0.0.1:{RUNNER_PORT}',
+            'workers': 1,
+            'worker_class': 'gthread',
+            'threads': THREADS,
+            'timeout': 120,
+            'accesslog': None
+        }.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        # Imported in the worker, so the scheduler, tracer and snapshot threads live there
+        spec = importlib.util.spec_from_file_location("scraper_module", scraper_file)
+        scraper_module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(scraper_module)
+        if os.environ.get('WARM_START', '1') != '0':
+            scraper_module.start_warm_start(scraper_module.LATEST_SNAPSHOT)
+        return scraper_module.app
+
+
+class ReadServer(BaseApplication):
+    """gunicorn application serving the preloaded Flask app"""
+
+    def __init__(self, scraper_module, latest_mtime, options):
+        self.scraper_module = scraper_module
+        self.latest_mtime = latest_mtime
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+        self.cfg.set('post_fork', self.post_fork)
+
+    def load(self):
+        return self.scraper_module.app
+
+    def post_fork(self, server, worker):
+        # Threads don't survive fork - every worker runs its own snapshot watchers
+        module = self.scraper_module
+        for path, mtime in [(module.LATEST_SNAPSHOT, self.latest_mtime), (LIVE_SNAPSHOT, None)]:
+            threading.Thread(target=module.watch_snapshot, args=(path, mtime),
+                             name=f'snapshot-watcher-{os.path.basename(path)}', daemon=True).start()
+
+
+def main():
+    if sys.argv[1:] == ['runner']:
+        RunnerServer().run()
+        return
+
+    print("\n" + "=" * 70)
+    print("🏒 Juniors Stats API - production mode")
+    print("=" * 70)
+
+    runner = RunnerSupervisor()
+    print(f"🏃 Scrape runner: pid {runner.process.pid} on 127.0.0.1:{RUNNER_PORT}")
+    try:
+        scraper_module, latest_mtime = load_read_app()
+        print(f"✅ Serving on http://0.0.0.0:{PORT} with {WORKERS} workers x {THREADS} threads\n")
+        ReadServer(scraper_module, latest_mtime, {
+            'bind': f'0.0.0.0:{PORT}',
+            'workers': WORKERS,
+            'worker_class': 'gthread',
+            'threads': THREADS,
+            'preload_app': True,
+            'timeout': 120,
+            'accesslog': None
+        }).run()
+    finally:
+        runner.stop()
+
+
+if __name__ == '__main__':
+    main()